@@ -0,0 +1,38 @@
+"""
+Fixtures for the SDK overhead benchmarks
+
+Every benchmark runs the real client against an in-process FakeTransport,
+so the numbers are the SDK's own cost (serialization, dispatch, error
+handling and streaming) without network noise.
+"""
+
+import pytest
+
+from docstron import Docstron
+from docstron.testing import FakeAPI, FakeTransport
+
+KiB = 1024
+MiB = 1024 * KiB
+
+#: Sizes of PDFs returned by the fake API
+PDF_SIZES = {"32KiB": 32 * KiB, "1MiB": MiB, "8MiB": 8 * MiB}
+
+
+def make_client(pdf_size=32 * KiB, total_items=1000, **options):
+    """A client answered in-process by a fresh fake API"""
+    api = FakeAPI(pdf_size=pdf_size, total_items=total_items)
+    return Docstron(api_key="bench-key", transport=FakeTransport(api), **options)
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Client with 32 KiB PDFs and 1000 listable documents"""
+    with make_client() as client:
+        yield client
+
+
+@pytest.fixture(params=list(PDF_SIZES), scope="module")
+def pdf_client(request):
+    """Client whose fake API returns PDFs of each benchmarked size"""
+    with make_client(pdf_size=PDF_SIZES[request.param]) as client:
+        yield client
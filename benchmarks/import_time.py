@@ -0,0 +1,62 @@
+"""
+Measure the cold-start cost of the SDK
+
+Times ``import docstron``, importing the client and building one, each in a
+fresh interpreter so nothing is already cached in ``sys.modules``. This is
+the latency a CLI or serverless function pays before its first request.
+
+Usage:
+    python benchmarks/import_time.py [--runs 20]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+SNIPPETS = {
+    "import docstron": "import docstron",
+    "from docstron import DocstronError": "from docstron import DocstronError",
+    "from docstron import Docstron": "from docstron import Docstron",
+    "Docstron(api_key=...)": (
+        "from docstron import Docstron; Docstron(api_key='bench-key')"
+    ),
+    "first request (fake API)": (
+        "from docstron import Docstron; "
+        "from docstron.testing import FakeTransport; "
+        "Docstron(api_key='bench-key', transport=FakeTransport()).usage.get()"
+    ),
+}
+
+TIMER = """
+import time
+started = time.perf_counter()
+{snippet}
+print(time.perf_counter() - started)
+"""
+
+
+def time_snippet(snippet):
+    """Seconds ``snippet`` takes in a new interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-c", TIMER.format(snippet=snippet)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"median of {args.runs} fresh interpreters:")
+    for label, snippet in SNIPPETS.items():
+        times = [time_snippet(snippet) for _ in range(args.runs)]
+        print(f"{label:<38}{statistics.median(times) * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare the per-call cost of the available JSON codecs
+
+Encodes a generate payload with many line items and decodes a full page of
+``documents.list`` results, the two places the client spends time in JSON.
+
+Usage:
+    python benchmarks/json_codec.py [--items 500] [--number 200]
+"""
+
+import argparse
+import timeit
+
+from docstron.codec import get_codec
+
+
+def line_item_payload(items):
+    """A documents/generate body with ``items`` invoice lines"""
+    return {
+        "template_id": "template-c2465c0b-fc54-4672-b9ac-7446886cd6de",
+        "response_type": "document_id",
+        "data": {
+            "customer_name": "Acme Corp",
+            "invoice_number": "INV-2024-001",
+            "line_items": [
+                {
+                    "sku": f"SKU-{i:05d}",
+                    "description": "Consulting services – senior engineer",
+                    "quantity": i % 7 + 1,
+                    "unit_price": 149.5,
+                    "taxable": i % 3 == 0,
+                }
+                for i in range(items)
+            ],
+        },
+    }
+
+
+def list_response(items):
+    """A documents list page with ``items`` entries"""
+    return {
+        "success": True,
+        "data": [
+            {
+                "document_id": f"document-{i:08d}",
+                "template_id": "template-c2465c0b-fc54-4672-b9ac-7446886cd6de",
+                "status": "completed",
+                "created_at": "2024-12-02T10:15:30.000000Z",
+                "attributes": {"customer_name": f"Customer {i}", "total": i * 1.5},
+            }
+            for i in range(items)
+        ],
+        "pagination": {"has_more": True, "next_cursor": "abc123"},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    payload = line_item_payload(args.items)
+    body = get_codec("json").dumps(list_response(args.items))
+
+    print(f"{args.items} items, {len(body) / 1024:.0f} KiB response, per call:")
+    print(f"{'codec':<10}{'encode':>12}{'decode':>12}")
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            print(f"{name:<10}{'not installed':>24}")
+            continue
+        encode = timeit.timeit(lambda: codec.dumps(payload), number=args.number)
+        decode = timeit.timeit(lambda: codec.loads(body), number=args.number)
+        print(
+            f"{name:<10}"
+            f"{encode / args.number * 1e6:>10.1f}us"
+            f"{decode / args.number * 1e6:>10.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
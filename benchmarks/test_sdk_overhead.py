@@ -0,0 +1,132 @@
+"""
+Per-call overhead of the client's hot paths
+
+Requires pytest-benchmark (``pip install -r requirements-dev.txt``).
+
+Usage:
+    pytest benchmarks/ --benchmark-autosave
+    pytest benchmarks/ --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+
+import io
+
+import pytest
+
+from docstron import Docstron
+from docstron.exceptions import NotFoundError, ValidationError
+from docstron.transport import TransportResponse
+
+KiB = 1024
+MiB = 1024 * KiB
+
+TEMPLATE_ID = "template-c2465c0b-fc54-4672-b9ac-7446886cd6de"
+DOCUMENT_ID = "document-517145ce-5a09-4e47-a257-887e239ecb36"
+
+#: Approximate JSON request body sizes for generate calls
+PAYLOAD_SIZES = {"tiny": 0, "1KiB": KiB, "100KiB": 100 * KiB, "4MiB": 4 * MiB}
+
+
+def line_items(size):
+    """Template data whose JSON encoding is roughly ``size`` bytes"""
+    item = {
+        "sku": "SKU-00000",
+        "description": "Consulting services - senior engineer",
+        "quantity": 3,
+        "unit_price": 149.5,
+        "taxable": True,
+    }
+    # ~150 bytes per encoded line item
+    return {
+        "customer_name": "Acme Corp",
+        "line_items": [dict(item, sku=f"SKU-{i:05d}") for i in range(size // 150)],
+    }
+
+
+def raises(exception, func, *args):
+    """Call ``func`` expecting ``exception`` (for benchmarking error paths)"""
+
+    def call():
+        with pytest.raises(exception):
+            func(*args)
+
+    return call
+
+
+@pytest.mark.benchmark(group="baseline")
+def test_fake_transport(benchmark, client):
+    """Cost of the fake API alone, to subtract from the other results"""
+    url = f"{client.base_url}/usage"
+    benchmark(client.session.request, "GET", url, timeout=None)
+
+
+@pytest.mark.benchmark(group="baseline")
+def test_client_construction(benchmark):
+    """Cost of building a client (resources and transport are lazy)"""
+    benchmark(Docstron, api_key="bench-key")
+
+
+@pytest.mark.benchmark(group="generate")
+@pytest.mark.parametrize("size", list(PAYLOAD_SIZES))
+def test_generate(benchmark, client, size):
+    """documents.generate returning a document ID, by request body size"""
+    data = line_items(PAYLOAD_SIZES[size])
+    benchmark(client.documents.generate, TEMPLATE_ID, data)
+
+
+@pytest.mark.benchmark(group="generate")
+def test_generate_base64(benchmark, client):
+    """documents.generate decoding a base64 PDF into memory"""
+    benchmark(
+        lambda: client.documents.generate(
+            TEMPLATE_ID, {}, response_type="json_with_base64", output_path=io.BytesIO()
+        )
+    )
+
+
+@pytest.mark.benchmark(group="post_binary")
+def test_post_binary(benchmark, pdf_client):
+    """post_binary returning the whole PDF, by PDF size"""
+    payload = {"template_id": TEMPLATE_ID, "data": {}, "response_type": "pdf"}
+    benchmark(pdf_client.post_binary, "documents/generate", payload)
+
+
+@pytest.mark.benchmark(group="download")
+def test_download(benchmark, pdf_client):
+    """documents.download buffering the PDF, by PDF size"""
+    benchmark(pdf_client.documents.download, DOCUMENT_ID)
+
+
+@pytest.mark.benchmark(group="download")
+def test_download_streamed(benchmark, pdf_client):
+    """documents.download streaming the PDF to a file object, by PDF size"""
+    benchmark(
+        lambda: pdf_client.documents.download(DOCUMENT_ID, output_path=io.BytesIO())
+    )
+
+
+@pytest.mark.benchmark(group="list")
+@pytest.mark.parametrize("limit", [10, 100, 1000])
+def test_list(benchmark, client, limit):
+    """documents.list, by page size"""
+    benchmark(client.documents.list, limit=limit)
+
+
+@pytest.mark.benchmark(group="errors")
+def test_not_found(benchmark, client):
+    """A 404 from the API surfacing as NotFoundError"""
+    benchmark(raises(NotFoundError, client.templates.get, "missing-template"))
+
+
+@pytest.mark.benchmark(group="errors")
+@pytest.mark.parametrize("status", [200, 404, 422])
+def test_handle_response(benchmark, client, status):
+    """_handle_response alone on a prebuilt success or error response"""
+    body = b'{"success": false, "message": "Validation error", "errors": {}}'
+    response = TransportResponse(
+        status, {"Content-Type": "application/json"}, 0.0, content=body
+    )
+    if status == 200:
+        benchmark(client._handle_response, response)
+    else:
+        error = NotFoundError if status == 404 else ValidationError
+        benchmark(raises(error, client._handle_response, response))
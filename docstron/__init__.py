@@ -4,21 +4,99 @@ Docstron Python SDK
 A Python SDK for the Docstron PDF Generation API.
 """
 
-from .client import Docstron
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 from .exceptions import (
     DocstronError,
     AuthenticationError,
     NotFoundError,
     ValidationError,
     RateLimitError,
+    ResponseTooLargeError,
+    DocumentFailedError,
+    WaitTimeoutError,
 )
 
+if TYPE_CHECKING:
+    from .client import Docstron
+    from .async_client import AsyncDocstron
+    from .codec import JSONCodec
+    from .compression import RequestCompressor
+    from .idempotency import IdempotencyLedger
+    from .concurrency import BatchResult
+    from .metrics import MetricsRegistry, RequestEvent
+    from .pdf_cache import PDFCache
+    from .polling import PollBackoff
+    from .ratelimit import TokenBucket, FileTokenBucket
+    from .retry import RetryPolicy
+    from .transport import Transport
+
 __version__ = "1.0.0"
 __all__ = [
     "Docstron",
+    "AsyncDocstron",
+    "BatchResult",
+    "RequestCompressor",
+    "JSONCodec",
+    "PDFCache",
+    "IdempotencyLedger",
+    "PollBackoff",
+    "MetricsRegistry",
+    "RequestEvent",
+    "RetryPolicy",
+    "Transport",
+    "TokenBucket",
+    "FileTokenBucket",
     "DocstronError",
     "AuthenticationError",
     "NotFoundError",
     "ValidationError",
     "RateLimitError",
+    "ResponseTooLargeError",
+    "DocumentFailedError",
+    "WaitTimeoutError",
 ]
+
+# Public names imported on first use (PEP 562), so ``import docstron`` does
+# not pay for requests, asyncio and the client modules up front
+_LAZY_IMPORTS = {
+    "Docstron": ".client",
+    "AsyncDocstron": ".async_client",
+    "BatchResult": ".concurrency",
+    "RequestCompressor": ".compression",
+    "JSONCodec": ".codec",
+    "PDFCache": ".pdf_cache",
+    "IdempotencyLedger": ".idempotency",
+    "PollBackoff": ".polling",
+    "MetricsRegistry": ".metrics",
+    "RequestEvent": ".metrics",
+    "RetryPolicy": ".retry",
+    "Transport": ".transport",
+    "TokenBucket": ".ratelimit",
+    "FileTokenBucket": ".ratelimit",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(module, __name__), name)
+    except ImportError:
+        raise
+    except Exception as exc:
+        # An AttributeError escaping from here would be reported by
+        # ``from docstron import ...`` as a missing name, hiding the cause
+        raise ImportError(
+            f"cannot import {name!r} from {__name__!r}: importing "
+            f"{__name__}{module} failed with {type(exc).__name__}: {exc}",
+            name=f"{__name__}{module}",
+        ) from exc
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
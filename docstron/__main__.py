@@ -0,0 +1,9 @@
+"""
+Allow ``python -m docstron <command>``
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Connection pool configuration for the Docstron HTTP session
+"""
+
+import time
+from typing import Any, Dict, Optional, Type
+
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool, PoolManager, ProxyManager
+
+#: Default number of connections kept per host (matches requests' default)
+DEFAULT_POOL_MAXSIZE = 10
+
+
+class _ExpiringPool:
+    """
+    Connection pool mixin closing connections that sat idle too long
+
+    Each connection is stamped when it goes back into the pool and checked
+    when it is taken out again, so only that idle connection is dropped;
+    connections other threads are using are never touched. A closed
+    connection reconnects transparently on its next request.
+    """
+
+    keepalive_expiry: Optional[float] = None
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        released = getattr(conn, "_docstron_released", None)
+        if released is not None and time.monotonic() - released > self.keepalive_expiry:
+            conn.close()
+        return conn
+
+    def _put_conn(self, conn) -> None:
+        if conn is not None:
+            conn._docstron_released = time.monotonic()
+        super()._put_conn(conn)
+
+
+def expiring_pool_classes(keepalive_expiry: float) -> Dict[str, Type[Any]]:
+    """urllib3 ``pool_classes_by_scheme`` expiring idle connections"""
+    return {
+        scheme: type(
+            f"Expiring{pool_class.__name__}",
+            (_ExpiringPool, pool_class),
+            {"keepalive_expiry": keepalive_expiry},
+        )
+        for scheme, pool_class in (
+            ("http", HTTPConnectionPool),
+            ("https", HTTPSConnectionPool),
+        )
+    }
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with a tunable pool and an idle keep-alive expiry
+
+    Args:
+        pool_connections: Number of per-host pools to cache
+        pool_maxsize: Maximum connections kept open per host. Size this to
+            the number of threads sharing the client.
+        pool_block: Wait for a free connection when the pool is exhausted
+            instead of opening (and then discarding) extra connections
+        keepalive_expiry: Close a pooled connection that has been idle for
+            longer than this many seconds instead of reusing it, so stale
+            sockets dropped by load balancers are not reused. None keeps
+            connections open indefinitely.
+        max_retries: Low-level urllib3 retries (SDK retries are handled by
+            RetryPolicy, so this defaults to 0)
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keepalive_expiry: Optional[float] = None,
+        max_retries: int = 0,
+    ):
+        self.keepalive_expiry = keepalive_expiry
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=max_retries,
+        )
+
+    def _expire_idle(self, manager):
+        if self.keepalive_expiry is not None and type(manager) in (
+            PoolManager,
+            ProxyManager,
+        ):
+            manager.pool_classes_by_scheme = expiring_pool_classes(
+                self.keepalive_expiry
+            )
+        return manager
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self._expire_idle(self.poolmanager)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        return self._expire_idle(super().proxy_manager_for(proxy, **proxy_kwargs))
@@ -0,0 +1,475 @@
+"""
+Asynchronous base HTTP client for the Docstron API
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, Callable, Iterable, Mapping, Optional, Tuple, Union
+from .base import _body_size, error_for_status
+from .compression import (
+    DEFAULT_COMPRESSION_THRESHOLD,
+    RequestCompressor,
+    build_compressor,
+)
+from .codec import JSONCodec, get_codec
+from .metrics import MetricsRegistry, RequestEvent, build_instrumentation
+from .ratelimit import TokenBucket, build_rate_limiter, parse_rate_limit
+from .retry import RetryPolicy
+from .singleflight import AsyncSingleFlight, request_key
+from .streaming import (
+    DEFAULT_CHUNK_SIZE,
+    Base64FieldExtractor,
+    Destination,
+    SizeGuard,
+    check_content_length,
+    open_destination,
+)
+
+
+class _PhaseTrace:
+    """
+    httpcore trace callback marking when a request got its connection, and
+    when its headers were sent
+
+    The first event of a request comes from the connection the pool handed
+    out: opening a new one, or sending on a reused one.
+    """
+
+    __slots__ = ("acquired", "sending", "connected")
+
+    def __init__(self):
+        self.acquired: Optional[float] = None
+        self.sending: Optional[float] = None
+        self.connected = False
+
+    async def __call__(self, name: str, info: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+        if self.acquired is None:
+            self.acquired = now
+        if name == "connection.connect_tcp.started":
+            self.connected = True
+        elif self.sending is None and name.endswith(".send_request_headers.started"):
+            self.sending = now
+
+
+class AsyncBaseClient:
+    """
+    Asynchronous HTTP client with error handling
+
+    Backed by a single ``httpx.AsyncClient`` whose connection pool is shared by
+    every resource, so many requests can be in flight on one event loop.
+    Requires the optional ``httpx`` dependency (``pip install docstron[async]``).
+
+    Args:
+        api_key: Your Docstron API key
+        base_url: Base URL for the API
+        http_client: Optional pre-configured ``httpx.AsyncClient`` to use
+        max_retries: Number of automatic retries for throttled or failed
+            requests (default: 2, use 0 to disable)
+        retry_policy: Optional RetryPolicy for full control over retries
+        rate_limit: Optional client-side request pacing (a limiter, a
+            plan-style limit, or ``"auto"``); see BaseClient
+        rate_limit_headroom: Fraction of a plan-style limit to use
+        rate_limit_path: Optional state file shared across processes
+        pool_maxsize: Maximum concurrent connections to the API (default: 100);
+            further requests wait for a free connection
+        keepalive_expiry: Seconds an idle pooled connection may be reused
+            (default: 5.0)
+        timeout: Default timeout in seconds, a number or ``(connect, read)``
+            tuple. None (default) waits forever.
+        compression: Compress large JSON request bodies (``"gzip"``,
+            ``"zstd"``, True or a RequestCompressor); see BaseClient
+        compression_threshold: Minimum JSON body size in bytes to compress
+        json_codec: JSON library for bodies and responses; see BaseClient
+        coalesce_requests: Share one HTTP call among concurrent identical GET
+            requests (default: False)
+        metrics: True or a MetricsRegistry to record per-endpoint timing and
+            size histograms; see BaseClient
+        event_hooks: Callables invoked with a RequestEvent after every HTTP
+            attempt
+
+    The pool and timeout options only apply when ``http_client`` is not given.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.docstron.com/v1",
+        http_client: Optional[Any] = None,
+        max_retries: int = 2,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limit: Union[TokenBucket, int, float, str, None] = None,
+        rate_limit_headroom: float = 0.9,
+        rate_limit_path: Optional[str] = None,
+        pool_maxsize: int = 100,
+        keepalive_expiry: Optional[float] = 5.0,
+        timeout: Union[float, Tuple[float, float], None] = None,
+        compression: Union[RequestCompressor, str, bool, None] = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        json_codec: Union[JSONCodec, str, None] = None,
+        coalesce_requests: bool = False,
+        metrics: Union[MetricsRegistry, bool, None] = None,
+        event_hooks: Optional[Iterable[Callable[[RequestEvent], Any]]] = None,
+    ):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "AsyncDocstron requires httpx. "
+                "Install it with: pip install docstron[async]"
+            ) from None
+
+        self._httpx = httpx
+        self.api_key = api_key
+        self.base_url = base_url
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=max_retries)
+        self.rate_limiter: Optional[TokenBucket] = None
+        self._rate_limit_headroom = rate_limit_headroom
+        self._rate_limit_path = rate_limit_path
+        self._rate_limit_lock = asyncio.Lock()
+        self._auto_rate_limit = rate_limit == "auto"
+        if isinstance(rate_limit, TokenBucket):
+            self.rate_limiter = rate_limit
+        elif rate_limit is not None and not self._auto_rate_limit:
+            self.rate_limiter = build_rate_limiter(
+                rate_limit, rate_limit_headroom, rate_limit_path
+            )
+        self.compressor = build_compressor(compression, compression_threshold)
+        self.codec = get_codec(json_codec)
+        self.single_flight = AsyncSingleFlight() if coalesce_requests else None
+        self.instrumentation, self.metrics = build_instrumentation(metrics, event_hooks)
+        # Content-Type is left to httpx so that multipart uploads get the
+        # correct boundary; JSON bodies set it automatically.
+        if http_client is None:
+            if isinstance(timeout, tuple):
+                connect, read = timeout
+                timeout = httpx.Timeout(read, connect=connect)
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=pool_maxsize,
+                    max_keepalive_connections=pool_maxsize,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                timeout=timeout,
+            )
+        self.session = http_client
+        self.session.headers.update({"Authorization": f"Bearer {api_key}"})
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool"""
+        await self.session.aclose()
+
+    def _json_body(
+        self, data: Optional[Dict], headers: Optional[Mapping[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Request arguments sending ``data`` as a (possibly compressed) JSON body"""
+        extra_headers = headers
+        if data is None:
+            return {"headers": dict(extra_headers)} if extra_headers else {}
+        body = self.codec.dumps(data)
+        headers = {"Content-Type": "application/json"}
+        if extra_headers:
+            headers.update(extra_headers)
+        if self.compressor is not None:
+            body, encoding = self.compressor.compress(body)
+            if encoding is not None:
+                headers["Content-Encoding"] = encoding
+        return {"content": body, "headers": headers}
+
+    def _handle_response(self, response) -> Dict[str, Any]:
+        """Handle API response and raise appropriate exceptions"""
+        started = time.perf_counter() if self.instrumentation is not None else None
+        try:
+            data = self.codec.loads(response.content)
+        except ValueError:
+            data = {}
+        if started is not None:
+            self._record(response, decode=time.perf_counter() - started)
+
+        if response.status_code == 200:
+            return data
+        raise error_for_status(
+            response.status_code,
+            data,
+            retry_after=self.retry_policy.retry_after(response.headers),
+        )
+
+    def _record(self, response, **fields: Any) -> None:
+        """Complete the response's RequestEvent, if any, and emit it once"""
+        if self.instrumentation is None:
+            return
+        event = response.__dict__.pop("docstron_event", None)
+        if event is None:
+            return
+        for name, value in fields.items():
+            setattr(event, name, value)
+        self.instrumentation.emit(event)
+
+    async def configure_rate_limit(
+        self, headroom: Optional[float] = None, path: Optional[str] = None
+    ) -> Optional[TokenBucket]:
+        """Pace requests to just under the plan's ``api_rate_limit``"""
+        headroom = self._rate_limit_headroom if headroom is None else headroom
+        path = path or self._rate_limit_path
+        self._auto_rate_limit = False
+        usage = self._handle_response(await self._send("GET", "usage"))
+        plan_limit = usage.get("data", {}).get("subscription", {}).get("api_rate_limit")
+        if not plan_limit:
+            return self.rate_limiter
+
+        if self.rate_limiter is not None and not path:
+            self.rate_limiter.update(parse_rate_limit(plan_limit) * headroom)
+        else:
+            self.rate_limiter = build_rate_limiter(plan_limit, headroom, path)
+        return self.rate_limiter
+
+    async def _throttle(self) -> None:
+        """Wait for the client-side rate limiter without blocking the loop"""
+        if self._auto_rate_limit:
+            async with self._rate_limit_lock:
+                if self._auto_rate_limit:
+                    await self.configure_rate_limit()
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Optional[Mapping[str, str]] = None,
+        stream: bool = False,
+        **kwargs: Any,
+    ):
+        """
+        Send a request, retrying according to the client's retry policy
+
+        With ``stream=True`` the body is not read; the caller must close the
+        returned response.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        policy = self.retry_policy
+        instrumentation = self.instrumentation
+        event = None
+        attempt = 0
+        while True:
+            attempt += 1
+            if instrumentation is not None:
+                event = instrumentation.start(method, endpoint, attempt)
+            await self._throttle()
+            request = self.session.build_request(method, url, headers=headers, **kwargs)
+            try:
+                if event is None:
+                    response = await self.session.send(request, stream=stream)
+                else:
+                    trace = request.extensions["trace"] = _PhaseTrace()
+                    sent = time.perf_counter()
+                    event.queue = sent - event.started
+                    event.request_bytes = _body_size(kwargs.get("content"))
+                    # Read the body separately so header and body time differ
+                    response = await self.session.send(request, stream=True)
+                    received = time.perf_counter()
+                    event.status_code = response.status_code
+                    if trace.sending is None:
+                        event.ttfb = received - sent
+                    else:
+                        event.queue += trace.acquired - sent
+                        if trace.connected:
+                            event.connect = trace.sending - trace.acquired
+                        event.ttfb = received - trace.sending
+                    response.docstron_event = event
+                    if not stream:
+                        await response.aread()
+                        event.transfer = time.perf_counter() - received
+                        event.response_bytes = len(response.content)
+            except self._httpx.TransportError as e:
+                retry = policy.should_retry_error(method, attempt, headers)
+                if event is not None:
+                    event.error, event.retried = e, retry
+                    instrumentation.emit(event)
+                if not retry:
+                    raise
+                await asyncio.sleep(policy.backoff(attempt))
+                continue
+
+            if response.status_code == 200 or not policy.should_retry_status(
+                method, response.status_code, attempt, headers
+            ):
+                return response
+
+            delay = policy.delay(attempt, response.headers)
+            if delay is None:
+                return response
+            if event is not None:
+                event.retried = True
+                self._record(response)
+            await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """Make a GET request, coalesced with identical in-flight GETs if enabled"""
+        if self.single_flight is not None:
+            return await self.single_flight.do(
+                request_key(endpoint, params), lambda: self._get(endpoint, params)
+            )
+        return await self._get(endpoint, params)
+
+    async def _get(self, endpoint: str, params: Optional[Dict]) -> Dict[str, Any]:
+        response = await self._send("GET", endpoint, params=params)
+        return self._handle_response(response)
+
+    async def post(
+        self,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        files: Optional[Dict] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Make a POST request, optionally with extra ``headers``"""
+        if files:
+            response = await self._send(
+                "POST", endpoint, data=data, files=files, headers=headers
+            )
+        else:
+            response = await self._send(
+                "POST", endpoint, **self._json_body(data, headers)
+            )
+        return self._handle_response(response)
+
+    async def patch(self, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
+        """Make a PATCH request"""
+        response = await self._send("PATCH", endpoint, **self._json_body(data))
+        return self._handle_response(response)
+
+    async def delete(self, endpoint: str) -> Dict[str, Any]:
+        """Make a DELETE request"""
+        response = await self._send("DELETE", endpoint)
+        return self._handle_response(response)
+
+    async def post_binary(
+        self,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> bytes:
+        """Make a POST request that returns binary data (e.g., PDF)"""
+        response = await self._send("POST", endpoint, **self._json_body(data, headers))
+        if response.status_code == 200:
+            self._record(response)
+            return response.content
+        else:
+            return self._handle_response(response)
+
+    async def download(self, endpoint: str) -> bytes:
+        """Download a file (returns binary data)"""
+        response = await self._send("GET", endpoint)
+        if response.status_code == 200:
+            self._record(response)
+            return response.content
+        else:
+            return self._handle_response(response)
+
+    async def _stream_to(
+        self,
+        method: str,
+        endpoint: str,
+        destination: Destination,
+        data: Optional[Dict],
+        chunk_size: int,
+        max_size: Optional[int],
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> int:
+        """Stream a response body to ``destination`` without buffering it"""
+        response = await self._send(
+            method, endpoint, **self._json_body(data, headers), stream=True
+        )
+        try:
+            if response.status_code != 200:
+                await response.aread()
+                self._handle_response(response)
+            check_content_length(response.headers, max_size)
+            guard = SizeGuard(max_size)
+            started = time.perf_counter()
+            with open_destination(destination) as f:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    guard.add(chunk)
+                    f.write(chunk)
+            self._record(
+                response,
+                transfer=time.perf_counter() - started,
+                response_bytes=guard.total,
+            )
+            return guard.total
+        finally:
+            await response.aclose()
+
+    async def download_to(
+        self,
+        endpoint: str,
+        destination: Destination,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_size: Optional[int] = None,
+    ) -> int:
+        """Stream a file to a path or writable file object, returning its size"""
+        return await self._stream_to(
+            "GET", endpoint, destination, None, chunk_size, max_size
+        )
+
+    async def post_binary_to(
+        self,
+        endpoint: str,
+        destination: Destination,
+        data: Optional[Dict] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_size: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> int:
+        """Stream the binary result of a POST to a path or writable file object"""
+        return await self._stream_to(
+            "POST", endpoint, destination, data, chunk_size, max_size, headers
+        )
+
+    async def post_json_base64_to(
+        self,
+        endpoint: str,
+        destination: Destination,
+        data: Optional[Dict] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_size: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """POST and decode the response's base64 ``data.pdf`` field incrementally"""
+        response = await self._send(
+            "POST", endpoint, **self._json_body(data, headers), stream=True
+        )
+        try:
+            if response.status_code != 200:
+                await response.aread()
+                self._handle_response(response)
+            with open_destination(destination) as f:
+                extractor = Base64FieldExtractor(
+                    f.write, max_size=max_size, loads=self.codec.loads
+                )
+                started = time.perf_counter()
+                received = 0
+                async for chunk in response.aiter_bytes(chunk_size):
+                    received += len(chunk)
+                    extractor.feed(chunk)
+                transferred = time.perf_counter()
+                metadata = extractor.close()
+                self._record(
+                    response,
+                    transfer=transferred - started,
+                    decode=time.perf_counter() - transferred,
+                    response_bytes=received,
+                )
+                return metadata
+        finally:
+            await response.aclose()
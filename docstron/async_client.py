@@ -0,0 +1,110 @@
+"""
+Asynchronous Docstron client
+"""
+
+import os
+from typing import Any, Optional, Union
+from .async_base import AsyncBaseClient
+from .cache import TTLCache
+from .delta import VersionStore
+from .idempotency import IdempotencyLedger, build_ledger
+from .lazy import lazy_attribute
+from .pdf_cache import PDFCache
+from .resources import AsyncApplications, AsyncTemplates, AsyncDocuments, AsyncUsage
+
+
+class AsyncDocstron(AsyncBaseClient):
+    """
+    Asynchronous client for the Docstron API
+
+    Every resource method is a coroutine. All resources share one pooled
+    ``httpx.AsyncClient``, so a single event loop can keep many renders in
+    flight without a thread per request. Requires ``pip install docstron[async]``.
+
+    Args:
+        api_key: Your Docstron API key
+        base_url: Base URL for the API (default: https://api.docstron.com/v1)
+        http_client: Optional pre-configured ``httpx.AsyncClient`` to use
+        metadata_cache_ttl: Seconds to cache template and application lookups
+            (default: None, disabled)
+        metadata_cache_size: Maximum cached entries per resource (default: 256)
+        pdf_cache: Directory (or PDFCache) for caching generated PDFs on disk
+            (default: None, disabled)
+        idempotency: Idempotency keys and ledger for generations (True, a
+            ledger file path or an IdempotencyLedger); see Docstron
+        delta_updates: Send only changed fields in template and document
+            updates (default: False); see Docstron
+        **options: Retry, rate limit, pool, timeout, compression, JSON codec,
+            request coalescing and metrics options passed to AsyncBaseClient
+
+    Example:
+        >>> import asyncio
+        >>> from docstron import AsyncDocstron
+        >>>
+        >>> async def main():
+        ...     async with AsyncDocstron(api_key='your-api-key') as client:
+        ...         pdfs = await asyncio.gather(*[
+        ...             client.documents.generate(
+        ...                 template_id='template-123',
+        ...                 data={'customer': name},
+        ...                 response_type='pdf'
+        ...             )
+        ...             for name in ['Acme Corp', 'Globex']
+        ...         ])
+        >>>
+        >>> asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.docstron.com/v1",
+        http_client: Optional[Any] = None,
+        metadata_cache_ttl: Optional[float] = None,
+        metadata_cache_size: int = 256,
+        pdf_cache: Union[PDFCache, str, os.PathLike, None] = None,
+        idempotency: Union[IdempotencyLedger, bool, str, os.PathLike, None] = None,
+        delta_updates: bool = False,
+        **options,
+    ):
+        super().__init__(api_key, base_url, http_client=http_client, **options)
+
+        self._app_cache = self._template_cache = None
+        if metadata_cache_ttl is not None:
+            self._app_cache = TTLCache(metadata_cache_size, metadata_cache_ttl)
+            self._template_cache = TTLCache(metadata_cache_size, metadata_cache_ttl)
+        if pdf_cache is not None and not isinstance(pdf_cache, PDFCache):
+            pdf_cache = PDFCache(pdf_cache)
+        self._pdf_cache = pdf_cache
+        self._ledger = build_ledger(idempotency)
+        self._delta_updates = delta_updates
+
+    def _versions(self) -> Optional[VersionStore]:
+        """A store of last known versions for a resource, if delta updates are on"""
+        return VersionStore() if self._delta_updates else None
+
+    # Resources are built on first access, so short-lived clients only pay
+    # for the ones they use
+
+    @lazy_attribute
+    def applications(self) -> AsyncApplications:
+        return AsyncApplications(self, cache=self._app_cache)
+
+    @lazy_attribute
+    def templates(self) -> AsyncTemplates:
+        return AsyncTemplates(
+            self, cache=self._template_cache, versions=self._versions()
+        )
+
+    @lazy_attribute
+    def documents(self) -> AsyncDocuments:
+        return AsyncDocuments(
+            self,
+            pdf_cache=self._pdf_cache,
+            ledger=self._ledger,
+            versions=self._versions(),
+        )
+
+    @lazy_attribute
+    def usage(self) -> AsyncUsage:
+        return AsyncUsage(self)
@@ -2,8 +2,42 @@
 Base HTTP client for the Docstron API
 """
 
+import threading
+import time
 import requests
-from typing import Dict, Any, Optional
+from typing import (
+    Dict,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+from .adapters import DEFAULT_POOL_MAXSIZE
+from .compression import (
+    DEFAULT_COMPRESSION_THRESHOLD,
+    RequestCompressor,
+    build_compressor,
+)
+from .codec import JSONCodec, get_codec
+from .lazy import lazy_attribute
+from .ratelimit import TokenBucket, build_rate_limiter, parse_rate_limit
+from .metrics import MetricsRegistry, RequestEvent, build_instrumentation
+from .retry import RetryPolicy
+from .singleflight import SingleFlight, request_key
+from .transport import Transport, build_transport
+from .streaming import (
+    DEFAULT_CHUNK_SIZE,
+    Base64FieldExtractor,
+    Destination,
+    SizeGuard,
+    check_content_length,
+    open_destination,
+    write_chunks,
+)
 from .exceptions import (
     DocstronError,
     AuthenticationError,
@@ -14,112 +48,504 @@ from .exceptions import (
 )
 
 
+def _body_size(body: Any) -> Optional[int]:
+    """Length of an encoded request body, None for multipart/unknown bodies"""
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    return None
+
+
+def error_for_status(
+    status_code: int,
+    data: Dict[str, Any],
+    retry_after: Optional[float] = None,
+) -> DocstronError:
+    """Build the exception matching an unsuccessful API status code"""
+    if status_code == 401:
+        return AuthenticationError(
+            data.get("message", "Authentication failed"),
+            status_code=status_code,
+            response=data,
+        )
+    elif status_code == 404:
+        return NotFoundError(
+            data.get("message", "Resource not found"),
+            status_code=status_code,
+            response=data,
+        )
+    elif status_code == 422:
+        return ValidationError(
+            data.get("message", "Validation error"),
+            status_code=status_code,
+            response=data,
+        )
+    elif status_code == 429:
+        return RateLimitError(
+            data.get("message", "Rate limit exceeded"),
+            status_code=status_code,
+            response=data,
+            retry_after=retry_after,
+        )
+    elif status_code >= 500:
+        return ServerError(
+            data.get("message", "Server error"),
+            status_code=status_code,
+            response=data,
+        )
+    else:
+        return DocstronError(
+            data.get("message", "An error occurred"),
+            status_code=status_code,
+            response=data,
+        )
+
+
 class BaseClient:
-    """Base HTTP client with error handling"""
+    """
+    Base HTTP client with error handling
+
+    A single client is meant to be shared across threads: the connection
+    pool, retry policy and rate limiter are thread-safe. The default
+    transport is a ``requests.Session``, which requests does not document
+    as thread-safe; it updates its cookie jar (under the jar's own lock)
+    on every response, which is harmless since the API sets no cookies,
+    but do not change the session's headers, cookies or adapters while
+    other threads use it. ``transport="urllib3"`` keeps no such per-session
+    state. Size ``pool_maxsize`` to the number of threads sharing the
+    client so none of them waits for (or churns) a connection.
 
-    def __init__(self, api_key: str, base_url: str = "https://api.docstron.com/v1"):
+    Args:
+        api_key: Your Docstron API key
+        base_url: Base URL for the API
+        max_retries: Number of automatic retries for throttled or failed
+            requests (default: 2, use 0 to disable)
+        retry_policy: Optional RetryPolicy for full control over retries;
+            overrides max_retries
+        rate_limit: Optional client-side request pacing. Either a limiter
+            (e.g. TokenBucket), a plan-style limit such as ``120`` (requests
+            per minute) or ``"10/second"``, or ``"auto"`` to configure it from
+            the plan's ``api_rate_limit`` on first use
+        rate_limit_headroom: Fraction of a plan-style limit to use (default: 0.9)
+        rate_limit_path: Optional state file that shares the rate limit across
+            processes on the same host
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum connections kept open to the API (default: 10)
+        pool_block: Wait for a free pooled connection instead of opening a
+            throwaway one when all are busy (default: False)
+        keepalive_expiry: Seconds an idle pooled connection may be reused;
+            None (default) uses the transport's default, which keeps
+            connections alive indefinitely except over HTTP/2 (5 seconds)
+        timeout: Default timeout in seconds for every request, either a single
+            number or a ``(connect, read)`` tuple. None (default) waits forever.
+        compression: Compress large JSON request bodies: ``"gzip"``,
+            ``"zstd"``, True (gzip) or a RequestCompressor. None (default)
+            sends bodies uncompressed.
+        compression_threshold: Minimum JSON body size in bytes to compress
+            (default: 16 KiB)
+        json_codec: JSON library used for request bodies and responses:
+            ``"json"`` (default), ``"orjson"``, ``"msgspec"``, ``"auto"`` for
+            the fastest one installed, or a JSONCodec instance
+        coalesce_requests: Share one HTTP call among concurrent identical GET
+            requests, e.g. many threads fetching the same template at once
+            (default: False)
+        metrics: True or a MetricsRegistry to record per-endpoint timing and
+            size histograms (exportable in Prometheus format); None (default)
+            records nothing
+        event_hooks: Callables invoked with a RequestEvent after every HTTP
+            attempt, carrying phase timings, sizes and the status code
+        transport: HTTP stack used to send requests: ``"requests"`` (default),
+            ``"urllib3"`` for a leaner pooled transport, ``"http2"`` to
+            multiplex concurrent requests over one connection, or a Transport
+            (or ``requests.Session``) instance. The pool options apply to
+            the built-in transports; ``client.session`` is the transport.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.docstron.com/v1",
+        max_retries: int = 2,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limit: Union[TokenBucket, int, float, str, None] = None,
+        rate_limit_headroom: float = 0.9,
+        rate_limit_path: Optional[str] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Union[float, Tuple[float, float], None] = None,
+        compression: Union[RequestCompressor, str, bool, None] = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        json_codec: Union[JSONCodec, str, None] = None,
+        coalesce_requests: bool = False,
+        metrics: Union[MetricsRegistry, bool, None] = None,
+        event_hooks: Optional[Iterable[Callable[[RequestEvent], Any]]] = None,
+        transport: Union[Transport, requests.Session, str, None] = None,
+    ):
         self.api_key = api_key
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update(
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=max_retries)
+        self.rate_limiter: Optional[TokenBucket] = None
+        self._rate_limit_headroom = rate_limit_headroom
+        self._rate_limit_path = rate_limit_path
+        self._rate_limit_lock = threading.Lock()
+        self._auto_rate_limit = rate_limit == "auto"
+        if isinstance(rate_limit, TokenBucket):
+            self.rate_limiter = rate_limit
+        elif rate_limit is not None and not self._auto_rate_limit:
+            self.rate_limiter = build_rate_limiter(
+                rate_limit, rate_limit_headroom, rate_limit_path
+            )
+        self.timeout = timeout
+        self.compressor = build_compressor(compression, compression_threshold)
+        self.codec = get_codec(json_codec)
+        self.single_flight = SingleFlight() if coalesce_requests else None
+        self.instrumentation, self.metrics = build_instrumentation(metrics, event_hooks)
+        self._transport_options = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "pool_block": pool_block,
+            "keepalive_expiry": keepalive_expiry,
+        }
+        self._transport = transport
+
+    @lazy_attribute
+    def session(self) -> Union[Transport, requests.Session]:
+        """The HTTP transport, built (and its pool allocated) on first request"""
+        session = build_transport(self._transport, **self._transport_options)
+        session.headers.update(
             {
-                "Authorization": f"Bearer {api_key}",
+                "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
             }
         )
+        return session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        session = self.__dict__.get("session")
+        if session is not None:
+            session.close()
+
+    def _json_body(
+        self, data: Optional[Dict], headers: Optional[Mapping[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Request arguments sending ``data`` as a (possibly compressed) JSON body"""
+        extra_headers = headers
+        if data is None:
+            return {"headers": dict(extra_headers)} if extra_headers else {}
+        body = self.codec.dumps(data)
+        headers = {"Content-Type": "application/json"}
+        if extra_headers:
+            headers.update(extra_headers)
+        if self.compressor is not None:
+            body, encoding = self.compressor.compress(body)
+            if encoding is not None:
+                headers["Content-Encoding"] = encoding
+        return {"data": body, "headers": headers}
 
     def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
         """Handle API response and raise appropriate exceptions"""
+        started = time.perf_counter() if self.instrumentation is not None else None
         try:
-            data = response.json()
+            data = self.codec.loads(response.content)
         except ValueError:
             data = {}
+        if started is not None:
+            self._record(response, decode=time.perf_counter() - started)
 
         if response.status_code == 200:
             return data
-        elif response.status_code == 401:
-            raise AuthenticationError(
-                data.get("message", "Authentication failed"),
-                status_code=response.status_code,
-                response=data,
-            )
-        elif response.status_code == 404:
-            raise NotFoundError(
-                data.get("message", "Resource not found"),
-                status_code=response.status_code,
-                response=data,
-            )
-        elif response.status_code == 422:
-            raise ValidationError(
-                data.get("message", "Validation error"),
-                status_code=response.status_code,
-                response=data,
-            )
-        elif response.status_code == 429:
-            raise RateLimitError(
-                data.get("message", "Rate limit exceeded"),
-                status_code=response.status_code,
-                response=data,
-            )
-        elif response.status_code >= 500:
-            raise ServerError(
-                data.get("message", "Server error"),
-                status_code=response.status_code,
-                response=data,
-            )
+        raise error_for_status(
+            response.status_code,
+            data,
+            retry_after=self.retry_policy.retry_after(response.headers),
+        )
+
+    def configure_rate_limit(
+        self, headroom: Optional[float] = None, path: Optional[str] = None
+    ) -> Optional[TokenBucket]:
+        """
+        Pace requests to just under the plan's ``api_rate_limit``
+
+        Fetches usage once and installs (or retunes) the client's limiter.
+        Plans without a rate limit leave the client unthrottled.
+
+        Args:
+            headroom: Fraction of the plan limit to use (default: the client's
+                rate_limit_headroom)
+            path: Optional state file to share the budget across processes
+
+        Returns:
+            The active limiter, or None if the plan has no rate limit
+        """
+        headroom = self._rate_limit_headroom if headroom is None else headroom
+        path = path or self._rate_limit_path
+        self._auto_rate_limit = False
+        usage = self._handle_response(self._send("GET", "usage"))
+        plan_limit = usage.get("data", {}).get("subscription", {}).get("api_rate_limit")
+        if not plan_limit:
+            return self.rate_limiter
+
+        if self.rate_limiter is not None and not path:
+            self.rate_limiter.update(parse_rate_limit(plan_limit) * headroom)
         else:
-            raise DocstronError(
-                data.get("message", "An error occurred"),
-                status_code=response.status_code,
-                response=data,
-            )
+            self.rate_limiter = build_rate_limiter(plan_limit, headroom, path)
+        return self.rate_limiter
 
-    def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
-        """Make a GET request"""
+    def _record(self, response: requests.Response, **fields: Any) -> None:
+        """Complete the response's RequestEvent, if any, and emit it once"""
+        if self.instrumentation is None:
+            return
+        event = response.__dict__.pop("docstron_event", None)
+        if event is None:
+            return
+        for name, value in fields.items():
+            setattr(event, name, value)
+        self.instrumentation.emit(event)
+
+    def _throttle(self) -> None:
+        """Wait for the client-side rate limiter, if one is configured"""
+        if self._auto_rate_limit:
+            with self._rate_limit_lock:
+                if self._auto_rate_limit:
+                    self.configure_rate_limit()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Optional[Mapping[str, str]] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Send a request, retrying according to the client's retry policy
+
+        Throttled (429) requests are retried for every method; other
+        retryable statuses and connection errors only for idempotent ones.
+        """
         url = f"{self.base_url}/{endpoint}"
-        response = self.session.get(url, params=params)
+        kwargs.setdefault("timeout", self.timeout)
+        policy = self.retry_policy
+        instrumentation = self.instrumentation
+        event = None
+        attempt = 0
+        while True:
+            attempt += 1
+            if instrumentation is not None:
+                event = instrumentation.start(method, endpoint, attempt)
+            self._throttle()
+            if event is not None:
+                sent = time.perf_counter()
+                event.queue = sent - event.started
+                event.request_bytes = _body_size(kwargs.get("data"))
+            try:
+                response = self.session.request(method, url, headers=headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                retry = policy.should_retry_error(method, attempt, headers)
+                if event is not None:
+                    event.error, event.retried = e, retry
+                    instrumentation.emit(event)
+                if not retry:
+                    raise
+                time.sleep(policy.backoff(attempt))
+                continue
+
+            if event is not None:
+                event.status_code = response.status_code
+                event.ttfb = response.elapsed.total_seconds()
+                if not kwargs.get("stream"):
+                    # requests has already read the body
+                    elapsed = time.perf_counter() - sent
+                    event.transfer = max(elapsed - event.ttfb, 0.0)
+                    event.response_bytes = len(response.content)
+                response.docstron_event = event
+
+            if response.status_code == 200 or not policy.should_retry_status(
+                method, response.status_code, attempt, headers
+            ):
+                return response
+
+            delay = policy.delay(attempt, response.headers)
+            if delay is None:
+                return response
+            if event is not None:
+                event.retried = True
+                self._record(response)
+            response.close()
+            time.sleep(delay)
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """Make a GET request, coalesced with identical in-flight GETs if enabled"""
+        if self.single_flight is not None:
+            return self.single_flight.do(
+                request_key(endpoint, params), lambda: self._get(endpoint, params)
+            )
+        return self._get(endpoint, params)
+
+    def _get(self, endpoint: str, params: Optional[Dict]) -> Dict[str, Any]:
+        response = self._send("GET", endpoint, params=params)
         return self._handle_response(response)
 
     def post(
-        self, endpoint: str, data: Optional[Dict] = None, files: Optional[Dict] = None
+        self,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        files: Optional[Dict] = None,
+        headers: Optional[Mapping[str, str]] = None,
     ) -> Dict[str, Any]:
-        """Make a POST request"""
-        url = f"{self.base_url}/{endpoint}"
+        """Make a POST request, optionally with extra ``headers``"""
         if files:
             # Remove Content-Type header for multipart/form-data
-            headers = self.session.headers.copy()
-            headers.pop("Content-Type", None)
-            response = self.session.post(url, data=data, files=files, headers=headers)
+            multipart_headers = self.session.headers.copy()
+            multipart_headers.pop("Content-Type", None)
+            multipart_headers.update(headers or {})
+            response = self._send(
+                "POST", endpoint, data=data, files=files, headers=multipart_headers
+            )
         else:
-            response = self.session.post(url, json=data)
+            response = self._send("POST", endpoint, **self._json_body(data, headers))
         return self._handle_response(response)
 
     def patch(self, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
         """Make a PATCH request"""
-        url = f"{self.base_url}/{endpoint}"
-        response = self.session.patch(url, json=data)
+        response = self._send("PATCH", endpoint, **self._json_body(data))
         return self._handle_response(response)
 
     def delete(self, endpoint: str) -> Dict[str, Any]:
         """Make a DELETE request"""
-        url = f"{self.base_url}/{endpoint}"
-        response = self.session.delete(url)
+        response = self._send("DELETE", endpoint)
         return self._handle_response(response)
 
-    def post_binary(self, endpoint: str, data: Optional[Dict] = None) -> bytes:
+    def post_binary(
+        self,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> bytes:
         """Make a POST request that returns binary data (e.g., PDF)"""
-        url = f"{self.base_url}/{endpoint}"
-        response = self.session.post(url, json=data)
+        response = self._send("POST", endpoint, **self._json_body(data, headers))
         if response.status_code == 200:
+            self._record(response)
             return response.content
         else:
             return self._handle_response(response)
 
     def download(self, endpoint: str) -> bytes:
         """Download a file (returns binary data)"""
-        url = f"{self.base_url}/{endpoint}"
-        response = self.session.get(url)
+        response = self._send("GET", endpoint)
         if response.status_code == 200:
+            self._record(response)
             return response.content
         else:
             return self._handle_response(response)
+
+    def _iter_stream(
+        self,
+        response: requests.Response,
+        chunk_size: int,
+        max_size: Optional[int],
+    ) -> Iterator[bytes]:
+        """Yield the body of a streamed response, closing it when done"""
+        with response:
+            if response.status_code != 200:
+                self._handle_response(response)
+            check_content_length(response.headers, max_size)
+            guard = SizeGuard(max_size)
+            started = time.perf_counter()
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    guard.add(chunk)
+                    yield chunk
+            self._record(
+                response,
+                transfer=time.perf_counter() - started,
+                response_bytes=guard.total,
+            )
+
+    def iter_download(
+        self,
+        endpoint: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_size: Optional[int] = None,
+    ) -> Iterator[bytes]:
+        """Download a file as an iterator of chunks without buffering it"""
+        response = self._send("GET", endpoint, stream=True)
+        return self._iter_stream(response, chunk_size, max_size)
+
+    def download_to(
+        self,
+        endpoint: str,
+        destination: Destination,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_size: Optional[int] = None,
+    ) -> int:
+        """Stream a file to a path or writable file object, returning its size"""
+        chunks = self.iter_download(endpoint, chunk_size, max_size)
+        return write_chunks(chunks, destination)
+
+    def post_binary_to(
+        self,
+        endpoint: str,
+        destination: Destination,
+        data: Optional[Dict] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_size: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> int:
+        """Stream the binary result of a POST to a path or writable file object"""
+        response = self._send(
+            "POST", endpoint, **self._json_body(data, headers), stream=True
+        )
+        chunks = self._iter_stream(response, chunk_size, max_size)
+        return write_chunks(chunks, destination)
+
+    def post_json_base64_to(
+        self,
+        endpoint: str,
+        destination: Destination,
+        data: Optional[Dict] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_size: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        POST and decode the response's base64 ``data.pdf`` field incrementally
+
+        The decoded PDF is written to ``destination`` as the body streams in;
+        the remaining JSON metadata (without ``data.pdf``) is returned.
+        """
+        response = self._send(
+            "POST", endpoint, **self._json_body(data, headers), stream=True
+        )
+        with response:
+            if response.status_code != 200:
+                self._handle_response(response)
+            with open_destination(destination) as f:
+                extractor = Base64FieldExtractor(
+                    f.write, max_size=max_size, loads=self.codec.loads
+                )
+                started = time.perf_counter()
+                received = 0
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    received += len(chunk)
+                    extractor.feed(chunk)
+                transferred = time.perf_counter()
+                metadata = extractor.close()
+                self._record(
+                    response,
+                    transfer=transferred - started,
+                    decode=time.perf_counter() - transferred,
+                    response_bytes=received,
+                )
+                return metadata
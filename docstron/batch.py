@@ -0,0 +1,278 @@
+"""
+Resumable bulk generation from JSONL or CSV files
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+from .concurrency import BatchResult, map_concurrently
+from .journal import CheckpointJournal
+from .placeholders import validate_data
+
+#: Name of the manifest/journal written into the output directory
+MANIFEST_NAME = "manifest.jsonl"
+
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def detect_format(path: Union[str, os.PathLike]) -> str:
+    """``"csv"`` or ``"jsonl"`` from a file's extension"""
+    extension = os.path.splitext(os.fspath(path))[1].lower()
+    if extension in (".csv", ".tsv"):
+        return "csv"
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    raise ValueError(f"Cannot tell the format of {os.fspath(path)!r}; pass format=")
+
+
+def _parse_rows(
+    path: Union[str, os.PathLike], format: Optional[str] = None
+) -> Iterator[Tuple[int, Union[Dict[str, Any], ValueError]]]:
+    """Rows of ``path``, with the error in place of the data of a bad line"""
+    format = format or detect_format(path)
+    if format == "csv":
+        delimiter = "\t" if os.fspath(path).lower().endswith(".tsv") else ","
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            rows = (row for row in csv.DictReader(f, delimiter=delimiter) if row)
+            yield from enumerate(rows, 1)
+    elif format == "jsonl":
+        with open(path, encoding="utf-8-sig") as f:
+            number = 0
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                number += 1
+                try:
+                    data = json.loads(line)
+                except ValueError as e:
+                    data = ValueError(f"Line {line_number}: invalid JSON ({e})")
+                else:
+                    if not isinstance(data, dict):
+                        data = ValueError(f"Line {line_number}: expected a JSON object")
+                yield number, data
+    else:
+        raise ValueError(f"Unknown format: {format!r}")
+
+
+def read_rows(
+    path: Union[str, os.PathLike], format: Optional[str] = None
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Stream data rows from a JSON Lines or CSV file
+
+    Rows are read one at a time, so files of any size use constant memory.
+    CSV files need a header line; every value is a string. Blank lines are
+    skipped and do not count as rows.
+
+    Args:
+        path: Input file
+        format: ``"jsonl"`` or ``"csv"`` (default: from the file extension)
+
+    Returns:
+        Iterator of ``(row number, data)`` with rows numbered from 1
+
+    Raises:
+        ValueError: If a JSON line is invalid or not an object
+    """
+    for number, data in _parse_rows(path, format):
+        if isinstance(data, ValueError):
+            raise data
+        yield number, data
+
+
+def _filename(key: str) -> str:
+    """
+    A safe PDF file name for a row key
+
+    Keys that are not safe file names as they are get a hash of the key
+    appended, so that e.g. ``a/b`` and ``a_b`` never share a file.
+    """
+    name = _UNSAFE_FILENAME.sub("_", key).strip("._")
+    if name != key:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+        name = f"{name}-{digest}" if name else digest
+    return name + ".pdf"
+
+
+class BatchReport:
+    """
+    Outcome of a batch run
+
+    Attributes:
+        rows: Rows read from the input
+        skipped: Rows already completed by an earlier run
+        succeeded: Rows generated by this run
+        failed: Rows that failed in this run (retried by the next one)
+        errors: Failures by exception class name
+        duration: Wall-clock seconds of the run
+        manifest: Path of the manifest/checkpoint journal
+    """
+
+    def __init__(self, manifest: str):
+        self.manifest = manifest
+        self.rows = 0
+        self.skipped = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.errors: Counter = Counter()
+        self.duration = 0.0
+
+    def format(self) -> str:
+        """Human-readable summary"""
+        rate = self.succeeded / self.duration if self.duration else 0.0
+        lines = [
+            f"{self.rows} rows: {self.succeeded} generated, {self.skipped} already "
+            f"done, {self.failed} failed in {self.duration:.1f} s ({rate:.1f}/s)",
+            f"manifest: {self.manifest}",
+        ]
+        if self.errors:
+            failed = ", ".join(f"{name} {n}" for name, n in self.errors.most_common())
+            lines.append(f"errors: {failed} (run again to retry failed rows)")
+        return "\n".join(lines)
+
+
+def run_batch(
+    client: Any,
+    template_id: str,
+    source: Union[str, os.PathLike],
+    output_dir: Union[str, os.PathLike],
+    response_type: str = "pdf",
+    concurrency: int = 8,
+    key_field: Optional[str] = None,
+    format: Optional[str] = None,
+    password: Optional[str] = None,
+    validate: bool = False,
+    fsync: bool = False,
+    progress: Optional[Callable[[BatchReport], Any]] = None,
+) -> BatchReport:
+    """
+    Generate one document per input row, resuming where a previous run stopped
+
+    Rows are streamed from ``source`` and generated on a thread pool sharing
+    the client's connections, with at most ``concurrency`` rows read ahead,
+    so memory stays constant however long the input is. Every finished row
+    is appended to ``manifest.jsonl`` in ``output_dir``, which doubles as
+    the checkpoint journal: rerunning the same command skips the rows
+    recorded as done and retries the ones that failed. Malformed lines and
+    rows without a ``key_field`` value fail like rows the API rejects
+    (keyed ``row-<n>``) instead of stopping the run. PDFs are streamed to a
+    temporary file and renamed into place before their row is recorded, so
+    a crash never leaves a truncated PDF behind a completed row.
+
+    Args:
+        client: A Docstron client (create it with ``pool_maxsize`` of at
+            least ``concurrency``)
+        template_id: Template used for every row
+        source: JSONL or CSV input file
+        output_dir: Directory for the PDFs and the manifest
+        response_type: ``"pdf"`` (default) writes ``<key>.pdf`` files;
+            ``"document_id"`` only records the document IDs
+        concurrency: Requests in flight at once (default: 8)
+        key_field: Column identifying a row across runs and naming its PDF;
+            by default the row number (``row-<n>``), which requires the
+            input to be unchanged between runs
+        format: ``"jsonl"`` or ``"csv"`` (default: from the file extension)
+        password: Optional password for every PDF
+        validate: Check rows against the template's placeholders locally
+            before sending
+        fsync: fsync the manifest after every row (see CheckpointJournal)
+        progress: Called with the running report after every finished row
+
+    Returns:
+        BatchReport with the number of generated, skipped and failed rows
+
+    Example:
+        >>> report = run_batch(
+        ...     client,
+        ...     template_id='template-c2465c0b-fc54-4672-b9ac-7446886cd6de',
+        ...     source='customers.csv',
+        ...     output_dir='invoices/',
+        ...     key_field='customer_id',
+        ...     concurrency=16,
+        ... )
+        >>> print(report.format())
+    """
+    if response_type not in ("pdf", "document_id"):
+        raise ValueError("response_type must be 'pdf' or 'document_id'")
+    output_dir = os.fspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = os.path.join(output_dir, MANIFEST_NAME)
+    report = BatchReport(manifest)
+    placeholders = None
+    if validate:
+        placeholders = client.templates.placeholders(template_id)
+
+    def pending_rows(journal: CheckpointJournal) -> Iterator[Tuple[int, str, Any]]:
+        for number, data in _parse_rows(source, format):
+            report.rows += 1
+            if key_field is None or isinstance(data, ValueError):
+                key = f"row-{number}"
+            elif data.get(key_field) in (None, ""):
+                key = f"row-{number}"
+                data = ValueError(f"Row {number} has no {key_field!r} value")
+            else:
+                key = str(data[key_field])
+            if journal.is_done(key):
+                report.skipped += 1
+            else:
+                yield number, key, data
+
+    def generate(row: Tuple[int, str, Dict[str, Any]]) -> Dict[str, Any]:
+        number, key, data = row
+        if isinstance(data, ValueError):
+            raise data
+        if placeholders is not None:
+            validate_data(placeholders, data, template_id)
+        if response_type == "document_id":
+            response = client.documents.generate(
+                template_id, data, response_type="document_id", password=password
+            )
+            return {"document_id": response.get("data", {}).get("document_id")}
+
+        filename = _filename(key)
+        target = os.path.join(output_dir, filename)
+        partial = target + ".part"
+        try:
+            size = client.documents.generate(
+                template_id,
+                data,
+                response_type="pdf",
+                password=password,
+                output_path=partial,
+            )
+            os.replace(partial, target)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        return {"file": filename, "bytes": size}
+
+    started = time.perf_counter()
+    with CheckpointJournal(manifest, fsync=fsync) as journal:
+        outcomes: Iterator[BatchResult] = map_concurrently(
+            generate, pending_rows(journal), concurrency=concurrency, ordered=False
+        )
+        try:
+            for outcome in outcomes:
+                number, key, _ = outcome.item
+                if outcome.ok:
+                    journal.record(key, row=number, **outcome.result)
+                    report.succeeded += 1
+                else:
+                    error = outcome.error
+                    journal.record(
+                        key, row=number, error=str(error), type=type(error).__name__
+                    )
+                    report.failed += 1
+                    report.errors[type(error).__name__] += 1
+                if progress is not None:
+                    progress(report)
+        finally:
+            report.duration = time.perf_counter() - started
+    return report
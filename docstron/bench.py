@@ -0,0 +1,259 @@
+"""
+Load generation against a Docstron API (or the local mock server)
+"""
+
+import asyncio
+import itertools
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+from .concurrency import amap_concurrently, map_concurrently
+
+TEMPLATE_ID = "template-c2465c0b-fc54-4672-b9ac-7446886cd6de"
+DOCUMENT_ID = "document-517145ce-5a09-4e47-a257-887e239ecb36"
+SAMPLE_DATA = {
+    "customer_name": "Acme Corp",
+    "invoice_number": "INV-2024-001",
+    "amount": "$1,299.00",
+}
+
+#: Client calls ``docstron bench`` can drive; each works on both clients
+OPERATIONS: Dict[str, Callable[[Any], Any]] = {
+    "generate": lambda client: client.documents.generate(TEMPLATE_ID, SAMPLE_DATA),
+    "generate-pdf": lambda client: client.documents.generate(
+        TEMPLATE_ID, SAMPLE_DATA, response_type="pdf"
+    ),
+    "download": lambda client: client.documents.download(DOCUMENT_ID),
+    "list": lambda client: client.documents.list(limit=100),
+    "usage": lambda client: client.usage.get(),
+}
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of already sorted ``values``"""
+    if not values:
+        return None
+    rank = max(int(round(pct / 100 * len(values))) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident memory of this process in bytes (None if unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class BenchResult:
+    """
+    Outcome of a load run
+
+    Attributes:
+        operation: Name of the driven operation
+        mode: ``"threads"`` or ``"async"``
+        concurrency: Number of requests kept in flight
+        duration: Wall-clock seconds for the whole run
+        latencies: Sorted per-call seconds, including retries
+        errors: Failed calls by exception class name
+        attempts: HTTP attempts by status code (``"error"`` for network
+            failures), so retried 429s and 5xx are visible
+        peak_rss: Peak resident memory in bytes, if known
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        mode: str,
+        concurrency: int,
+        duration: float,
+        latencies: List[float],
+        errors: Counter,
+        attempts: Dict[str, int],
+        peak_rss: Optional[int],
+    ):
+        self.operation = operation
+        self.mode = mode
+        self.concurrency = concurrency
+        self.duration = duration
+        self.latencies = sorted(latencies)
+        self.errors = errors
+        self.attempts = attempts
+        self.peak_rss = peak_rss
+
+    @property
+    def calls(self) -> int:
+        """Number of calls made"""
+        return len(self.latencies)
+
+    @property
+    def succeeded(self) -> int:
+        """Number of calls that returned without raising"""
+        return self.calls - sum(self.errors.values())
+
+    @property
+    def throughput(self) -> float:
+        """Successful calls per second"""
+        return self.succeeded / self.duration if self.duration else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The result as plain data, e.g. for ``--json`` output"""
+        return {
+            "operation": self.operation,
+            "mode": self.mode,
+            "concurrency": self.concurrency,
+            "calls": self.calls,
+            "succeeded": self.succeeded,
+            "duration": self.duration,
+            "throughput": self.throughput,
+            "latency": {
+                "p50": percentile(self.latencies, 50),
+                "p95": percentile(self.latencies, 95),
+                "p99": percentile(self.latencies, 99),
+                "max": self.latencies[-1] if self.latencies else None,
+            },
+            "errors": dict(self.errors),
+            "attempts": dict(self.attempts),
+            "peak_rss": self.peak_rss,
+        }
+
+    def format(self) -> str:
+        """Human-readable report"""
+
+        def ms(value: Optional[float]) -> str:
+            return "-" if value is None else f"{value * 1000:.1f} ms"
+
+        summary = self.as_dict()
+        latency = summary["latency"]
+        lines = [
+            f"{self.operation}: {self.calls} calls, {self.mode} x{self.concurrency}, "
+            f"{self.duration:.2f} s",
+            f"  throughput  {self.throughput:.1f} calls/s",
+            f"  latency     p50 {ms(latency['p50'])}  p95 {ms(latency['p95'])}  "
+            f"p99 {ms(latency['p99'])}  max {ms(latency['max'])}",
+        ]
+        if self.errors:
+            failed = ", ".join(f"{name} {n}" for name, n in self.errors.most_common())
+            lines.append(f"  errors      {failed}")
+        if self.attempts:
+            attempts = ", ".join(
+                f"{status} {n}" for status, n in sorted(self.attempts.items())
+            )
+            lines.append(f"  attempts    {attempts}")
+        if self.peak_rss is not None:
+            lines.append(f"  peak RSS    {self.peak_rss / 1024 / 1024:.1f} MiB")
+        return "\n".join(lines)
+
+
+def _attempts_by_status(metrics) -> Dict[str, int]:
+    attempts: Counter = Counter()
+    for key, count in metrics.requests.items():
+        attempts[dict(key)["status"]] += count
+    return dict(attempts)
+
+
+def run_bench(
+    base_url: str,
+    api_key: str = "bench-key",
+    operation: str = "generate",
+    requests: int = 1000,
+    concurrency: int = 16,
+    mode: str = "threads",
+    **client_options: Any,
+) -> BenchResult:
+    """
+    Drive ``operation`` against ``base_url`` and measure it
+
+    Args:
+        base_url: API base URL, e.g. a MockServer's ``url``
+        api_key: API key to send
+        operation: One of :data:`OPERATIONS`
+        requests: Total number of calls
+        concurrency: Calls kept in flight (threads or async tasks)
+        mode: ``"threads"`` for Docstron or ``"async"`` for AsyncDocstron
+        **client_options: Passed to the client (e.g. ``pool_maxsize``,
+            ``max_retries``, ``transport``)
+
+    Returns:
+        BenchResult with throughput, latency percentiles and errors
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {operation!r}")
+    if mode not in ("threads", "async"):
+        raise ValueError(f"Unknown mode: {mode!r}")
+    call = OPERATIONS[operation]
+    client_options.setdefault("pool_maxsize", concurrency)
+    client_options["metrics"] = True
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    if mode == "threads":
+        from .client import Docstron
+
+        def timed(client):
+            started = time.perf_counter()
+            try:
+                return call(client)
+            finally:
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+
+        with Docstron(api_key=api_key, base_url=base_url, **client_options) as client:
+            started = time.perf_counter()
+            results = list(
+                map_concurrently(
+                    timed,
+                    itertools.repeat(client, requests),
+                    concurrency,
+                    ordered=False,
+                )
+            )
+            duration = time.perf_counter() - started
+            attempts = _attempts_by_status(client.metrics)
+    else:
+        from .async_client import AsyncDocstron
+
+        async def timed(client):
+            started = time.perf_counter()
+            try:
+                return await call(client)
+            finally:
+                latencies.append(time.perf_counter() - started)
+
+        async def run():
+            async with AsyncDocstron(
+                api_key=api_key, base_url=base_url, **client_options
+            ) as client:
+                started = time.perf_counter()
+                results = [
+                    result
+                    async for result in amap_concurrently(
+                        timed,
+                        itertools.repeat(client, requests),
+                        concurrency,
+                        ordered=False,
+                    )
+                ]
+                return results, time.perf_counter() - started, client.metrics
+
+        results, duration, metrics = asyncio.run(run())
+        attempts = _attempts_by_status(metrics)
+
+    errors = Counter(type(r.error).__name__ for r in results if not r.ok)
+    return BenchResult(
+        operation,
+        mode,
+        concurrency,
+        duration,
+        latencies,
+        errors,
+        attempts,
+        peak_rss(),
+    )
@@ -0,0 +1,98 @@
+"""
+In-memory caching for Docstron resource metadata
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed time-to-live
+
+    Values are deep-copied on the way in and out, so callers may mutate the
+    dictionaries they receive without corrupting the cache.
+
+    Args:
+        maxsize: Maximum number of entries; the least recently used entry is
+            evicted when full
+        ttl: Seconds an entry stays valid, or None for no expiry
+
+    Example:
+        >>> client = Docstron(api_key='your-api-key', metadata_cache_ttl=300)
+        >>> client.templates.get('template-123')  # network
+        >>> client.templates.get('template-123')  # served from cache
+        >>> client.templates.cache.stats()
+        {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'maxsize': 256}
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = 60.0):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` on a miss"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry if full"""
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the entry for ``key`` if present"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return entry is not _MISSING and (
+                entry[0] is None or entry[0] > time.monotonic()
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current size"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
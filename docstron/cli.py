@@ -0,0 +1,243 @@
+"""
+Command line interface: ``docstron <command>``
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+
+def _bench(args: argparse.Namespace) -> int:
+    from .bench import run_bench
+    from .mock_server import MockServer
+
+    client_options = {"max_retries": args.max_retries}
+    if args.pool_maxsize is not None:
+        client_options["pool_maxsize"] = args.pool_maxsize
+    if args.transport is not None:
+        if args.mode == "async":
+            raise SystemExit("--transport only applies to --mode threads")
+        client_options["transport"] = args.transport
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        profile = _profile(args)
+        server = MockServer(profile).start()
+        base_url = server.url
+        if not args.json:
+            print(f"Mock server at {base_url} with {profile}", file=sys.stderr)
+    try:
+        result = run_bench(
+            base_url,
+            api_key=args.api_key,
+            operation=args.operation,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            mode=args.mode,
+            **client_options,
+        )
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.json:
+        print(json.dumps(result.as_dict(), indent=2))
+    else:
+        print(result.format())
+    return 0
+
+
+def _batch(args: argparse.Namespace) -> int:
+    from .batch import run_batch
+    from .client import Docstron
+
+    api_key = args.api_key or os.environ.get("DOCSTRON_API_KEY")
+    if not api_key:
+        raise SystemExit("Pass --api-key or set DOCSTRON_API_KEY")
+    client_options = {
+        "max_retries": args.max_retries,
+        "pool_maxsize": args.concurrency,
+        # Rows in flight when a run dies are replayed with the same key
+        "idempotency": True,
+    }
+    if args.url is not None:
+        client_options["base_url"] = args.url
+
+    def progress(report):
+        done = report.succeeded + report.failed
+        if done % args.progress_every == 0:
+            print(
+                f"{report.succeeded} generated, {report.failed} failed, "
+                f"{report.skipped} already done",
+                file=sys.stderr,
+                flush=True,
+            )
+
+    with Docstron(api_key=api_key, **client_options) as client:
+        try:
+            report = run_batch(
+                client,
+                template_id=args.template,
+                source=args.input,
+                output_dir=args.output,
+                response_type=args.response_type,
+                concurrency=args.concurrency,
+                key_field=args.key_field,
+                format=args.format,
+                validate=args.validate,
+                fsync=args.fsync,
+                progress=progress if args.progress_every else None,
+            )
+        except KeyboardInterrupt:
+            print("Interrupted; run the same command again to resume", file=sys.stderr)
+            return 130
+    print(report.format())
+    return 1 if report.failed else 0
+
+
+def _profile(args: argparse.Namespace):
+    """The named profile with any command line overrides applied"""
+    from .mock_server import PROFILES
+
+    return PROFILES[args.profile].copy(
+        latency=None if args.latency is None else args.latency / 1000,
+        jitter=None if args.jitter is None else args.jitter / 1000,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        pdf_size=args.pdf_size,
+        seed=args.seed,
+    )
+
+
+def _mock_server(args: argparse.Namespace) -> int:
+    from .mock_server import MockServer
+
+    server = MockServer(_profile(args), host=args.host, port=args.port)
+    print(f"Serving mock Docstron API at {server.url} (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+def _add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    from .mock_server import PROFILES
+
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="instant")
+    parser.add_argument("--latency", type=float, help="mean latency in ms")
+    parser.add_argument("--jitter", type=float, help="latency spread in ms")
+    parser.add_argument("--error-rate", type=float, help="fraction of 500 responses")
+    parser.add_argument("--throttle-rate", type=float, help="fraction of 429 responses")
+    parser.add_argument("--pdf-size", type=int, help="PDF size in bytes")
+    parser.add_argument("--seed", type=int, help="random seed for repeatable runs")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser for the ``docstron`` command"""
+    from .bench import OPERATIONS
+
+    parser = argparse.ArgumentParser(
+        prog="docstron", description="Docstron Python SDK tools"
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    bench = commands.add_parser(
+        "bench",
+        help="measure throughput and latency against a mock or real server",
+        description=(
+            "Drive the Docstron client with many threads or async tasks and "
+            "report throughput, p50/p95/p99 latency, errors and memory. "
+            "Without --url a local mock server is started in-process."
+        ),
+    )
+    bench.add_argument("--url", help="base URL of a running server to target")
+    bench.add_argument("--api-key", default="bench-key", help="API key to send")
+    bench.add_argument("--operation", choices=sorted(OPERATIONS), default="generate")
+    bench.add_argument("-n", "--requests", type=int, default=1000)
+    bench.add_argument("-c", "--concurrency", type=int, default=16)
+    bench.add_argument("--mode", choices=["threads", "async"], default="threads")
+    bench.add_argument(
+        "--pool-maxsize", type=int, help="connection pool size (default: concurrency)"
+    )
+    bench.add_argument("--max-retries", type=int, default=2)
+    bench.add_argument("--transport", choices=["requests", "urllib3", "http2"])
+    bench.add_argument("--json", action="store_true", help="print results as JSON")
+
+    _add_profile_arguments(bench.add_argument_group("mock server (without --url)"))
+    bench.set_defaults(func=_bench)
+
+    batch = commands.add_parser(
+        "batch",
+        help="generate one document per row of a JSONL or CSV file",
+        description=(
+            "Stream rows from a JSONL or CSV file and generate a document per "
+            "row concurrently, writing PDFs (or document IDs) and a manifest "
+            "to the output directory. The manifest is a checkpoint: rerunning "
+            "the same command skips completed rows and retries failed ones."
+        ),
+    )
+    batch.add_argument("input", help="JSONL (.jsonl/.ndjson) or CSV (.csv/.tsv) file")
+    batch.add_argument("-t", "--template", required=True, help="template ID")
+    batch.add_argument("-o", "--output", required=True, help="output directory")
+    batch.add_argument(
+        "--response-type",
+        choices=["pdf", "document_id"],
+        default="pdf",
+        help="write PDF files (default) or only record document IDs",
+    )
+    batch.add_argument("-c", "--concurrency", type=int, default=8)
+    batch.add_argument(
+        "--key-field",
+        help="column that identifies a row across runs and names its PDF "
+        "(default: the row number)",
+    )
+    batch.add_argument("--format", choices=["jsonl", "csv"])
+    batch.add_argument(
+        "--validate",
+        action="store_true",
+        help="check rows against the template's placeholders before sending",
+    )
+    batch.add_argument(
+        "--fsync", action="store_true", help="fsync the manifest after every row"
+    )
+    batch.add_argument("--api-key", help="API key (default: $DOCSTRON_API_KEY)")
+    batch.add_argument("--url", help="API base URL")
+    batch.add_argument("--max-retries", type=int, default=2)
+    batch.add_argument(
+        "--progress-every",
+        type=int,
+        default=1000,
+        help="report progress every N rows on stderr (0 disables)",
+    )
+    batch.set_defaults(func=_batch)
+
+    server = commands.add_parser(
+        "mock-server",
+        help="serve a mock Docstron API for load tests",
+        description=(
+            "Serve a fake Docstron API with configurable latency, 500s and "
+            "429s, e.g. to run `docstron bench --url` from another process."
+        ),
+    )
+    server.add_argument("--host", default="127.0.0.1")
+    server.add_argument("--port", type=int, default=8080)
+    _add_profile_arguments(server)
+    server.set_defaults(func=_mock_server)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the ``docstron`` command"""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,14 @@
 Main Docstron client
 """
 
+import os
+from typing import Optional, Union
 from .base import BaseClient
+from .cache import TTLCache
+from .delta import VersionStore
+from .idempotency import IdempotencyLedger, build_ledger
+from .lazy import lazy_attribute
+from .pdf_cache import PDFCache
 from .resources import Applications, Templates, Documents, Usage
 
 
@@ -13,6 +20,50 @@ class Docstron(BaseClient):
     Args:
         api_key: Your Docstron API key
         base_url: Base URL for the API (default: https://api.docstron.com/v1)
+        metadata_cache_ttl: Seconds to cache ``templates.get`` and
+            ``applications.get`` results in memory (default: None, disabled)
+        metadata_cache_size: Maximum cached entries per resource (default: 256)
+        pdf_cache: Directory (or PDFCache) for caching generated PDFs on disk,
+            so repeated 'pdf' generations with identical inputs are served
+            locally (default: None, disabled)
+        idempotency: Send an ``Idempotency-Key`` derived from each generation
+            request, so timed-out generations are retried safely and
+            replays resolve to the original document. True keeps a ledger of
+            recent results in memory, a path persists it across restarts,
+            or pass an IdempotencyLedger (default: None, disabled)
+        delta_updates: Remember the last version of each template and
+            document seen through this client, so ``templates.update`` and
+            ``documents.update`` send only the changed fields and skip
+            updates that change nothing (default: False)
+        **options: Transport options passed to BaseClient:
+            - max_retries: Automatic retries for throttled/failed requests
+              (default: 2, 0 disables)
+            - retry_policy: RetryPolicy for full control over retries
+            - rate_limit: Client-side pacing (limiter, plan-style limit such
+              as 120 or "10/second", or "auto" to use the plan's limit)
+            - rate_limit_headroom: Fraction of the plan limit to use
+            - rate_limit_path: State file to share the limit across processes
+            - pool_maxsize: Connections kept open to the API (default: 10);
+              match it to the number of threads sharing the client
+            - pool_connections, pool_block, keepalive_expiry: Further
+              connection pool tuning
+            - timeout: Default request timeout, seconds or (connect, read)
+            - compression: Compress large JSON bodies ("gzip", "zstd" or a
+              RequestCompressor); compression_threshold sets the minimum size
+            - json_codec: JSON library for payloads and responses ("json",
+              "orjson", "msgspec" or "auto")
+            - coalesce_requests: Share one HTTP call among concurrent
+              identical GETs (default: False)
+            - metrics: True or a MetricsRegistry for per-endpoint timing
+              histograms (exportable to Prometheus)
+            - event_hooks: Callables receiving a RequestEvent per request
+            - transport: "requests" (default), "urllib3", "http2" or a
+              Transport instance
+
+    A single client is meant to be shared by all threads of a process (e.g.
+    a ThreadPoolExecutor) so they reuse pooled connections; see BaseClient
+    for what the default ``requests.Session`` transport does and does not
+    guarantee across threads.
     
     Example:
         >>> from docstron import Docstron
@@ -39,11 +90,53 @@ class Docstron(BaseClient):
         >>> usage = client.usage.get()
     """
 
-    def __init__(self, api_key: str, base_url: str = "https://api.docstron.com/v1"):
-        super().__init__(api_key, base_url)
-        
-        # Initialize resource classes
-        self.applications = Applications(self)
-        self.templates = Templates(self)
-        self.documents = Documents(self)
-        self.usage = Usage(self)
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.docstron.com/v1",
+        metadata_cache_ttl: Optional[float] = None,
+        metadata_cache_size: int = 256,
+        pdf_cache: Union[PDFCache, str, os.PathLike, None] = None,
+        idempotency: Union[IdempotencyLedger, bool, str, os.PathLike, None] = None,
+        delta_updates: bool = False,
+        **options,
+    ):
+        super().__init__(api_key, base_url, **options)
+
+        self._app_cache = self._template_cache = None
+        if metadata_cache_ttl is not None:
+            self._app_cache = TTLCache(metadata_cache_size, metadata_cache_ttl)
+            self._template_cache = TTLCache(metadata_cache_size, metadata_cache_ttl)
+        if pdf_cache is not None and not isinstance(pdf_cache, PDFCache):
+            pdf_cache = PDFCache(pdf_cache)
+        self._pdf_cache = pdf_cache
+        self._ledger = build_ledger(idempotency)
+        self._delta_updates = delta_updates
+
+    def _versions(self) -> Optional[VersionStore]:
+        """A store of last known versions for a resource, if delta updates are on"""
+        return VersionStore() if self._delta_updates else None
+
+    # Resources are built on first access, so short-lived clients only pay
+    # for the ones they use
+
+    @lazy_attribute
+    def applications(self) -> Applications:
+        return Applications(self, cache=self._app_cache)
+
+    @lazy_attribute
+    def templates(self) -> Templates:
+        return Templates(self, cache=self._template_cache, versions=self._versions())
+
+    @lazy_attribute
+    def documents(self) -> Documents:
+        return Documents(
+            self,
+            pdf_cache=self._pdf_cache,
+            ledger=self._ledger,
+            versions=self._versions(),
+        )
+
+    @lazy_attribute
+    def usage(self) -> Usage:
+        return Usage(self)
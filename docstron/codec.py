@@ -0,0 +1,119 @@
+"""
+JSON codecs used to encode request bodies and decode API responses
+"""
+
+import json
+from typing import Any, Union
+
+
+class JSONCodec:
+    """
+    Serialize request payloads and parse response bodies
+
+    Subclass this (or pass any object with ``dumps``/``loads``) to plug a
+    different JSON library into a client. ``loads`` must raise ValueError
+    on malformed input.
+    """
+
+    #: Short name shown in benchmarks and repr
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize ``obj`` to UTF-8 JSON bytes"""
+        return json.dumps(obj, allow_nan=False).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Parse a JSON document"""
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec backed by ``orjson`` (``pip install orjson``)"""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        # orjson.JSONDecodeError is a ValueError subclass
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """JSON codec backed by ``msgspec`` (``pip install msgspec``)"""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._error = msgspec.DecodeError
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._error as e:
+            raise ValueError(str(e)) from None
+
+
+_CODECS = {
+    "json": JSONCodec,
+    "stdlib": JSONCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+
+def get_codec(codec: Union[JSONCodec, str, None] = None) -> JSONCodec:
+    """
+    Resolve a client's ``json_codec`` option
+
+    Args:
+        codec: A codec instance, a library name (``"json"``, ``"orjson"`` or
+            ``"msgspec"``), ``"auto"`` for the fastest installed library, or
+            None for the standard library
+
+    Raises:
+        ImportError: If the named library is not installed
+        ValueError: If the name is unknown
+
+    Example:
+        >>> get_codec('auto')
+        <OrjsonCodec orjson>
+    """
+    if codec is None:
+        return JSONCodec()
+    if not isinstance(codec, str):
+        return codec
+    if codec == "auto":
+        for candidate in (OrjsonCodec, MsgspecCodec):
+            try:
+                return candidate()
+            except ImportError:
+                continue
+        return JSONCodec()
+    try:
+        codec_class = _CODECS[codec]
+    except KeyError:
+        raise ValueError(f"Unknown JSON codec: {codec!r}") from None
+    try:
+        return codec_class()
+    except ImportError:
+        raise ImportError(
+            f"The {codec!r} JSON codec requires {codec}. "
+            f"Install it with: pip install {codec}"
+        ) from None
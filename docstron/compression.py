@@ -0,0 +1,120 @@
+"""
+Request body compression for the Docstron API
+"""
+
+import gzip
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+#: JSON bodies smaller than this many bytes are sent uncompressed
+DEFAULT_COMPRESSION_THRESHOLD = 16 * 1024
+
+
+class RequestCompressor:
+    """
+    Compress JSON request bodies above a size threshold
+
+    Each payload is serialized and compressed once, before the first attempt,
+    so retries resend the same bytes. Bodies that would not shrink are sent
+    as-is. The counters are thread-safe and show what compression saved.
+
+    Args:
+        encoding: ``"gzip"`` (default) or ``"zstd"``, which requires the
+            optional ``zstandard`` package (``pip install docstron[zstd]``)
+        threshold: Minimum body size in bytes worth compressing
+            (default: 16 KiB)
+        level: Compression level (default: 6 for gzip, 3 for zstd)
+
+    Example:
+        >>> client = Docstron(api_key='your-api-key', compression='gzip')
+        >>> client.documents.quick_generate(html=large_html, data=data)
+        >>> client.compressor.stats()
+        {'requests_compressed': 1, 'bytes_in': 612345, 'bytes_out': 98304, 'bytes_saved': 514041}
+    """
+
+    def __init__(
+        self,
+        encoding: str = "gzip",
+        threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        level: Optional[int] = None,
+    ):
+        if encoding == "gzip":
+            level = 6 if level is None else level
+            self._compress = lambda body: gzip.compress(
+                body, compresslevel=level, mtime=0
+            )
+        elif encoding == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError(
+                    "zstd compression requires zstandard. "
+                    "Install it with: pip install docstron[zstd]"
+                ) from None
+            level = 3 if level is None else level
+            # ZstdCompressor instances are not thread-safe; one per call is cheap
+            self._compress = lambda body: zstandard.ZstdCompressor(level).compress(body)
+        else:
+            raise ValueError(f"Unsupported compression encoding: {encoding!r}")
+
+        self.encoding = encoding
+        self.threshold = threshold
+        self.level = level
+        self.requests_compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._lock = threading.Lock()
+
+    @property
+    def bytes_saved(self) -> int:
+        """Upload bytes avoided so far"""
+        return self.bytes_in - self.bytes_out
+
+    def compress(self, body: bytes) -> Tuple[bytes, Optional[str]]:
+        """
+        Compress ``body`` if it is large enough to benefit
+
+        Returns:
+            The bytes to send and the Content-Encoding to declare, or None
+            when the body is sent uncompressed
+        """
+        if len(body) < self.threshold:
+            return body, None
+        compressed = self._compress(body)
+        if len(compressed) >= len(body):
+            return body, None
+        with self._lock:
+            self.requests_compressed += 1
+            self.bytes_in += len(body)
+            self.bytes_out += len(compressed)
+        return compressed, self.encoding
+
+    def stats(self) -> Dict[str, int]:
+        """Compressed request count and byte counters"""
+        with self._lock:
+            return {
+                "requests_compressed": self.requests_compressed,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "bytes_saved": self.bytes_in - self.bytes_out,
+            }
+
+
+def build_compressor(
+    compression: Union[RequestCompressor, str, bool, None],
+    threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+) -> Optional[RequestCompressor]:
+    """
+    Build a compressor from a client's ``compression`` option
+
+    Args:
+        compression: A RequestCompressor, an encoding name, True for gzip,
+            or None/False to disable compression
+        threshold: Minimum body size in bytes worth compressing
+    """
+    if isinstance(compression, RequestCompressor):
+        return compression
+    if not compression:
+        return None
+    encoding = "gzip" if compression is True else compression
+    return RequestCompressor(encoding, threshold=threshold)
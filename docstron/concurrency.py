@@ -0,0 +1,185 @@
+"""
+Concurrency helpers for batch operations
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Optional
+
+
+class BatchResult:
+    """
+    Outcome of a single item in a batch operation
+
+    Attributes:
+        index: Position of the item in the input iterable
+        item: The input item itself
+        result: The value returned for the item (None if it failed)
+        error: The exception raised for the item (None if it succeeded)
+    """
+
+    __slots__ = ("index", "item", "result", "error")
+
+    def __init__(
+        self,
+        index: int,
+        item: Any,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ):
+        self.index = index
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item succeeded"""
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        """Return the result, re-raising the item's exception if it failed"""
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"BatchResult(index={self.index}, ok=True)"
+        return f"BatchResult(index={self.index}, error={self.error!r})"
+
+
+def _call(func: Callable[[Any], Any], index: int, item: Any) -> BatchResult:
+    try:
+        return BatchResult(index, item, result=func(item))
+    except Exception as e:
+        return BatchResult(index, item, error=e)
+
+
+def map_concurrently(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    concurrency: int = 8,
+    ordered: bool = True,
+) -> Iterator[BatchResult]:
+    """
+    Apply ``func`` to every item on a thread pool, yielding a BatchResult each
+
+    Items are pulled from ``items`` lazily and at most ``2 * concurrency`` are
+    in flight at once, so arbitrarily large iterables run in bounded memory.
+    An exception raised for one item is captured on its BatchResult instead of
+    aborting the batch.
+
+    Args:
+        func: Callable invoked with each item
+        items: Iterable of items to process
+        concurrency: Number of worker threads
+        ordered: Yield results in input order (True) or as they complete (False)
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    window = concurrency * 2
+    source = enumerate(items)
+    executor = ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="docstron-batch"
+    )
+    pending = deque() if ordered else set()
+
+    def submit_next() -> bool:
+        try:
+            index, item = next(source)
+        except StopIteration:
+            return False
+        future = executor.submit(_call, func, index, item)
+        if ordered:
+            pending.append(future)
+        else:
+            pending.add(future)
+        return True
+
+    try:
+        while len(pending) < window and submit_next():
+            pass
+
+        if ordered:
+            while pending:
+                future = pending.popleft()
+                submit_next()
+                yield future.result()
+        else:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    submit_next()
+                for future in done:
+                    yield future.result()
+    finally:
+        # Runs when the batch finishes or the caller abandons the generator
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+async def amap_concurrently(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    concurrency: int = 8,
+    ordered: bool = True,
+) -> AsyncIterator[BatchResult]:
+    """
+    Async counterpart of :func:`map_concurrently`
+
+    ``func`` must return an awaitable; at most ``concurrency`` of them run at
+    once on the current event loop.
+    """
+    import asyncio
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    async def call(index: int, item: Any) -> BatchResult:
+        try:
+            return BatchResult(index, item, result=await func(item))
+        except Exception as e:
+            return BatchResult(index, item, error=e)
+
+    source = enumerate(items)
+    pending = deque() if ordered else set()
+
+    def submit_next() -> bool:
+        try:
+            index, item = next(source)
+        except StopIteration:
+            return False
+        task = asyncio.ensure_future(call(index, item))
+        if ordered:
+            pending.append(task)
+        else:
+            pending.add(task)
+        return True
+
+    try:
+        while len(pending) < concurrency and submit_next():
+            pass
+
+        if ordered:
+            while pending:
+                task = pending.popleft()
+                result = await task
+                submit_next()
+                yield result
+        else:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    pending.remove(task)
+                    submit_next()
+                for task in done:
+                    yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,168 @@
+"""
+Last known versions of records, for updates that send only changed fields
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def response_record(response: Any) -> Dict[str, Any]:
+    """The record (``data`` object) of an API response, or an empty dict"""
+    data = response.get("data") if isinstance(response, dict) else None
+    return data if isinstance(data, dict) else {}
+
+
+def changed_fields(
+    known: Optional[Dict[str, Any]], fields: Dict[str, Any]
+) -> Dict[str, Any]:
+    """The entries of ``fields`` that differ from the ``known`` record"""
+    if known is None:
+        return dict(fields)
+    return {
+        name: value
+        for name, value in fields.items()
+        if name not in known or known[name] != value
+    }
+
+
+def fields_if_changed(
+    known: Dict[str, Any], fields: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """The changed entries of ``fields``, or None if there are none"""
+    return changed_fields(known, fields) or None
+
+
+def data_if_changed(
+    known: Optional[Dict[str, Any]], data: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    All of a document's ``data``, or None if it equals the known attributes
+
+    A document update replaces the attributes, so a partial body would
+    drop the keys left out. The known version only decides whether the
+    request is needed.
+    """
+    return None if known == data else dict(data)
+
+
+def unchanged_response(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Response returned instead of sending an update that changes nothing"""
+    return {"success": True, "data": copy.deepcopy(record), "not_modified": True}
+
+
+class VersionStore:
+    """
+    Bounded record of the last known version of each template or document
+
+    Filled from the responses of get, create and update calls, and used by
+    template updates to send only the fields that changed, and by template
+    and document updates to send no request at all when nothing did.
+    Records are copied in and out, so callers modifying a response never
+    change the known version.
+
+    The known version is what this client last saw. Changes made by other
+    clients are not noticed, so an update may skip a field that was changed
+    elsewhere in the meantime; call :meth:`forget` (or get the record
+    again) when that matters.
+
+    Args:
+        max_entries: Maximum records kept; the least recently used are
+            dropped first (default: 1024)
+
+    Example:
+        >>> client = Docstron(api_key='your-api-key', delta_updates=True)
+        >>> client.templates.get(template_id)
+        >>> client.templates.update(template_id, name='Invoice v2')  # sends only name
+        >>> client.templates.versions.skipped  # updates that needed no request
+        0
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.skipped = 0  # updates answered without a request
+        self._records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """A copy of the last known version of ``key``, or None"""
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                return None
+            self._records.move_to_end(key)
+            return copy.deepcopy(record)
+
+    def remember(self, key: str, record: Dict[str, Any]) -> None:
+        """Store ``record`` as the last known version of ``key``"""
+        record = copy.deepcopy(record)
+        with self._lock:
+            self._records[key] = record
+            self._records.move_to_end(key)
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+
+    def forget(self, key: str) -> None:
+        """Drop the known version of ``key``, so the next update sends everything"""
+        with self._lock:
+            self._records.pop(key, None)
+
+    def count_skipped(self) -> None:
+        """Count an update that needed no request"""
+        with self._lock:
+            self.skipped += 1
+
+    def clear(self) -> None:
+        """Drop every known version"""
+        with self._lock:
+            self._records.clear()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+def plan_update(
+    versions: Optional[VersionStore],
+    key: str,
+    fields: Dict[str, Any],
+    delta: Optional[bool] = None,
+    diff: Callable[
+        [Dict[str, Any], Dict[str, Any]], Optional[Dict[str, Any]]
+    ] = fields_if_changed,
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    The known version of ``key`` and the fields an update has to send
+
+    Fields are diffed against the known version unless ``delta`` is False.
+    ``diff`` returns None instead of the fields when nothing changed, in
+    which case no request is needed.
+    """
+    previous = None if versions is None else versions.get(key)
+    if previous is None or delta is False:
+        return previous, fields
+    return previous, diff(previous, fields)
+
+
+def remember_update(
+    versions: Optional[VersionStore],
+    key: str,
+    previous: Optional[Dict[str, Any]],
+    response: Any,
+    fields: Dict[str, Any],
+) -> None:
+    """
+    Record the version after a successful update
+
+    Fields returned by the server win over the ``fields`` sent, which only
+    fill in what the response leaves out.
+    """
+    if versions is not None:
+        versions.remember(
+            key, {**(previous or {}), **fields, **response_record(response)}
+        )
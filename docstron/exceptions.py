@@ -32,12 +32,43 @@ class ValidationError(DocstronError):
 
 
 class RateLimitError(DocstronError):
-    """Raised when rate limit is exceeded"""
+    """
+    Raised when rate limit is exceeded
 
-    pass
+    ``retry_after`` holds the number of seconds the API asked clients to wait,
+    when the response included a Retry-After or rate-limit reset header.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status_code: int = None,
+        response: dict = None,
+        retry_after: float = None,
+    ):
+        super().__init__(message, status_code=status_code, response=response)
+        self.retry_after = retry_after
 
 
 class ServerError(DocstronError):
     """Raised when server encounters an error"""
 
     pass
+
+
+class ResponseTooLargeError(DocstronError):
+    """Raised when a streamed response exceeds the configured max_size"""
+
+    pass
+
+
+class DocumentFailedError(DocstronError):
+    """Raised when the API reports that rendering a document failed"""
+
+    pass
+
+
+class WaitTimeoutError(DocstronError):
+    """Raised when a document is not ready before a wait times out"""
+
+    pass
@@ -0,0 +1,159 @@
+"""
+Idempotency keys and a local ledger of recent generations
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+
+from .pdf_cache import cache_key
+
+#: Request header carrying the idempotency key
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+#: Default time an idempotency key stays valid (24 hours, like most APIs)
+DEFAULT_TTL = 24 * 60 * 60
+
+
+def generation_key(endpoint: str, payload: Dict[str, Any]) -> str:
+    """
+    Deterministic idempotency key of a generation request
+
+    The same endpoint and payload always give the same key, so a request
+    replayed after a timeout, a worker restart or a batch resume is
+    recognized as the original one, in this process or any other.
+
+    Example:
+        >>> generation_key('documents/generate', {'template_id': 't-1'})
+        'gen-5bd1...'
+    """
+    return "gen-" + cache_key({"endpoint": endpoint, "payload": payload})
+
+
+class IdempotencyLedger:
+    """
+    Bounded record of recently completed generations, keyed by idempotency key
+
+    A generation whose key is in the ledger resolves to the stored response
+    without calling the API. Only JSON responses (``document_id``) are
+    stored; PDFs are covered by the PDF cache. With a ``path`` the ledger is
+    appended to a JSON Lines file and reloaded by the next process, so
+    replays after a restart are recognized too.
+
+    Args:
+        path: Optional file to persist the ledger in
+        ttl: Seconds an entry stays valid (default: 24 hours)
+        max_entries: Maximum entries kept; the oldest are dropped first
+            (default: 10000)
+
+    Example:
+        >>> client = Docstron(api_key='your-api-key', idempotency='ledger.jsonl')
+        >>> first = client.documents.generate('template-123', {'name': 'Acme'})
+        >>> again = client.documents.generate('template-123', {'name': 'Acme'})
+        >>> again == first  # resolved locally, no second render
+        True
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike, None] = None,
+        ttl: Optional[float] = DEFAULT_TTL,
+        max_entries: int = 10000,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = None if path is None else os.fspath(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self._load()
+
+    def _expired(self, recorded_at: float, now: float) -> bool:
+        return self.ttl is not None and recorded_at + self.ttl <= now
+
+    def _load(self) -> None:
+        """Read the persisted entries, compacting the file if mostly stale"""
+        if not os.path.exists(self.path):
+            return
+        now = time.time()
+        lines = 0
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                    key, recorded_at = entry["key"], entry["at"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if not self._expired(recorded_at, now):
+                    self._put(key, recorded_at, entry.get("result"))
+        if lines > 2 * len(self._entries) + 100:
+            self._rewrite()
+
+    def _rewrite(self) -> None:
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            for key, (recorded_at, result) in self._entries.items():
+                f.write(self._line(key, recorded_at, result))
+        os.replace(temporary, self.path)
+
+    @staticmethod
+    def _line(key: str, recorded_at: float, result: Any) -> str:
+        entry = {"key": key, "at": recorded_at, "result": result}
+        return json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+
+    def _put(self, key: str, recorded_at: float, result: Any) -> None:
+        self._entries[key] = (recorded_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """The stored response for ``key``, or None if unknown or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            recorded_at, result = entry
+            if self._expired(recorded_at, time.time()):
+                del self._entries[key]
+                return None
+            self.hits += 1
+            return copy.deepcopy(result)
+
+    def record(self, key: str, result: Any) -> None:
+        """Store the response of a completed generation"""
+        recorded_at = time.time()
+        with self._lock:
+            self._put(key, recorded_at, copy.deepcopy(result))
+            if self.path is not None:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(self._line(key, recorded_at, result))
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(entry[0], time.time())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def build_ledger(
+    idempotency: Union[IdempotencyLedger, bool, str, os.PathLike, None],
+) -> Optional[IdempotencyLedger]:
+    """Resolve the ``idempotency`` client option to a ledger (or None)"""
+    if idempotency is None or idempotency is False:
+        return None
+    if isinstance(idempotency, IdempotencyLedger):
+        return idempotency
+    if idempotency is True:
+        return IdempotencyLedger()
+    return IdempotencyLedger(idempotency)
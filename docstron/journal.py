@@ -0,0 +1,116 @@
+"""
+Append-only checkpoint journal for resumable batch jobs
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, Optional, Set, Union
+
+
+class CheckpointJournal:
+    """
+    Record of completed work items in a JSON Lines file
+
+    Every finished item is appended as one JSON object carrying its ``key``
+    and ``status`` and flushed straight away, so after a crash the journal
+    holds everything that completed. Reopening the same file restores the
+    completed keys, letting a job skip them. The last entry for a key wins,
+    so an item that failed earlier counts as done once a retry succeeds. A
+    line truncated by a crash is ignored.
+
+    Only the set of completed keys is kept in memory, never the entries.
+
+    Args:
+        path: Journal file; created (with parent directories) if missing
+        fsync: Also fsync after every entry, so completed items survive a
+            power loss and not just a crashed process (default: False)
+
+    Example:
+        >>> with CheckpointJournal('out/manifest.jsonl') as journal:
+        ...     if not journal.is_done('row-42'):
+        ...         journal.record('row-42', document_id='document-123')
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], fsync: bool = False):
+        self.path = os.fspath(path)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._completed: Set[str] = set()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        for entry in self.entries():
+            if entry.get("status") == "ok":
+                self._completed.add(entry["key"])
+            else:
+                self._completed.discard(entry["key"])
+        self._file = open(self.path, "a+", encoding="utf-8")
+        self._terminate_partial_line()
+
+    def _terminate_partial_line(self) -> None:
+        """Start a fresh line if the last run died halfway through one"""
+        size = self._file.seek(0, os.SEEK_END)
+        if size:
+            with open(self.path, "rb") as f:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+                    self._file.flush()
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the entries already in the journal file"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and "key" in entry:
+                    yield entry
+
+    @property
+    def completed(self) -> int:
+        """Number of keys completed so far"""
+        return len(self._completed)
+
+    def is_done(self, key: str) -> bool:
+        """Whether ``key`` has completed successfully"""
+        return key in self._completed
+
+    def record(self, key: str, error: Optional[str] = None, **fields: Any) -> None:
+        """
+        Append the outcome of one item
+
+        Args:
+            key: Identifier of the item
+            error: Error message if the item failed; the item is then retried
+                by the next run
+            **fields: Further JSON-serializable details to store
+        """
+        entry = {"key": key, "status": "error" if error else "ok"}
+        entry.update(fields)
+        if error:
+            entry["error"] = error
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            if error:
+                self._completed.discard(key)
+            else:
+                self._completed.add(key)
+
+    def close(self) -> None:
+        """Close the journal file"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,45 @@
+"""
+Deferred construction of client attributes
+"""
+
+import threading
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class lazy_attribute(Generic[T]):
+    """
+    Attribute computed on first access and then stored on the instance
+
+    Like ``functools.cached_property`` (which needs Python 3.8) but
+    thread-safe: concurrent first accesses build the value once. After that
+    the stored value is read directly, with no descriptor overhead, and it
+    can be replaced by plain assignment.
+
+    Example:
+        >>> class Client:
+        ...     @lazy_attribute
+        ...     def documents(self):
+        ...         return Documents(self)
+    """
+
+    def __init__(self, factory: Callable[[Any], T]):
+        self.factory = factory
+        self.name = factory.__name__
+        self.__doc__ = factory.__doc__
+        self._lock = threading.RLock()
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Optional[Any], owner: Optional[type] = None) -> T:
+        if instance is None:
+            return self  # type: ignore[return-value]
+        with self._lock:
+            value = instance.__dict__.get(self.name, _MISSING)
+            if value is _MISSING:
+                value = instance.__dict__[self.name] = self.factory(instance)
+        return value
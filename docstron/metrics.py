@@ -0,0 +1,359 @@
+"""
+Request instrumentation: timing events, hooks and a metrics registry
+"""
+
+import bisect
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+#: Histogram buckets (seconds) for request phase durations
+DURATION_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+#: Histogram buckets (bytes) for request and response body sizes
+SIZE_BUCKETS = tuple(1024 * 4**i for i in range(9))  # 1 KiB .. 64 MiB
+
+#: Timed phases of a request, in the order they happen
+PHASES = ("queue", "connect", "ttfb", "transfer", "decode", "total")
+
+_ID_SEGMENT = re.compile(r"\d")
+
+
+def endpoint_label(endpoint: str) -> str:
+    """
+    Collapse resource IDs in an endpoint so metrics group by route
+
+    Example:
+        >>> endpoint_label('templates/template-c2465c0b-fc54-4672')
+        'templates/{id}'
+    """
+    return "/".join(
+        "{id}" if _ID_SEGMENT.search(part) else part for part in endpoint.split("/")
+    )
+
+
+class RequestEvent:
+    """
+    Timing and size details of one HTTP attempt
+
+    Durations are in seconds and None when a phase did not apply (for
+    example ``decode`` for a PDF download). ``transfer`` is the time spent
+    reading the body and ``decode`` the time spent parsing JSON. What comes
+    before the response headers depends on the client:
+
+    - Docstron (requests does not report connection phases): ``queue`` is
+      the wait for the client-side rate limiter, ``connect`` is None and
+      ``ttfb`` runs from sending the request until the response headers
+      arrived, including any wait for a pooled connection and connection
+      setup.
+    - AsyncDocstron (timed through httpx's ``trace`` extension): ``queue``
+      also includes the wait for a pooled connection, ``connect`` is the
+      TCP and TLS setup of a new connection (None when one was reused) and
+      ``ttfb`` runs from sending the request headers until the response
+      headers arrived. Transports that report no trace events, such as
+      ``httpx.MockTransport``, are timed like the synchronous client.
+
+    Attributes:
+        method: HTTP method
+        endpoint: Endpoint with IDs collapsed, e.g. ``templates/{id}``
+        path: Endpoint as requested
+        attempt: 1 for the first try, 2+ for retries
+        status_code: HTTP status, or None if no response was received
+        error: Exception raised while sending, if any
+        retried: Whether the client retried after this attempt
+        request_bytes: Size of the request body (None if unknown)
+        response_bytes: Size of the response body (None if unknown)
+    """
+
+    __slots__ = (
+        "method",
+        "endpoint",
+        "path",
+        "attempt",
+        "status_code",
+        "error",
+        "retried",
+        "request_bytes",
+        "response_bytes",
+        "queue",
+        "connect",
+        "ttfb",
+        "transfer",
+        "decode",
+        "total",
+        "started",
+    )
+
+    def __init__(self, method: str, path: str, attempt: int, started: float):
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint_label(path)
+        self.attempt = attempt
+        self.started = started
+        self.status_code: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.retried = False
+        self.request_bytes: Optional[int] = None
+        self.response_bytes: Optional[int] = None
+        self.queue: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self.transfer: Optional[float] = None
+        self.decode: Optional[float] = None
+        self.total: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The event's fields as a dictionary (e.g. for structured logging)"""
+        return {
+            name: getattr(self, name) for name in self.__slots__ if name != "started"
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestEvent({self.method} {self.path} status={self.status_code} "
+            f"total={self.total})"
+        )
+
+
+class Histogram:
+    """Thread-safe cumulative histogram with fixed bucket bounds"""
+
+    def __init__(self, buckets: Sequence[float] = DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one value"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """``(upper bound, count <= bound)`` pairs, ending with +Inf"""
+        with self._lock:
+            counts = list(self.counts)
+        pairs, running = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """
+    In-process metrics aggregated from request events
+
+    Keeps a duration histogram per method, endpoint and phase, body size
+    histograms, and request counts per status code. Pass one to several
+    clients to aggregate them together.
+
+    Example:
+        >>> client = Docstron(api_key='your-api-key', metrics=True)
+        >>> client.templates.get('template-123')
+        >>> print(client.metrics.to_prometheus())
+        # HELP docstron_request_duration_seconds Time spent per request phase
+        # TYPE docstron_request_duration_seconds histogram
+        docstron_request_duration_seconds_bucket{method="GET",endpoint="templates/{id}",phase="total",le="0.005"} 0
+        ...
+    """
+
+    def __init__(
+        self,
+        duration_buckets: Sequence[float] = DURATION_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS,
+    ):
+        self.duration_buckets = tuple(duration_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.durations: Dict[LabelKey, Histogram] = {}
+        self.sizes: Dict[LabelKey, Histogram] = {}
+        self.requests: Dict[LabelKey, int] = {}
+        self._lock = threading.Lock()
+
+    def _histogram(
+        self, family: Dict[LabelKey, Histogram], key: LabelKey, buckets: Sequence
+    ) -> Histogram:
+        histogram = family.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = family.setdefault(key, Histogram(buckets))
+        return histogram
+
+    def observe(self, event: RequestEvent) -> None:
+        """Aggregate one request event"""
+        labels = (("method", event.method), ("endpoint", event.endpoint))
+        status = str(event.status_code) if event.status_code is not None else "error"
+        with self._lock:
+            key = labels + (("status", status),)
+            self.requests[key] = self.requests.get(key, 0) + 1
+        for phase in PHASES:
+            value = getattr(event, phase)
+            if value is not None:
+                key = labels + (("phase", phase),)
+                self._histogram(self.durations, key, self.duration_buckets).observe(
+                    value
+                )
+        for direction, size in (
+            ("request", event.request_bytes),
+            ("response", event.response_bytes),
+        ):
+            if size is not None:
+                key = labels + (("direction", direction),)
+                self._histogram(self.sizes, key, self.size_buckets).observe(size)
+
+    def reset(self) -> None:
+        """Drop all recorded metrics"""
+        with self._lock:
+            self.durations.clear()
+            self.sizes.clear()
+            self.requests.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summary of recorded metrics as plain data
+
+        Returns:
+            Dict with ``requests`` (count per method, endpoint and status) and
+            ``durations`` (count, sum and mean seconds per method, endpoint
+            and phase)
+        """
+        with self._lock:
+            requests = dict(self.requests)
+            durations = dict(self.durations)
+        return {
+            "requests": {
+                " ".join(value for _, value in key): count
+                for key, count in requests.items()
+            },
+            "durations": {
+                " ".join(value for _, value in key): {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                }
+                for key, histogram in durations.items()
+            },
+        }
+
+    def to_prometheus(self, prefix: str = "docstron") -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        with self._lock:
+            requests = sorted(self.requests.items())
+            durations = sorted(self.durations.items())
+            sizes = sorted(self.sizes.items())
+
+        lines = [
+            f"# HELP {prefix}_requests_total HTTP requests by status code",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        for key, count in requests:
+            lines.append(f"{prefix}_requests_total{_labels(key)} {count}")
+        lines.extend(
+            _histogram_lines(
+                f"{prefix}_request_duration_seconds",
+                "Time spent per request phase",
+                durations,
+            )
+        )
+        lines.extend(
+            _histogram_lines(
+                f"{prefix}_body_size_bytes", "Request and response body sizes", sizes
+            )
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(key: Iterable[Tuple[str, str]]) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in key) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def _histogram_lines(
+    name: str, help_text: str, histograms: List[Tuple[LabelKey, Histogram]]
+) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for key, histogram in histograms:
+        for bound, count in histogram.cumulative():
+            bucket_key = key + (("le", _format_bound(bound)),)
+            lines.append(f"{name}_bucket{_labels(bucket_key)} {count}")
+        lines.append(f"{name}_sum{_labels(key)} {histogram.sum}")
+        lines.append(f"{name}_count{_labels(key)} {histogram.count}")
+    return lines
+
+
+class Instrumentation:
+    """
+    Dispatch finished request events to a metrics registry and hooks
+
+    Args:
+        hooks: Callables receiving each RequestEvent. They run on the thread
+            (or event loop) that made the request, so keep them fast;
+            exceptions they raise propagate to the caller.
+        registry: Optional MetricsRegistry to aggregate events into
+    """
+
+    def __init__(
+        self,
+        hooks: Iterable[Callable[[RequestEvent], Any]] = (),
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        self.hooks = list(hooks)
+        self.registry = registry
+        if registry is not None:
+            self.hooks.insert(0, registry.observe)
+
+    def start(self, method: str, path: str, attempt: int) -> RequestEvent:
+        """Begin timing an attempt"""
+        return RequestEvent(method, path, attempt, time.perf_counter())
+
+    def emit(self, event: RequestEvent) -> None:
+        """Finish an event and deliver it to every hook"""
+        event.total = time.perf_counter() - event.started
+        for hook in self.hooks:
+            hook(event)
+
+
+def build_instrumentation(
+    metrics: Any = None,
+    event_hooks: Optional[Iterable[Callable[[RequestEvent], Any]]] = None,
+) -> Tuple[Optional[Instrumentation], Optional[MetricsRegistry]]:
+    """
+    Build a client's instrumentation from its ``metrics``/``event_hooks``
+
+    Returns ``(None, None)`` when both are unset, so uninstrumented clients
+    skip all timing work.
+    """
+    registry = MetricsRegistry() if metrics is True else metrics or None
+    hooks = list(event_hooks or ())
+    if registry is None and not hooks:
+        return None, None
+    return Instrumentation(hooks, registry), registry
@@ -0,0 +1,213 @@
+"""
+Local mock Docstron HTTP server for load tests
+"""
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from .testing import FakeAPI
+
+
+class ServerProfile:
+    """
+    How the mock server behaves under load
+
+    Args:
+        latency: Mean seconds each request takes before it is answered
+        jitter: Spread in seconds around ``latency`` (uniform)
+        error_rate: Fraction of requests answered with a 500
+        throttle_rate: Fraction of requests answered with a 429
+        retry_after: ``Retry-After`` seconds sent with 429 responses
+        pdf_size: Size in bytes of generated and downloaded PDFs
+        seed: Seed for the random choices, for repeatable runs
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.0,
+        pdf_size: int = 32 * 1024,
+        seed: Optional[int] = None,
+    ):
+        if not 0 <= error_rate + throttle_rate <= 1:
+            raise ValueError("error_rate + throttle_rate must be between 0 and 1")
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.pdf_size = pdf_size
+        self.seed = seed
+
+    def copy(self, **overrides) -> "ServerProfile":
+        """A copy of this profile with some settings replaced"""
+        settings = dict(vars(self))
+        settings.update(
+            {name: value for name, value in overrides.items() if value is not None}
+        )
+        return ServerProfile(**settings)
+
+    def __repr__(self) -> str:
+        settings = ", ".join(f"{name}={value!r}" for name, value in vars(self).items())
+        return f"ServerProfile({settings})"
+
+
+#: Built-in profiles for ``docstron bench --profile``
+PROFILES: Dict[str, ServerProfile] = {
+    "instant": ServerProfile(),
+    "realistic": ServerProfile(latency=0.25, jitter=0.1, pdf_size=64 * 1024),
+    "flaky": ServerProfile(
+        latency=0.1, jitter=0.05, error_rate=0.02, throttle_rate=0.05
+    ),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY every
+    # response would wait on the client's delayed ACK
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, headers: Dict[str, str], body: bytes) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.mock.record(status)
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        mock = self.server.mock
+        delay, outcome = mock.plan()
+        if delay > 0:
+            time.sleep(delay)
+
+        if outcome == "throttle":
+            headers = {"Content-Type": "application/json"}
+            headers["Retry-After"] = f"{mock.profile.retry_after:g}"
+            message = {"success": False, "message": "Rate limit exceeded"}
+            self._reply(429, headers, json.dumps(message).encode())
+        elif outcome == "error":
+            message = {"success": False, "message": "Internal server error"}
+            headers = {"Content-Type": "application/json"}
+            self._reply(500, headers, json.dumps(message).encode())
+        else:
+            url = urlsplit(self.path)
+            self._reply(
+                *mock.api.handle(
+                    self.command,
+                    url.path,
+                    dict(parse_qsl(url.query)),
+                    body,
+                    self.headers,
+                )
+            )
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class MockServer:
+    """
+    Threaded HTTP server answering like the Docstron API
+
+    Serves :class:`~docstron.testing.FakeAPI` over real sockets, adding the
+    latency, server errors and throttling described by a ServerProfile, so
+    client concurrency, pool and retry settings can be tuned offline.
+
+    Args:
+        profile: Server behaviour (default: answer instantly, never fail)
+        host: Interface to bind (default: 127.0.0.1)
+        port: Port to bind; 0 (default) picks a free one
+
+    Example:
+        >>> with MockServer(PROFILES['realistic']) as server:
+        ...     client = Docstron(api_key='test-key', base_url=server.url)
+        ...     client.documents.generate('template-123', {'name': 'Acme'})
+    """
+
+    def __init__(
+        self,
+        profile: Optional[ServerProfile] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.profile = profile or ServerProfile()
+        self.api = FakeAPI(pdf_size=self.profile.pdf_size)
+        self.statuses: Counter = Counter()
+        self._random = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to the client as ``base_url``"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def plan(self):
+        """Pick the delay and outcome (ok, error or throttle) of one request"""
+        profile = self.profile
+        with self._lock:
+            roll = self._random.random()
+            spread = self._random.uniform(-profile.jitter, profile.jitter)
+        if roll < profile.throttle_rate:
+            outcome = "throttle"
+        elif roll < profile.throttle_rate + profile.error_rate:
+            outcome = "error"
+        else:
+            outcome = "ok"
+        return max(profile.latency + spread, 0.0), outcome
+
+    def record(self, status: int) -> None:
+        """Count a response by status code"""
+        with self._lock:
+            self.statuses[status] += 1
+
+    def start(self) -> "MockServer":
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="docstron-mock", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted"""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and close the socket"""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -0,0 +1,155 @@
+"""
+Lazy pagination over Docstron list endpoints
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+#: Default number of items requested per page
+DEFAULT_PAGE_SIZE = 100
+
+_ID_FIELDS = ("document_id", "template_id", "application_id", "id")
+
+
+def _first_id(items: List[Any]) -> Any:
+    """Identity of a page's first item (its ID field, or the item itself)"""
+    if not items:
+        return None
+    first = items[0]
+    if isinstance(first, dict):
+        for field in _ID_FIELDS:
+            if field in first:
+                return (field, first[field])
+    return first
+
+
+def _repeats(items: List[Any], previous_first: Any) -> bool:
+    """
+    Whether a page starts with the same item as the previous page
+
+    An endpoint that ignores ``offset``/``cursor`` returns the same full
+    page every time; without this check iteration would never end.
+    """
+    if not items or previous_first is None:
+        return False
+    return _first_id(items) == previous_first
+
+
+def _next_params(
+    response: Dict[str, Any], params: Dict[str, Any], page_size: int
+) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+    """
+    Split a page response into its items and the params for the next page
+
+    Cursor pagination is used when the API returns a ``next_cursor``;
+    otherwise the offset advances by the number of items received. Returns
+    None for the next params once the last page has been reached.
+    """
+    items = response.get("data") or []
+    meta = response.get("pagination") or response.get("meta") or {}
+    cursor = meta.get("next_cursor") or response.get("next_cursor")
+
+    if not items or meta.get("has_more") is False:
+        return items, None
+    if cursor:
+        next_params = dict(params, cursor=cursor)
+        next_params.pop("offset", None)
+        return items, next_params
+    # A short page is the last one; an oversized page means the endpoint
+    # ignored the limit and already returned everything.
+    if len(items) != page_size:
+        return items, None
+    return items, dict(params, offset=params.get("offset", 0) + len(items))
+
+
+def iter_items(
+    fetch: Callable[[Dict[str, Any]], Dict[str, Any]],
+    params: Dict[str, Any],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> Iterator[Any]:
+    """
+    Yield items from a paginated endpoint one page at a time
+
+    Only the current page (plus the next one when prefetching) is held in
+    memory. With ``prefetch`` the next page is requested on a background
+    thread while the caller works through the current one.
+
+    Args:
+        fetch: Callable that takes query params and returns a page response
+        params: Extra query params for every page
+        page_size: Number of items per page
+        prefetch: Fetch the next page in the background
+    """
+    params = dict(params, limit=page_size)
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    previous_first = None
+    try:
+        response = fetch(params)
+        while True:
+            items, next_params = _next_params(response, params, page_size)
+            if _repeats(items, previous_first):
+                return
+            previous_first = _first_id(items)
+            upcoming = None
+            if next_params is not None and executor is not None:
+                upcoming = executor.submit(fetch, next_params)
+
+            for item in items:
+                yield item
+
+            if next_params is None:
+                return
+            params = next_params
+            response = upcoming.result() if upcoming is not None else fetch(params)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_items(
+    fetch: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+    params: Dict[str, Any],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> AsyncIterator[Any]:
+    """Async counterpart of :func:`iter_items`"""
+    import asyncio
+
+    params = dict(params, limit=page_size)
+    upcoming = None
+    previous_first = None
+    try:
+        response = await fetch(params)
+        while True:
+            items, next_params = _next_params(response, params, page_size)
+            if _repeats(items, previous_first):
+                return
+            previous_first = _first_id(items)
+            if next_params is not None and prefetch:
+                upcoming = asyncio.ensure_future(fetch(next_params))
+
+            for item in items:
+                yield item
+
+            if next_params is None:
+                return
+            params = next_params
+            if upcoming is not None:
+                response = await upcoming
+                upcoming = None
+            else:
+                response = await fetch(params)
+    finally:
+        if upcoming is not None:
+            upcoming.cancel()
@@ -0,0 +1,214 @@
+"""
+Content-addressed on-disk cache for generated PDFs
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .streaming import DEFAULT_CHUNK_SIZE, Destination, open_destination
+
+#: Default size bound for the cache directory (1 GiB)
+DEFAULT_MAX_BYTES = 1024**3
+
+_SUFFIX = ".pdf"
+
+
+def cache_key(parts: Mapping[str, Any]) -> str:
+    """
+    Stable hash of everything that determines a generated PDF
+
+    The parts are serialized as canonical JSON (sorted keys, no whitespace),
+    so dictionaries that compare equal always map to the same key.
+
+    Example:
+        >>> key = cache_key({'template_id': 't-1', 'data': {'b': 2, 'a': 1}})
+        >>> key == cache_key({'data': {'a': 1, 'b': 2}, 'template_id': 't-1'})
+        True
+    """
+    canonical = json.dumps(
+        parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _TeeWriter:
+    """Write-only file object duplicating writes to two files"""
+
+    def __init__(self, first: IO[bytes], second: IO[bytes]):
+        self._first = first
+        self._second = second
+
+    def write(self, data: bytes) -> int:
+        self._second.write(data)
+        return self._first.write(data)
+
+
+class PDFCache:
+    """
+    Size-bounded LRU cache of generated PDFs in a local directory
+
+    Entries are named by the hash of their generation inputs, written through
+    a temporary file and renamed into place, and their modification time is
+    bumped on every hit. When the directory grows past ``max_bytes`` the least
+    recently used files are removed. Several processes on one host may share
+    a directory: readers never see partial files, and an entry evicted by
+    another process is simply a miss.
+
+    Args:
+        directory: Cache directory (created if missing)
+        max_bytes: Upper bound for the total size of cached PDFs
+            (default: 1 GiB)
+
+    Example:
+        >>> client = Docstron(api_key='your-api-key', pdf_cache='~/.cache/docstron')
+        >>> client.documents.generate('template-123', data, response_type='pdf')
+        >>> client.documents.generate('template-123', data, response_type='pdf')
+        >>> client.documents.pdf_cache.stats()['hits']
+        1
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = os.path.abspath(os.path.expanduser(os.fspath(directory)))
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + _SUFFIX)
+
+    def _entries(self) -> List[Tuple[float, str, int]]:
+        """(mtime, path, size) of every cached PDF"""
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def _open(self, key: str) -> Optional[IO[bytes]]:
+        """Open a cached entry and mark it recently used, or record a miss"""
+        path = self._path(key)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return f
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached PDF for ``key``, or None on a miss"""
+        f = self._open(key)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def copy_to(
+        self, key: str, destination: Destination, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Optional[int]:
+        """Copy the cached PDF into ``destination``; None on a miss"""
+        f = self._open(key)
+        if f is None:
+            return None
+        with f, open_destination(destination) as out:
+            shutil.copyfileobj(f, out, chunk_size)
+            return f.tell()
+
+    def set(self, key: str, pdf: bytes) -> None:
+        """Store ``pdf`` under ``key``"""
+        with self.writer(key) as f:
+            f.write(pdf)
+
+    @contextmanager
+    def writer(
+        self, key: str, tee: Optional[Destination] = None
+    ) -> Iterator[IO[bytes]]:
+        """
+        Yield a file to stream a PDF into; it is published only on success
+
+        Args:
+            key: Cache key for the PDF
+            tee: Optional destination that receives the same bytes, so a
+                response can be cached and delivered in a single pass
+
+        If the block raises, nothing is stored (or written to ``tee``).
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open_destination(path) as f:
+            if tee is None:
+                yield f
+            else:
+                with open_destination(tee) as out:
+                    yield _TeeWriter(f, out)
+            size = f.tell()
+        with self._lock:
+            self.stores += 1
+            self._size += size
+            over = self._size > self.max_bytes
+        if over:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under ``max_bytes``"""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        evicted = 0
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                evicted += 1
+            except FileNotFoundError:
+                pass  # already evicted by another process
+            total -= size
+        with self._lock:
+            self._size = total
+            self.evictions += evicted
+
+    def clear(self) -> None:
+        """Remove every cached PDF (counters are kept)"""
+        for _, path, _ in self._entries():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/store/eviction counters and approximate size in bytes"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
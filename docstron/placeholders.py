@@ -0,0 +1,89 @@
+"""
+Local parsing of template placeholders and pre-flight data validation
+"""
+
+import re
+from typing import Any, Dict, FrozenSet, List, Optional
+from .exceptions import ValidationError
+
+#: Matches ``{{ name }}`` and dotted ``{{ customer.name }}`` placeholders
+PLACEHOLDER_PATTERN = re.compile(r"{{\s*([A-Za-z_][\w-]*(?:\.[A-Za-z_][\w-]*)*)\s*}}")
+
+#: Matches any ``{{ ... }}`` tag, capturing a block's ``#``/``/`` and its first word
+_TAG_PATTERN = re.compile(r"{{\s*([#/]?)\s*([^\s{}]*)[^{}]*}}")
+
+#: Block helpers whose body refers to the fields of an item, not of the data
+SCOPED_BLOCKS = frozenset({"each", "with"})
+
+#: Names that are template syntax rather than data
+_KEYWORDS = frozenset({"else", "this"})
+
+
+def extract_placeholders(content: str) -> FrozenSet[str]:
+    """
+    Return the set of placeholder names used in template content
+
+    Names inside ``{{#each}}`` and ``{{#with}}`` blocks refer to the item
+    being rendered, not to the top-level data, so they are left out.
+
+    Not cached: this is one regex pass over the content. Templates cache
+    the result per template ID (see ``client.templates.placeholders``)
+    instead of keeping whole documents as cache keys.
+
+    Example:
+        >>> sorted(extract_placeholders('<p>{{ name }} owes {{amount}}</p>'))
+        ['amount', 'name']
+    """
+    names = set()
+    depth = 0
+    for tag in _TAG_PATTERN.finditer(content):
+        kind, word = tag.groups()
+        if word in SCOPED_BLOCKS and kind == "#":
+            depth += 1
+        elif word in SCOPED_BLOCKS and kind == "/":
+            depth = max(depth - 1, 0)
+        elif depth == 0 and not kind:
+            match = PLACEHOLDER_PATTERN.fullmatch(tag.group(0))
+            name = match.group(1) if match else None
+            if name and name.split(".")[0] not in _KEYWORDS:
+                names.add(name)
+    return frozenset(names)
+
+
+def _has_path(data: Dict[str, Any], name: str) -> bool:
+    if name in data:
+        return True
+    value: Any = data
+    for part in name.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return False
+        value = value[part]
+    return True
+
+
+def missing_placeholders(
+    placeholders: FrozenSet[str], data: Optional[Dict[str, Any]]
+) -> List[str]:
+    """Placeholders (sorted) that have no value in ``data``"""
+    data = data or {}
+    return sorted(name for name in placeholders if not _has_path(data, name))
+
+
+def validate_data(
+    placeholders: FrozenSet[str],
+    data: Optional[Dict[str, Any]],
+    template_id: Optional[str] = None,
+) -> None:
+    """
+    Raise ValidationError locally if ``data`` lacks any placeholder
+
+    The error has no ``status_code`` (no request was made) and its
+    ``response`` lists the missing names under ``"missing"``.
+    """
+    missing = missing_placeholders(placeholders, data)
+    if missing:
+        target = f" for template {template_id}" if template_id else ""
+        raise ValidationError(
+            f"Missing template data{target}: {', '.join(missing)}",
+            response={"missing": missing},
+        )
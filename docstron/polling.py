@@ -0,0 +1,340 @@
+"""
+Adaptive polling for documents that are still being rendered
+"""
+
+import heapq
+import itertools
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from .concurrency import BatchResult
+from .exceptions import (
+    AuthenticationError,
+    DocumentFailedError,
+    NotFoundError,
+    RateLimitError,
+    ServerError,
+    ValidationError,
+    WaitTimeoutError,
+)
+
+#: Errors that end polling for a document; anything transient keeps polling
+_FATAL_ERRORS = (NotFoundError, AuthenticationError, ValidationError)
+_TRANSIENT_ERRORS = (RateLimitError, ServerError, OSError)
+
+#: Document statuses meaning the PDF is available
+READY_STATUSES = frozenset({"completed", "complete", "ready", "done", "success"})
+
+#: Document statuses meaning rendering will never finish
+FAILED_STATUSES = frozenset({"failed", "error", "cancelled", "canceled"})
+
+
+def document_state(response: Dict[str, Any]) -> str:
+    """
+    Classify a ``documents.get`` response as ``ready``, ``failed`` or ``pending``
+
+    A document without a ``status`` field is taken to be ready, since the
+    API only reports one while rendering is still under way.
+    """
+    data = response.get("data") if isinstance(response, dict) else None
+    status = data.get("status") if isinstance(data, dict) else None
+    if status is None:
+        return "ready"
+    status = str(status).lower()
+    if status in READY_STATUSES:
+        return "ready"
+    if status in FAILED_STATUSES:
+        return "failed"
+    return "pending"
+
+
+class PollBackoff:
+    """
+    Growing delay between polls of one document
+
+    Polls start quickly, because most documents are ready within a second
+    or two, and then back off so long renders cost few requests. Jitter
+    spreads out documents generated together.
+
+    Args:
+        initial: Seconds before the second poll (default: 0.25)
+        factor: Growth of the delay per poll (default: 1.6)
+        max_interval: Upper bound on the delay (default: 5.0)
+        jitter: Random spread as a fraction of the delay (default: 0.1)
+
+    Example:
+        >>> [round(PollBackoff(jitter=0).interval(n), 2) for n in range(1, 6)]
+        [0.25, 0.4, 0.64, 1.02, 1.64]
+    """
+
+    def __init__(
+        self,
+        initial: float = 0.25,
+        factor: float = 1.6,
+        max_interval: float = 5.0,
+        jitter: float = 0.1,
+    ):
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+        self.jitter = jitter
+
+    def interval(self, polls: int) -> float:
+        """Seconds to wait after the ``polls``-th poll of a document"""
+        delay = min(self.initial * self.factor ** max(polls - 1, 0), self.max_interval)
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return max(delay, 0.0)
+
+
+def _failed(document_id: str, response: Any) -> DocumentFailedError:
+    return DocumentFailedError(
+        f"Rendering document {document_id} failed", response=response
+    )
+
+
+class _Watch:
+    """Polling state of one document, shared by every thread waiting on it"""
+
+    __slots__ = ("document_id", "polls", "waiters", "result", "error")
+
+    def __init__(self, document_id: str):
+        self.document_id = document_id
+        self.polls = 0
+        self.waiters: List["queue.Queue[_Watch]"] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class PollScheduler:
+    """
+    One polling loop shared by every thread waiting for documents
+
+    Documents are polled from a single background thread in batches, each
+    on its own backoff schedule. Several threads waiting for the same
+    document share its polls. The thread exits when nothing is being
+    waited for and restarts on demand.
+
+    Args:
+        fetch: Callable returning the ``documents.get`` response for an ID
+        backoff: Delay schedule between polls of one document
+        concurrency: Polls sent at once (default: 4)
+        state: Callable classifying a response as ready, failed or pending
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Dict[str, Any]],
+        backoff: Optional[PollBackoff] = None,
+        concurrency: int = 4,
+        state: Callable[[Dict[str, Any]], str] = document_state,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.fetch = fetch
+        self.backoff = backoff or PollBackoff()
+        self.concurrency = concurrency
+        self.state = state
+        self.polls = 0
+        self._condition = threading.Condition()
+        self._watches: Dict[str, _Watch] = {}
+        self._due: List[Any] = []
+        self._sequence = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+
+    def wait(
+        self, document_ids: Iterable[str], timeout: Optional[float] = None
+    ) -> Iterator[BatchResult]:
+        """
+        Yield a BatchResult per document as soon as it is ready or failed
+
+        Results come in completion order; ``index`` is the position of the
+        ID in ``document_ids``. Documents still pending after ``timeout``
+        seconds are yielded with a WaitTimeoutError.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        inbox: "queue.Queue[_Watch]" = queue.Queue()
+        waiting: Dict[str, List[int]] = {}
+        for index, document_id in enumerate(document_ids):
+            waiting.setdefault(document_id, []).append(index)
+        try:
+            with self._condition:
+                for document_id in waiting:
+                    self._subscribe(document_id, inbox)
+                self._ensure_thread()
+
+            while waiting:
+                remaining = None
+                if deadline is not None:
+                    remaining = max(deadline - time.monotonic(), 0.0)
+                try:
+                    watch = inbox.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                for index in waiting.pop(watch.document_id, ()):
+                    yield BatchResult(
+                        index, watch.document_id, result=watch.result, error=watch.error
+                    )
+
+            for document_id, indexes in waiting.items():
+                for index in indexes:
+                    error = WaitTimeoutError(
+                        f"Document {document_id} not ready after {timeout:g}s"
+                    )
+                    yield BatchResult(index, document_id, error=error)
+        finally:
+            with self._condition:
+                for document_id in waiting:
+                    self._unsubscribe(document_id, inbox)
+
+    def _subscribe(self, document_id: str, inbox: "queue.Queue[_Watch]") -> None:
+        watch = self._watches.get(document_id)
+        if watch is None:
+            watch = self._watches[document_id] = _Watch(document_id)
+            self._schedule(watch, 0.0)
+        watch.waiters.append(inbox)
+
+    def _unsubscribe(self, document_id: str, inbox: "queue.Queue[_Watch]") -> None:
+        watch = self._watches.get(document_id)
+        if watch is not None and inbox in watch.waiters:
+            watch.waiters.remove(inbox)
+            if not watch.waiters:
+                # Still in the due heap; skipped when popped
+                del self._watches[document_id]
+
+    def _schedule(self, watch: _Watch, delay: float) -> None:
+        due = time.monotonic() + delay
+        heapq.heappush(self._due, (due, next(self._sequence), watch))
+        self._condition.notify()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="docstron-poller", daemon=True
+            )
+            self._thread.start()
+
+    def _next_batch(self) -> Optional[List[_Watch]]:
+        """Wait for due documents; None when nothing is left to poll"""
+        with self._condition:
+            while True:
+                while self._due and (
+                    self._watches.get(self._due[0][2].document_id)
+                    is not self._due[0][2]
+                ):
+                    heapq.heappop(self._due)  # abandoned by all its waiters
+                if not self._due:
+                    self._thread = None
+                    return None
+                wait = self._due[0][0] - time.monotonic()
+                if wait <= 0:
+                    break
+                self._condition.wait(wait)
+            batch = []
+            now = time.monotonic()
+            while (
+                self._due and self._due[0][0] <= now and len(batch) < self.concurrency
+            ):
+                watch = heapq.heappop(self._due)[2]
+                if self._watches.get(watch.document_id) is watch:
+                    batch.append(watch)
+            return batch
+
+    def _run(self) -> None:
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="docstron-poll"
+        ) as executor:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    return
+                outcomes = list(executor.map(self._poll, batch))
+                with self._condition:
+                    for watch, (state, result, error) in zip(batch, outcomes):
+                        self._settle(watch, state, result, error)
+
+    def _poll(self, watch: _Watch):
+        try:
+            response = self.fetch(watch.document_id)
+        except _FATAL_ERRORS as e:
+            return "failed", None, e
+        except _TRANSIENT_ERRORS as e:
+            return "pending", None, e
+        except Exception as e:
+            return "failed", None, e
+        return self.state(response), response, None
+
+    def _settle(self, watch: _Watch, state: str, result: Any, error: Any) -> None:
+        self.polls += 1
+        watch.polls += 1
+        if self._watches.get(watch.document_id) is not watch:
+            return
+        if state == "pending":
+            self._schedule(watch, self.backoff.interval(watch.polls))
+            return
+        if state == "failed" and error is None:
+            error = _failed(watch.document_id, result)
+        watch.result = None if error is not None else result
+        watch.error = error
+        del self._watches[watch.document_id]
+        for inbox in watch.waiters:
+            inbox.put(watch)
+
+
+async def apoll_document(
+    fetch: Callable[[str], Awaitable[Dict[str, Any]]],
+    document_id: str,
+    backoff: PollBackoff,
+    state: Callable[[Dict[str, Any]], str] = document_state,
+) -> Dict[str, Any]:
+    """
+    Poll one document until it is ready, with the same backoff and error
+    handling as PollScheduler
+
+    Returns:
+        The ``documents.get`` response of the ready document
+
+    Raises:
+        DocumentFailedError: If rendering failed
+        NotFoundError: If the document does not exist
+    """
+    import asyncio
+
+    # The async client lets httpx's network errors through untranslated
+    transient: Tuple[Type[BaseException], ...] = _TRANSIENT_ERRORS
+    try:
+        import httpx
+    except ImportError:
+        pass
+    else:
+        transient += (httpx.TransportError,)
+
+    polls = 0
+    while True:
+        polls += 1
+        try:
+            response = await fetch(document_id)
+        except transient:
+            response = None
+        if response is not None:
+            current = state(response)
+            if current == "ready":
+                return response
+            if current == "failed":
+                raise _failed(document_id, response)
+        await asyncio.sleep(backoff.interval(polls))
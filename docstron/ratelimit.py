@@ -0,0 +1,181 @@
+"""
+Client-side rate limiting for the Docstron API
+"""
+
+import os
+import re
+import struct
+import threading
+import time
+from typing import Any, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+_UNIT_SECONDS = {
+    "s": 1.0,
+    "sec": 1.0,
+    "second": 1.0,
+    "m": 60.0,
+    "min": 60.0,
+    "minute": 60.0,
+    "h": 3600.0,
+    "hr": 3600.0,
+    "hour": 3600.0,
+    "d": 86400.0,
+    "day": 86400.0,
+}
+
+
+def parse_rate_limit(value: Union[int, float, str]) -> float:
+    """
+    Convert a plan's ``api_rate_limit`` into requests per second
+
+    Bare numbers are interpreted as requests per minute. Strings may name a
+    unit, e.g. ``"100/minute"``, ``"10 per second"`` or ``"5000 requests/hour"``.
+
+    Example:
+        >>> parse_rate_limit(120)
+        2.0
+        >>> parse_rate_limit("10/s")
+        10.0
+    """
+    if isinstance(value, (int, float)):
+        count, seconds = float(value), 60.0
+    else:
+        match = re.match(
+            r"^\s*([\d.]+)\s*(?:requests?|req)?\s*(?:/|per)?\s*([a-z]*)\s*$",
+            str(value).lower(),
+        )
+        if not match:
+            raise ValueError(f"Unrecognized rate limit: {value!r}")
+        count = float(match.group(1))
+        unit = match.group(2).rstrip("s") if len(match.group(2)) > 1 else match.group(2)
+        if unit and unit not in _UNIT_SECONDS:
+            raise ValueError(f"Unrecognized rate limit unit: {value!r}")
+        seconds = _UNIT_SECONDS.get(unit, 60.0)
+    if count <= 0:
+        raise ValueError("Rate limit must be positive")
+    return count / seconds
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that paces outgoing requests
+
+    Each request takes one token; tokens refill continuously at ``rate`` per
+    second up to ``burst``. A caller that finds the bucket empty reserves a
+    future token and sleeps until it is due, so waiting threads are released
+    in order at the configured rate rather than all at once.
+
+    Args:
+        rate: Requests per second
+        burst: Maximum number of requests that may be sent back to back
+            (default: one second's worth, at least 1)
+
+    Example:
+        >>> limiter = TokenBucket(rate=5)
+        >>> client = Docstron(api_key='your-api-key', rate_limit=limiter)
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self._lock = threading.Lock()
+        self.update(rate, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def update(self, rate: float, burst: Optional[float] = None) -> None:
+        """Change the refill rate (and optionally burst) in place"""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            self.rate = float(rate)
+            self.burst = float(burst) if burst is not None else max(1.0, self.rate)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` and return how many seconds to wait before using them"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available; returns the time spent waiting"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a file shared by processes on one host
+
+    Bucket state is read and updated under an exclusive ``flock``, so every
+    process (and thread) using the same ``path`` draws from one budget.
+    Requires a POSIX platform.
+
+    Args:
+        path: State file shared by all participating processes
+        rate: Requests per second across all processes
+        burst: Maximum back-to-back requests across all processes
+
+    Example:
+        >>> limiter = FileTokenBucket('/tmp/docstron-ratelimit', rate=10)
+    """
+
+    _STATE = struct.Struct("dd")
+
+    def __init__(self, path: str, rate: float, burst: Optional[float] = None):
+        if fcntl is None:
+            raise RuntimeError("FileTokenBucket requires a POSIX platform")
+        self.path = path
+        super().__init__(rate, burst)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` and return how many seconds to wait before using them"""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # Wall-clock time so that every process agrees on the timeline
+            now = time.time()
+            raw = os.pread(fd, self._STATE.size, 0)
+            if len(raw) == self._STATE.size:
+                available, updated = self._STATE.unpack(raw)
+                available = min(self.burst, available + (now - updated) * self.rate)
+            else:
+                available = self.burst
+            available -= tokens
+            os.pwrite(fd, self._STATE.pack(available, now), 0)
+        finally:
+            os.close(fd)  # also releases the lock
+        if available >= 0:
+            return 0.0
+        return -available / self.rate
+
+
+def build_rate_limiter(
+    api_rate_limit: Any,
+    headroom: float = 0.9,
+    path: Optional[str] = None,
+) -> TokenBucket:
+    """
+    Build a limiter that stays just under a plan's ``api_rate_limit``
+
+    Args:
+        api_rate_limit: Value of ``subscription.api_rate_limit`` from usage
+        headroom: Fraction of the plan limit to use (default: 0.9)
+        path: Optional state file to share the budget across processes
+    """
+    rate = parse_rate_limit(api_rate_limit) * headroom
+    if path:
+        return FileTokenBucket(path, rate)
+    return TokenBucket(rate)
@@ -2,9 +2,18 @@
 Resource classes for the Docstron API
 """
 
-from .applications import Applications
-from .templates import Templates
-from .documents import Documents
-from .usage import Usage
+from .applications import Applications, AsyncApplications
+from .templates import Templates, AsyncTemplates
+from .documents import Documents, AsyncDocuments
+from .usage import Usage, AsyncUsage
 
-__all__ = ["Applications", "Templates", "Documents", "Usage"]
+__all__ = [
+    "Applications",
+    "Templates",
+    "Documents",
+    "Usage",
+    "AsyncApplications",
+    "AsyncTemplates",
+    "AsyncDocuments",
+    "AsyncUsage",
+]
@@ -2,14 +2,16 @@
 Applications resource for the Docstron API
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from ..cache import TTLCache
 
 
 class Applications:
     """Manage Docstron applications"""
 
-    def __init__(self, client):
+    def __init__(self, client, cache: Optional[TTLCache] = None):
         self._client = client
+        self.cache = cache
 
     def get(self, app_id: str) -> Dict[str, Any]:
         """
@@ -21,11 +23,21 @@ class Applications:
         Returns:
             Dictionary containing application details
 
+        Served from the client's metadata cache when enabled
+        (``Docstron(metadata_cache_ttl=...)``).
+
         Example:
             >>> app = client.applications.get('app-7b4d78fb-820c-4ca9-84cc-46953f211234')
             >>> print(app['data']['name'])
         """
+        if self.cache is not None:
+            cached = self.cache.get(app_id)
+            if cached is not None:
+                return cached
+
         response = self._client.get(f"applications/{app_id}")
+        if self.cache is not None:
+            self.cache.set(app_id, response)
         return response
 
     def list(self) -> List[Dict[str, Any]]:
@@ -42,3 +54,42 @@ class Applications:
         """
         response = self._client.get("applications")
         return response
+
+
+class AsyncApplications:
+    """Manage Docstron applications (asynchronous)"""
+
+    def __init__(self, client, cache: Optional[TTLCache] = None):
+        self._client = client
+        self.cache = cache
+
+    async def get(self, app_id: str) -> Dict[str, Any]:
+        """
+        Get a specific application by ID
+
+        Async counterpart of :meth:`Applications.get`.
+
+        Example:
+            >>> app = await client.applications.get('app-7b4d78fb-820c-4ca9-84cc-46953f211234')
+        """
+        if self.cache is not None:
+            cached = self.cache.get(app_id)
+            if cached is not None:
+                return cached
+
+        response = await self._client.get(f"applications/{app_id}")
+        if self.cache is not None:
+            self.cache.set(app_id, response)
+        return response
+
+    async def list(self) -> List[Dict[str, Any]]:
+        """
+        Get all applications
+
+        Async counterpart of :meth:`Applications.list`.
+
+        Example:
+            >>> apps = await client.applications.list()
+        """
+        response = await self._client.get("applications")
+        return response
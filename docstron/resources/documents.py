@@ -2,14 +2,139 @@
 Documents resource for the Docstron API
 """
 
-from typing import Dict, Any, List, Optional, Literal
+import time
+from typing import (
+    Dict,
+    Any,
+    List,
+    Optional,
+    Literal,
+    Iterable,
+    Iterator,
+    AsyncIterator,
+    Callable,
+    Union,
+)
+from ..concurrency import BatchResult, map_concurrently, amap_concurrently
+from ..delta import (
+    VersionStore,
+    data_if_changed,
+    plan_update,
+    remember_update,
+    response_record,
+    unchanged_response,
+)
+from ..idempotency import IDEMPOTENCY_HEADER, IdempotencyLedger, generation_key
+from ..lazy import lazy_attribute
+from ..pagination import DEFAULT_PAGE_SIZE, aiter_items, iter_items
+from ..pdf_cache import PDFCache, cache_key
+from ..placeholders import extract_placeholders, validate_data
+from ..polling import PollBackoff, PollScheduler, apoll_document
+from ..retention import (
+    Age,
+    JournalLike,
+    SweepReport,
+    already_deleted,
+    journal_outcome,
+    open_journal,
+    record_outcomes,
+    skip_done,
+    sweep_matcher,
+)
+from ..exceptions import NotFoundError, WaitTimeoutError
+from ..streaming import DEFAULT_CHUNK_SIZE, Destination, open_destination
+
+
+def _generate_payload(
+    template_id: str,
+    data: Dict[str, Any],
+    response_type: str,
+    password: Optional[str],
+) -> Dict[str, Any]:
+    """Build the request body for generating a document from a template"""
+    payload = {
+        "template_id": template_id,
+        "data": data,
+        "response_type": response_type,
+    }
+    if password:
+        payload["password"] = password
+    return payload
+
+
+def _quick_generate_payload(
+    html: str,
+    data: Optional[Dict[str, Any]],
+    response_type: str,
+    extra_css: Optional[str],
+    save_template: bool,
+    application_id: Optional[str],
+    password: Optional[str],
+) -> Dict[str, Any]:
+    """Build the request body for generating a document from raw HTML"""
+    payload = {
+        "html": html,
+        "response_type": response_type,
+        "save_template": save_template,
+    }
+    if data:
+        payload["data"] = data
+    if extra_css:
+        payload["extra_css"] = extra_css
+    if save_template and application_id:
+        payload["application_id"] = application_id
+    if password:
+        payload["password"] = password
+    return payload
+
+
+def _template_revision(response: Dict[str, Any]) -> str:
+    """
+    Hash of everything identifying a template revision
+
+    Covers ``updated_at``/``version`` when the API reports them and the
+    content and CSS themselves, so edits change PDF cache keys even for
+    templates without a revision field.
+    """
+    template = response.get("data") or {}
+    return cache_key(
+        {
+            field: template.get(field)
+            for field in ("updated_at", "version", "content", "extra_css")
+        }
+    )
+
+
+def _data_if_changed(
+    previous: Dict[str, Any], data: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """All of ``data`` unless it equals the document's known attributes"""
+    return data_if_changed(previous.get("attributes"), data)
+
+
+def _remember_fetched(
+    versions: Optional[VersionStore], document_id: str, response: Dict[str, Any]
+) -> None:
+    """Record the version returned by get"""
+    if versions is not None:
+        versions.remember(document_id, response_record(response))
 
 
 class Documents:
     """Manage Docstron documents"""
 
-    def __init__(self, client):
+    def __init__(
+        self,
+        client,
+        pdf_cache: Optional[PDFCache] = None,
+        ledger: Optional[IdempotencyLedger] = None,
+        versions: Optional[VersionStore] = None,
+    ):
         self._client = client
+        self.pdf_cache = pdf_cache
+        self.ledger = ledger
+        self.versions = versions
+        self.poll_backoff = PollBackoff()
 
     def generate(
         self,
@@ -17,7 +142,12 @@ class Documents:
         data: Dict[str, Any],
         response_type: Literal["pdf", "json_with_base64", "document_id"] = "document_id",
         password: Optional[str] = None,
-    ) -> Dict[str, Any] | bytes:
+        output_path: Optional[Destination] = None,
+        max_size: Optional[int] = None,
+        validate: bool = False,
+        cache: bool = True,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any] | bytes | int:
         """
         Generate a document from a template
 
@@ -29,11 +159,35 @@ class Documents:
                 - 'json_with_base64': Returns JSON with base64 encoded PDF
                 - 'document_id': Returns JSON with document ID (default)
             password: Optional password to protect the PDF
+            output_path: Optional path, writable binary file object or
+                bytearray. With response_type='pdf' the PDF is streamed into
+                it in chunks; with 'json_with_base64' the base64 PDF is
+                decoded into it incrementally. Either way the PDF is never
+                buffered whole in memory.
+            max_size: Optional limit in bytes for a streamed PDF; larger
+                responses raise ResponseTooLargeError
+            validate: Check locally that ``data`` provides every template
+                placeholder before sending (see templates.placeholders);
+                raises ValidationError without making the request
+            cache: Serve repeated 'pdf' generations from the client's local
+                PDF cache, if one is configured (default: True). The cache
+                key includes the template's revision, read with
+                ``templates.get``: every cached generation costs that
+                request unless the client has ``metadata_cache_ttl`` set, in
+                which case template edits are noticed once the entry expires.
+            idempotency_key: Sent as the ``Idempotency-Key`` header so the
+                API renders a retried or replayed request only once, and
+                timed-out generations become safe to retry. With the
+                client's ``idempotency`` option a key derived from the
+                request is sent automatically; pass a unique value to force
+                a new document.
 
         Returns:
             Depends on response_type:
-            - 'pdf': Binary PDF data
-            - 'json_with_base64': Dict with base64 PDF
+            - 'pdf': Binary PDF data, or the number of bytes written when
+              output_path is given
+            - 'json_with_base64': Dict with base64 PDF, or when output_path is
+              given the response metadata without ``data['pdf']``
             - 'document_id': Dict with document ID
 
         Example:
@@ -52,22 +206,187 @@ class Documents:
             ... )
             >>> with open('output.pdf', 'wb') as f:
             ...     f.write(pdf_data)
+
+            >>> # Stream a large PDF straight to disk
+            >>> size = client.documents.generate(
+            ...     template_id='template-c2465c0b-fc54-4672-b9ac-7446886cd6de',
+            ...     data={'customer_name': 'John Doe'},
+            ...     response_type='pdf',
+            ...     output_path='output.pdf'
+            ... )
+
+            >>> # Decode a json_with_base64 response straight into a file
+            >>> meta = client.documents.generate(
+            ...     template_id='template-c2465c0b-fc54-4672-b9ac-7446886cd6de',
+            ...     data={'customer_name': 'John Doe'},
+            ...     response_type='json_with_base64',
+            ...     output_path='output.pdf'
+            ... )
+            >>> print(meta['data'])
         """
-        payload = {
-            "template_id": template_id,
-            "data": data,
-            "response_type": response_type,
-        }
-        if password:
-            payload["password"] = password
+        if validate:
+            placeholders = self._client.templates.placeholders(template_id)
+            validate_data(placeholders, data, template_id)
+
+        cache_parts = None
+        if cache and self.pdf_cache is not None and response_type == "pdf":
+            cache_parts = {
+                "template_id": template_id,
+                "template_version": self._template_version(template_id),
+                "data": data,
+                "password": password,
+            }
+
+        payload = _generate_payload(template_id, data, response_type, password)
+        return self._send_generation(
+            "documents/generate",
+            payload,
+            response_type,
+            output_path,
+            max_size,
+            cache_parts,
+            idempotency_key,
+        )
 
-        if response_type == "pdf":
+    def _template_version(self, template_id: str) -> str:
+        """Revision marker of a template, so edits change PDF cache keys"""
+        return _template_revision(self._client.templates.get(template_id))
+
+    def _send_generation(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        response_type: str,
+        output_path: Optional[Destination],
+        max_size: Optional[int],
+        cache_parts: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any] | bytes | int:
+        """POST a generation request and read the response as requested"""
+        if idempotency_key is None and self.ledger is not None:
+            idempotency_key = generation_key(endpoint, payload)
+        # Only passed when set, so client subclasses and test doubles with
+        # the older post signatures keep working
+        extra = {}
+        if idempotency_key is not None:
+            extra["headers"] = {IDEMPOTENCY_HEADER: idempotency_key}
+            if response_type == "document_id" and self.ledger is not None:
+                recorded = self.ledger.get(idempotency_key)
+                if recorded is not None:
+                    return recorded
+        if cache_parts is not None:
+            return self._cached_pdf(
+                endpoint, payload, output_path, max_size, cache_parts, extra
+            )
+        if response_type == "pdf" and output_path is not None:
+            return self._client.post_binary_to(
+                endpoint, output_path, data=payload, max_size=max_size, **extra
+            )
+        elif response_type == "json_with_base64" and output_path is not None:
+            return self._client.post_json_base64_to(
+                endpoint, output_path, data=payload, max_size=max_size, **extra
+            )
+        elif response_type == "pdf":
             # For PDF response, we need to POST the data and get binary response
-            return self._client.post_binary("documents/generate", data=payload)
+            return self._client.post_binary(endpoint, data=payload, **extra)
         else:
-            response = self._client.post("documents/generate", data=payload)
+            response = self._client.post(endpoint, data=payload, **extra)
+            if idempotency_key is not None and self.ledger is not None:
+                self.ledger.record(idempotency_key, response)
             return response
 
+    def _cached_pdf(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        output_path: Optional[Destination],
+        max_size: Optional[int],
+        cache_parts: Dict[str, Any],
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> bytes | int:
+        """Serve a PDF from the local cache, generating and storing it on a miss"""
+        key = cache_key(dict(cache_parts, endpoint=endpoint))
+        if output_path is None:
+            pdf = self.pdf_cache.get(key)
+            if pdf is None:
+                pdf = self._client.post_binary(
+                    endpoint, data=payload, **(extra or {})
+                )
+                self.pdf_cache.set(key, pdf)
+            return pdf
+
+        size = self.pdf_cache.copy_to(key, output_path)
+        if size is None:
+            with self.pdf_cache.writer(key, tee=output_path) as f:
+                size = self._client.post_binary_to(
+                    endpoint, f, data=payload, max_size=max_size, **(extra or {})
+                )
+        return size
+
+    def generate_many(
+        self,
+        template_id: str,
+        items: Iterable[Dict[str, Any]],
+        concurrency: int = 8,
+        response_type: Literal["pdf", "json_with_base64", "document_id"] = "document_id",
+        password: Optional[str] = None,
+        ordered: bool = True,
+        validate: bool = False,
+    ) -> Iterator[BatchResult]:
+        """
+        Generate many documents from one template concurrently
+
+        Requests fan out over a thread pool that shares this client's session.
+        The input iterable is consumed lazily with a bounded number of requests
+        in flight, so large batches run in constant memory. Nothing is sent
+        until the returned iterator is consumed. Create the client with
+        ``pool_maxsize`` of at least ``concurrency`` so every worker gets a
+        pooled connection.
+
+        Args:
+            template_id: The template ID to use for every document
+            items: Iterable of data dictionaries, one per document
+            concurrency: Number of requests in flight at once (default: 8)
+            response_type: Response type for every document (see generate)
+            password: Optional password to protect every PDF
+            ordered: Yield results in input order (default) or as completed
+            validate: Check every row against the template's placeholders
+                before sending. The template is fetched once up front and a
+                row with missing data fails locally with ValidationError,
+                without an API call.
+
+        Returns:
+            Iterator of BatchResult objects. Each has ``index``, ``item``,
+            ``result`` and ``error``; a failing item (e.g. a DocstronError)
+            is reported on its result without aborting the rest of the batch.
+
+        Example:
+            >>> rows = [{'customer_name': 'John'}, {'customer_name': 'Jane'}]
+            >>> for outcome in client.documents.generate_many(
+            ...     template_id='template-c2465c0b-fc54-4672-b9ac-7446886cd6de',
+            ...     items=rows,
+            ...     concurrency=16
+            ... ):
+            ...     if outcome.ok:
+            ...         print(outcome.result['data']['document_id'])
+            ...     else:
+            ...         print(f"Row {outcome.index} failed: {outcome.error}")
+        """
+        placeholders = None
+        if validate:
+            placeholders = self._client.templates.placeholders(template_id)
+
+        def generate_one(data: Dict[str, Any]):
+            if placeholders is not None:
+                validate_data(placeholders, data, template_id)
+            return self.generate(
+                template_id, data, response_type=response_type, password=password
+            )
+
+        return map_concurrently(
+            generate_one, items, concurrency=concurrency, ordered=ordered
+        )
+
     def quick_generate(
         self,
         html: str,
@@ -77,7 +396,12 @@ class Documents:
         save_template: bool = False,
         application_id: Optional[str] = None,
         password: Optional[str] = None,
-    ) -> Dict[str, Any] | bytes:
+        output_path: Optional[Destination] = None,
+        max_size: Optional[int] = None,
+        validate: bool = False,
+        cache: bool = True,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any] | bytes | int:
         """
         Generate a document without pre-creating a template
 
@@ -89,6 +413,17 @@ class Documents:
             save_template: Whether to save this as a template (default: False)
             application_id: Required if save_template is True
             password: Optional password to protect the PDF
+            output_path: Optional path, file object or bytearray to stream a
+                'pdf' or decoded 'json_with_base64' PDF into (same as generate
+                method)
+            max_size: Optional limit in bytes for a streamed PDF
+            validate: Check locally that ``data`` provides every placeholder
+                in ``html``/``extra_css``; raises ValidationError without
+                making the request
+            cache: Use the client's local PDF cache for 'pdf' responses when
+                the template is not saved (default: True)
+            idempotency_key: Idempotency key for the request (same as
+                generate method)
 
         Returns:
             Depends on response_type (same as generate method)
@@ -109,26 +444,41 @@ class Documents:
             ...     application_id='app-7b4d78fb-820c-4ca9-84cc-46953f211234'
             ... )
         """
-        payload = {
-            "html": html,
-            "response_type": response_type,
-            "save_template": save_template,
-        }
-        if data:
-            payload["data"] = data
-        if extra_css:
-            payload["extra_css"] = extra_css
-        if save_template and application_id:
-            payload["application_id"] = application_id
-        if password:
-            payload["password"] = password
-
-        if response_type == "pdf":
-            # For PDF response, we need to POST the data and get binary response
-            return self._client.post_binary("documents/quick/generate", data=payload)
-        else:
-            response = self._client.post("documents/quick/generate", data=payload)
-            return response
+        if validate:
+            validate_data(extract_placeholders(html + (extra_css or "")), data)
+
+        payload = _quick_generate_payload(
+            html,
+            data,
+            response_type,
+            extra_css,
+            save_template,
+            application_id,
+            password,
+        )
+
+        cache_parts = None
+        if (
+            cache
+            and self.pdf_cache is not None
+            and response_type == "pdf"
+            and not save_template
+        ):
+            cache_parts = {
+                "html": html,
+                "extra_css": extra_css,
+                "data": data,
+                "password": password,
+            }
+        return self._send_generation(
+            "documents/quick/generate",
+            payload,
+            response_type,
+            output_path,
+            max_size,
+            cache_parts,
+            idempotency_key,
+        )
 
     def get(self, document_id: str) -> Dict[str, Any]:
         """
@@ -145,12 +495,77 @@ class Documents:
             >>> print(doc['data']['attributes'])
         """
         response = self._client.get(f"documents/{document_id}")
+        _remember_fetched(self.versions, document_id, response)
         return response
 
-    def list(self) -> List[Dict[str, Any]]:
+    @lazy_attribute
+    def poller(self) -> PollScheduler:
+        """Polling loop shared by every thread waiting on this client's documents"""
+        return PollScheduler(
+            lambda document_id: self.get(document_id), self.poll_backoff
+        )
+
+    def wait_until_ready(
+        self,
+        document_ids: Union[str, Iterable[str]],
+        timeout: Optional[float] = None,
+    ) -> Iterator[BatchResult]:
+        """
+        Wait for documents generated with response_type='document_id'
+
+        Every document is polled with ``documents.get`` on its own adaptive
+        schedule (see ``poll_backoff``): quickly at first, then less and less
+        often. All threads of the client share one polling loop, so waiting
+        on the same document from several threads costs one set of polls.
+        Polling starts when the returned iterator is first consumed.
+
+        Args:
+            document_ids: Document ID or iterable of IDs
+            timeout: Seconds to wait overall; None (default) waits forever
+
+        Returns:
+            Iterator of BatchResult objects in completion order, each yielded
+            as soon as its document is ready. ``item`` is the document ID,
+            ``result`` the ``documents.get`` response and ``error`` a
+            DocumentFailedError, NotFoundError or WaitTimeoutError.
+
+        Example:
+            >>> ids = [
+            ...     client.documents.generate(template_id, row)['data']['document_id']
+            ...     for row in rows
+            ... ]
+            >>> for outcome in client.documents.wait_until_ready(ids, timeout=120):
+            ...     if outcome.ok:
+            ...         client.documents.download(outcome.item, output_path=...)
+        """
+        if isinstance(document_ids, str):
+            document_ids = [document_ids]
+        return self.poller.wait(document_ids, timeout)
+
+    def wait_for(
+        self, document_id: str, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Wait for one document to be ready and return its details
+
+        Raises:
+            DocumentFailedError: If rendering failed
+            WaitTimeoutError: If it is not ready within ``timeout`` seconds
+        """
+        outcomes = self.wait_until_ready([document_id], timeout)
+        try:
+            return next(outcomes).unwrap()
+        finally:
+            outcomes.close()
+
+    def list(self, **params: Any) -> List[Dict[str, Any]]:
         """
         Get all documents
 
+        Args:
+            **params: Optional query parameters, e.g. ``limit`` and ``offset``
+                (or ``cursor``) to fetch a single page
+
         Returns:
             List of dictionaries containing document details
 
@@ -159,11 +574,43 @@ class Documents:
             >>> for doc in docs['data']:
             ...     print(doc['document_id'])
         """
-        response = self._client.get("documents")
+        response = self._client.get("documents", params=params or None)
         return response
 
+    def iter(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        **params: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all documents, fetching them page by page
+
+        Only one page (plus the prefetched next page) is held in memory, so
+        cleanup and reconciliation jobs over very large accounts run in
+        constant memory.
+
+        Args:
+            page_size: Number of documents requested per page (default: 100)
+            prefetch: Fetch the next page in the background while the current
+                one is being consumed (default: True)
+            **params: Extra query parameters sent with every page
+
+        Returns:
+            Iterator of document dictionaries
+
+        Example:
+            >>> for doc in client.documents.iter(page_size=500):
+            ...     print(doc['document_id'])
+        """
+        return iter_items(self._list_page, params, page_size, prefetch)
+
+    def _list_page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch a single page of documents using raw query params"""
+        return self._client.get("documents", params=params)
+
     def update(
-        self, document_id: str, data: Dict[str, Any]
+        self, document_id: str, data: Dict[str, Any], delta: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Update a document's attributes
@@ -171,9 +618,17 @@ class Documents:
         Note: This updates the stored data/attributes, not the PDF itself.
         To regenerate the PDF, use the generate method.
 
+        With ``Docstron(delta_updates=True)`` the data is compared with the
+        document's attributes as last seen by this client (from a get or
+        update). When they are equal no request is made, and the known
+        version is returned with ``not_modified`` set. Otherwise all of
+        ``data`` is sent, since the update replaces the attributes.
+
         Args:
             document_id: The document ID to update
             data: New data/attributes for the document
+            delta: False always sends the update even when delta updates
+                are enabled (default: follow the client)
 
         Returns:
             Dictionary containing the updated document details
@@ -184,8 +639,22 @@ class Documents:
             ...     data={'customer_name': 'Jane Doe', 'amount': '$399.00'}
             ... )
         """
-        payload = {"data": data}
-        response = self._client.patch(f"documents/{document_id}", data=payload)
+        previous, changed = plan_update(
+            self.versions, document_id, data, delta, _data_if_changed
+        )
+        if changed is None:
+            self.versions.count_skipped()
+            return unchanged_response(previous)
+        payload = {"data": changed}
+        try:
+            response = self._client.patch(f"documents/{document_id}", data=payload)
+        except Exception:
+            if self.versions is not None:
+                self.versions.forget(document_id)
+            raise
+        remember_update(
+            self.versions, document_id, previous, response, {"attributes": data}
+        )
         return response
 
     def delete(self, document_id: str) -> Dict[str, Any]:
@@ -201,19 +670,154 @@ class Documents:
         Example:
             >>> result = client.documents.delete('document-517145ce-5a09-4e47-a257-887e239ecb36')
         """
+        if self.versions is not None:
+            self.versions.forget(document_id)
         response = self._client.delete(f"documents/{document_id}")
         return response
 
-    def download(self, document_id: str, output_path: Optional[str] = None) -> bytes:
+    def delete_many(
+        self,
+        document_ids: Iterable[str],
+        concurrency: int = 8,
+        journal: JournalLike = None,
+    ) -> Iterator[BatchResult]:
+        """
+        Delete many documents concurrently
+
+        Deletions fan out over a thread pool sharing the client's connection
+        pool and rate limiter, so a client created with ``rate_limit`` keeps
+        the whole batch within it. A document that is already gone (404)
+        counts as deleted. The input is consumed lazily, so generators of
+        any length run in bounded memory.
+
+        Args:
+            document_ids: Iterable of document IDs
+            concurrency: Number of deletions in flight at once (default: 8)
+            journal: Optional checkpoint file (or CheckpointJournal). Every
+                deleted ID is recorded there, and IDs already recorded by an
+                earlier, interrupted run are skipped without a request.
+
+        Returns:
+            Iterator of BatchResult objects in completion order, with the
+            delete response (``already_deleted`` set for 404s) or the error.
+            Nothing is deleted until it is consumed.
+
+        Example:
+            >>> for outcome in client.documents.delete_many(
+            ...     expired_ids, concurrency=16, journal='deleted.jsonl'
+            ... ):
+            ...     if not outcome.ok:
+            ...         print(f"{outcome.item}: {outcome.error}")
+        """
+        journal, owned = open_journal(journal)
+
+        def delete_one(document_id: str) -> Dict[str, Any]:
+            try:
+                return self.delete(document_id)
+            except NotFoundError:
+                return already_deleted(document_id)
+
+        outcomes = map_concurrently(
+            delete_one,
+            skip_done(document_ids, journal),
+            concurrency=concurrency,
+            ordered=False,
+        )
+        return record_outcomes(outcomes, journal, owned)
+
+    def sweep(
+        self,
+        older_than: Optional[Age] = None,
+        filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        concurrency: int = 8,
+        journal: JournalLike = None,
+        dry_run: bool = False,
+        progress: Optional[Callable[[SweepReport], Any]] = None,
+        timestamp_field: str = "created_at",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        **params: Any,
+    ) -> SweepReport:
+        """
+        Delete every document matching a retention rule
+
+        The matching document IDs are collected from the document listing
+        first and then deleted with :meth:`delete_many`. Deleting while
+        paging by offset would shift later pages and skip documents.
+
+        Args:
+            older_than: Delete documents created more than this long ago
+                (timedelta or seconds) or before this datetime
+            filter: Callable receiving each listed document; only documents
+                for which it returns True are deleted
+            concurrency: Number of deletions in flight at once (default: 8)
+            journal: Optional checkpoint file to resume an interrupted sweep
+                (see delete_many)
+            dry_run: Only count the matching documents (default: False)
+            progress: Called with the running SweepReport after every
+                deletion
+            timestamp_field: Document field holding the creation time
+                (default: ``created_at``)
+            page_size: Documents listed per page (default: 100)
+            **params: Extra query parameters for the listing
+
+        Returns:
+            SweepReport with matched, deleted, already deleted and failed
+            counts
+
+        Raises:
+            ValueError: If neither ``older_than`` nor ``filter`` is given
+
+        Example:
+            >>> from datetime import timedelta
+            >>> report = client.documents.sweep(
+            ...     older_than=timedelta(days=90),
+            ...     filter=lambda doc: doc.get('template_id') == 'template-123',
+            ...     concurrency=16,
+            ...     journal='retention.jsonl',
+            ...     progress=lambda report: print(report.done, 'of', report.matched),
+            ... )
+        """
+        if older_than is None and filter is None:
+            raise ValueError("Pass older_than and/or filter to select documents")
+        matches = sweep_matcher(older_than, filter, timestamp_field)
+        document_ids = [
+            document["document_id"]
+            for document in self.iter(page_size=page_size, **params)
+            if matches(document)
+        ]
+        report = SweepReport(dry_run)
+        report.matched = len(document_ids)
+        if dry_run:
+            return report
+        for outcome in self.delete_many(document_ids, concurrency, journal):
+            report.add(outcome)
+            if progress is not None:
+                progress(report)
+        return report
+
+    def download(
+        self,
+        document_id: str,
+        output_path: Optional[Destination] = None,
+        stream: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_size: Optional[int] = None,
+    ) -> bytes | int:
         """
         Download a document as PDF
 
         Args:
             document_id: The document ID to download
-            output_path: Optional path to save the PDF file
+            output_path: Optional path (or writable binary file object) to save
+                the PDF to
+            stream: Write the PDF to output_path in chunks instead of holding
+                the whole file in memory (requires output_path)
+            chunk_size: Size in bytes of each streamed chunk
+            max_size: Optional limit in bytes for a streamed download; larger
+                files raise ResponseTooLargeError and leave no partial file
 
         Returns:
-            Binary PDF data
+            Binary PDF data, or the number of bytes written when streaming
 
         Example:
             >>> # Download and get binary data
@@ -224,11 +828,544 @@ class Documents:
             ...     'document-489a79af-8680-4a08-a777-df52f26f296f',
             ...     output_path='invoice.pdf'
             ... )
+
+            >>> # Stream a large report to disk with bounded memory
+            >>> client.documents.download(
+            ...     'document-489a79af-8680-4a08-a777-df52f26f296f',
+            ...     output_path='report.pdf',
+            ...     stream=True,
+            ...     max_size=200 * 1024 * 1024
+            ... )
         """
-        pdf_data = self._client.download(f"documents/download/{document_id}")
-        
-        if output_path:
-            with open(output_path, "wb") as f:
+        endpoint = f"documents/download/{document_id}"
+        if stream:
+            if output_path is None:
+                raise ValueError("output_path is required when stream=True")
+            return self._client.download_to(
+                endpoint, output_path, chunk_size=chunk_size, max_size=max_size
+            )
+
+        pdf_data = self._client.download(endpoint)
+
+        if output_path is not None:
+            with open_destination(output_path) as f:
                 f.write(pdf_data)
-        
+
+        return pdf_data
+
+    def iter_download(
+        self,
+        document_id: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_size: Optional[int] = None,
+    ) -> Iterator[bytes]:
+        """
+        Download a document as an iterator of PDF chunks
+
+        Useful for relaying a PDF (e.g. to object storage or an HTTP response)
+        without holding the whole file in memory.
+
+        Args:
+            document_id: The document ID to download
+            chunk_size: Size in bytes of each chunk
+            max_size: Optional limit in bytes; larger files raise
+                ResponseTooLargeError
+
+        Example:
+            >>> for chunk in client.documents.iter_download('document-489a79af-8680-4a08-a777-df52f26f296f'):
+            ...     upload.write(chunk)
+        """
+        return self._client.iter_download(
+            f"documents/download/{document_id}",
+            chunk_size=chunk_size,
+            max_size=max_size,
+        )
+
+
+class AsyncDocuments:
+    """Manage Docstron documents (asynchronous)"""
+
+    def __init__(
+        self,
+        client,
+        pdf_cache: Optional[PDFCache] = None,
+        ledger: Optional[IdempotencyLedger] = None,
+        versions: Optional[VersionStore] = None,
+    ):
+        self._client = client
+        self.pdf_cache = pdf_cache
+        self.ledger = ledger
+        self.versions = versions
+        self.poll_backoff = PollBackoff()
+        self._polls: Dict[str, List[Any]] = {}
+
+    async def generate(
+        self,
+        template_id: str,
+        data: Dict[str, Any],
+        response_type: Literal["pdf", "json_with_base64", "document_id"] = "document_id",
+        password: Optional[str] = None,
+        output_path: Optional[Destination] = None,
+        max_size: Optional[int] = None,
+        validate: bool = False,
+        cache: bool = True,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any] | bytes | int:
+        """
+        Generate a document from a template
+
+        Async counterpart of :meth:`Documents.generate`.
+
+        Example:
+            >>> pdf_data = await client.documents.generate(
+            ...     template_id='template-c2465c0b-fc54-4672-b9ac-7446886cd6de',
+            ...     data={'customer_name': 'John Doe'},
+            ...     response_type='pdf'
+            ... )
+        """
+        if validate:
+            placeholders = await self._client.templates.placeholders(template_id)
+            validate_data(placeholders, data, template_id)
+
+        cache_parts = None
+        if cache and self.pdf_cache is not None and response_type == "pdf":
+            cache_parts = {
+                "template_id": template_id,
+                "template_version": await self._template_version(template_id),
+                "data": data,
+                "password": password,
+            }
+
+        payload = _generate_payload(template_id, data, response_type, password)
+        return await self._send_generation(
+            "documents/generate",
+            payload,
+            response_type,
+            output_path,
+            max_size,
+            cache_parts,
+            idempotency_key,
+        )
+
+    async def _template_version(self, template_id: str) -> str:
+        """Revision marker of a template, so edits change PDF cache keys"""
+        return _template_revision(await self._client.templates.get(template_id))
+
+    async def _send_generation(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        response_type: str,
+        output_path: Optional[Destination],
+        max_size: Optional[int],
+        cache_parts: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any] | bytes | int:
+        """POST a generation request and read the response as requested"""
+        if idempotency_key is None and self.ledger is not None:
+            idempotency_key = generation_key(endpoint, payload)
+        # Only passed when set, so client subclasses and test doubles with
+        # the older post signatures keep working
+        extra = {}
+        if idempotency_key is not None:
+            extra["headers"] = {IDEMPOTENCY_HEADER: idempotency_key}
+            if response_type == "document_id" and self.ledger is not None:
+                recorded = self.ledger.get(idempotency_key)
+                if recorded is not None:
+                    return recorded
+        if cache_parts is not None:
+            return await self._cached_pdf(
+                endpoint, payload, output_path, max_size, cache_parts, extra
+            )
+        if response_type == "pdf" and output_path is not None:
+            return await self._client.post_binary_to(
+                endpoint, output_path, data=payload, max_size=max_size, **extra
+            )
+        elif response_type == "json_with_base64" and output_path is not None:
+            return await self._client.post_json_base64_to(
+                endpoint, output_path, data=payload, max_size=max_size, **extra
+            )
+        elif response_type == "pdf":
+            return await self._client.post_binary(endpoint, data=payload, **extra)
+        else:
+            response = await self._client.post(endpoint, data=payload, **extra)
+            if idempotency_key is not None and self.ledger is not None:
+                self.ledger.record(idempotency_key, response)
+            return response
+
+    async def _cached_pdf(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        output_path: Optional[Destination],
+        max_size: Optional[int],
+        cache_parts: Dict[str, Any],
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> bytes | int:
+        """Serve a PDF from the local cache, generating and storing it on a miss"""
+        key = cache_key(dict(cache_parts, endpoint=endpoint))
+        if output_path is None:
+            pdf = self.pdf_cache.get(key)
+            if pdf is None:
+                pdf = await self._client.post_binary(
+                    endpoint, data=payload, **(extra or {})
+                )
+                self.pdf_cache.set(key, pdf)
+            return pdf
+
+        size = self.pdf_cache.copy_to(key, output_path)
+        if size is None:
+            with self.pdf_cache.writer(key, tee=output_path) as f:
+                size = await self._client.post_binary_to(
+                    endpoint, f, data=payload, max_size=max_size, **(extra or {})
+                )
+        return size
+
+    def generate_many(
+        self,
+        template_id: str,
+        items: Iterable[Dict[str, Any]],
+        concurrency: int = 8,
+        response_type: Literal["pdf", "json_with_base64", "document_id"] = "document_id",
+        password: Optional[str] = None,
+        ordered: bool = True,
+        validate: bool = False,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Generate many documents from one template concurrently
+
+        Async counterpart of :meth:`Documents.generate_many`; consume it with
+        ``async for``.
+
+        Example:
+            >>> async for outcome in client.documents.generate_many(
+            ...     template_id='template-c2465c0b-fc54-4672-b9ac-7446886cd6de',
+            ...     items=rows,
+            ...     concurrency=64
+            ... ):
+            ...     print(outcome.index, outcome.ok)
+        """
+
+        async def generate_one(data: Dict[str, Any]):
+            if validate:
+                # Cached on the templates resource after the first row
+                placeholders = await self._client.templates.placeholders(template_id)
+                validate_data(placeholders, data, template_id)
+            return await self.generate(
+                template_id, data, response_type=response_type, password=password
+            )
+
+        return amap_concurrently(
+            generate_one, items, concurrency=concurrency, ordered=ordered
+        )
+
+    async def quick_generate(
+        self,
+        html: str,
+        data: Optional[Dict[str, Any]] = None,
+        response_type: Literal["pdf", "json_with_base64", "document_id"] = "document_id",
+        extra_css: Optional[str] = None,
+        save_template: bool = False,
+        application_id: Optional[str] = None,
+        password: Optional[str] = None,
+        output_path: Optional[Destination] = None,
+        max_size: Optional[int] = None,
+        validate: bool = False,
+        cache: bool = True,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any] | bytes | int:
+        """
+        Generate a document without pre-creating a template
+
+        Async counterpart of :meth:`Documents.quick_generate`.
+        """
+        if validate:
+            validate_data(extract_placeholders(html + (extra_css or "")), data)
+
+        payload = _quick_generate_payload(
+            html,
+            data,
+            response_type,
+            extra_css,
+            save_template,
+            application_id,
+            password,
+        )
+
+        cache_parts = None
+        if (
+            cache
+            and self.pdf_cache is not None
+            and response_type == "pdf"
+            and not save_template
+        ):
+            cache_parts = {
+                "html": html,
+                "extra_css": extra_css,
+                "data": data,
+                "password": password,
+            }
+        return await self._send_generation(
+            "documents/quick/generate",
+            payload,
+            response_type,
+            output_path,
+            max_size,
+            cache_parts,
+            idempotency_key,
+        )
+
+    async def get(self, document_id: str) -> Dict[str, Any]:
+        """
+        Get a specific document by ID
+
+        Async counterpart of :meth:`Documents.get`.
+        """
+        response = await self._client.get(f"documents/{document_id}")
+        _remember_fetched(self.versions, document_id, response)
+        return response
+
+    async def wait_until_ready(
+        self,
+        document_ids: Union[str, Iterable[str]],
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Wait for documents generated with response_type='document_id'
+
+        Async counterpart of :meth:`Documents.wait_until_ready`. Tasks
+        waiting on the same document share one poll loop.
+        """
+        import asyncio
+
+        if isinstance(document_ids, str):
+            document_ids = [document_ids]
+        waiting: Dict[str, List[int]] = {}
+        for index, document_id in enumerate(document_ids):
+            waiting.setdefault(document_id, []).append(index)
+        tasks = {self._poll_task(document_id): document_id for document_id in waiting}
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pending = set(tasks)
+        try:
+            while pending:
+                remaining = None
+                if deadline is not None:
+                    remaining = max(deadline - time.monotonic(), 0.0)
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    document_id = tasks[task]
+                    error = task.exception()
+                    result = None if error is not None else task.result()
+                    for index in waiting.pop(document_id):
+                        yield BatchResult(index, document_id, result, error)
+            for document_id, indexes in waiting.items():
+                for index in indexes:
+                    error = WaitTimeoutError(
+                        f"Document {document_id} not ready after {timeout:g}s"
+                    )
+                    yield BatchResult(index, document_id, error=error)
+        finally:
+            for task, document_id in tasks.items():
+                self._release_poll(document_id, task)
+
+    def _poll_task(self, document_id: str):
+        """The shared poll loop for ``document_id``, started if needed"""
+        import asyncio
+
+        entry = self._polls.get(document_id)
+        if entry is None:
+            task = asyncio.ensure_future(
+                apoll_document(self.get, document_id, self.poll_backoff)
+            )
+            entry = self._polls[document_id] = [task, 0]
+        entry[1] += 1
+        return entry[0]
+
+    def _release_poll(self, document_id: str, task) -> None:
+        entry = self._polls.get(document_id)
+        if entry is None or entry[0] is not task:
+            return
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._polls[document_id]
+            task.cancel()
+
+    async def wait_for(
+        self, document_id: str, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Async counterpart of :meth:`Documents.wait_for`"""
+        outcomes = self.wait_until_ready([document_id], timeout)
+        try:
+            outcome = await outcomes.__anext__()
+        finally:
+            await outcomes.aclose()
+        return outcome.unwrap()
+
+    async def list(self, **params: Any) -> List[Dict[str, Any]]:
+        """
+        Get all documents
+
+        Async counterpart of :meth:`Documents.list`.
+        """
+        response = await self._client.get("documents", params=params or None)
+        return response
+
+    def iter(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        **params: Any,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all documents, fetching them page by page
+
+        Async counterpart of :meth:`Documents.iter`; consume it with
+        ``async for``.
+        """
+        return aiter_items(self._list_page, params, page_size, prefetch)
+
+    async def _list_page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch a single page of documents using raw query params"""
+        return await self._client.get("documents", params=params)
+
+    async def update(
+        self, document_id: str, data: Dict[str, Any], delta: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Update a document's attributes
+
+        Async counterpart of :meth:`Documents.update`.
+        """
+        previous, changed = plan_update(
+            self.versions, document_id, data, delta, _data_if_changed
+        )
+        if changed is None:
+            self.versions.count_skipped()
+            return unchanged_response(previous)
+        payload = {"data": changed}
+        try:
+            response = await self._client.patch(
+                f"documents/{document_id}", data=payload
+            )
+        except Exception:
+            if self.versions is not None:
+                self.versions.forget(document_id)
+            raise
+        remember_update(
+            self.versions, document_id, previous, response, {"attributes": data}
+        )
+        return response
+
+    async def delete(self, document_id: str) -> Dict[str, Any]:
+        """
+        Delete a document
+
+        Async counterpart of :meth:`Documents.delete`.
+        """
+        if self.versions is not None:
+            self.versions.forget(document_id)
+        response = await self._client.delete(f"documents/{document_id}")
+        return response
+
+    async def delete_many(
+        self,
+        document_ids: Iterable[str],
+        concurrency: int = 8,
+        journal: JournalLike = None,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Delete many documents concurrently
+
+        Async counterpart of :meth:`Documents.delete_many`; consume it with
+        ``async for``.
+        """
+        journal, owned = open_journal(journal)
+
+        async def delete_one(document_id: str) -> Dict[str, Any]:
+            try:
+                return await self.delete(document_id)
+            except NotFoundError:
+                return already_deleted(document_id)
+
+        outcomes = amap_concurrently(
+            delete_one,
+            skip_done(document_ids, journal),
+            concurrency=concurrency,
+            ordered=False,
+        )
+        try:
+            async for outcome in outcomes:
+                journal_outcome(journal, outcome)
+                yield outcome
+        finally:
+            if owned:
+                journal.close()
+
+    async def sweep(
+        self,
+        older_than: Optional[Age] = None,
+        filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        concurrency: int = 8,
+        journal: JournalLike = None,
+        dry_run: bool = False,
+        progress: Optional[Callable[[SweepReport], Any]] = None,
+        timestamp_field: str = "created_at",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        **params: Any,
+    ) -> SweepReport:
+        """
+        Delete every document matching a retention rule
+
+        Async counterpart of :meth:`Documents.sweep`.
+        """
+        if older_than is None and filter is None:
+            raise ValueError("Pass older_than and/or filter to select documents")
+        matches = sweep_matcher(older_than, filter, timestamp_field)
+        document_ids = [
+            document["document_id"]
+            async for document in self.iter(page_size=page_size, **params)
+            if matches(document)
+        ]
+        report = SweepReport(dry_run)
+        report.matched = len(document_ids)
+        if dry_run:
+            return report
+        async for outcome in self.delete_many(document_ids, concurrency, journal):
+            report.add(outcome)
+            if progress is not None:
+                progress(report)
+        return report
+
+    async def download(
+        self,
+        document_id: str,
+        output_path: Optional[Destination] = None,
+        stream: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_size: Optional[int] = None,
+    ) -> bytes | int:
+        """
+        Download a document as PDF
+
+        Async counterpart of :meth:`Documents.download`. File writes are
+        synchronous; with stream=True each chunk is written as it arrives.
+        """
+        endpoint = f"documents/download/{document_id}"
+        if stream:
+            if output_path is None:
+                raise ValueError("output_path is required when stream=True")
+            return await self._client.download_to(
+                endpoint, output_path, chunk_size=chunk_size, max_size=max_size
+            )
+
+        pdf_data = await self._client.download(endpoint)
+
+        if output_path is not None:
+            with open_destination(output_path) as f:
+                f.write(pdf_data)
+
         return pdf_data
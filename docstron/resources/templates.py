@@ -2,14 +2,144 @@
 Templates resource for the Docstron API
 """
 
-from typing import Dict, Any, List, Optional
+import os
+from typing import Dict, Any, List, Optional, Iterator, AsyncIterator, FrozenSet, Tuple
+from typing import Union
+from ..cache import TTLCache
+from ..concurrency import amap_concurrently, map_concurrently
+from ..delta import (
+    VersionStore,
+    plan_update,
+    remember_update,
+    response_record,
+    unchanged_response,
+)
+from ..pagination import DEFAULT_PAGE_SIZE, aiter_items, iter_items
+from ..placeholders import extract_placeholders
+from ..template_sync import (
+    MANIFEST_NAME,
+    SyncAction,
+    SyncReport,
+    adopt_remote,
+    content_hash,
+    created_id,
+    load_manifest,
+    needs_remote,
+    plan_sync,
+    record_outcome,
+    remote_entries,
+    save_manifest,
+    scan_templates,
+)
+
+
+def _create_payload(
+    application_id: str,
+    name: str,
+    content: str,
+    is_active: bool,
+    extra_css: Optional[str],
+) -> Dict[str, Any]:
+    """Build the request body for creating a template"""
+    data = {
+        "application_id": application_id,
+        "name": name,
+        "content": content,
+        "is_active": is_active,
+    }
+    if extra_css:
+        data["extra_css"] = extra_css
+    return data
+
+
+def _update_payload(
+    name: Optional[str],
+    content: Optional[str],
+    is_active: Optional[bool],
+    extra_css: Optional[str],
+) -> Dict[str, Any]:
+    """Build the request body for updating a template, omitting unset fields"""
+    data = {}
+    if name is not None:
+        data["name"] = name
+    if content is not None:
+        data["content"] = content
+    if is_active is not None:
+        data["is_active"] = is_active
+    if extra_css is not None:
+        data["extra_css"] = extra_css
+    return data
+
+
+def _template_placeholders(
+    known: Dict[str, Tuple[str, FrozenSet[str]]],
+    template_id: str,
+    response: Dict[str, Any],
+) -> FrozenSet[str]:
+    """
+    Placeholders used by a fetched template's content and CSS
+
+    ``known`` maps template IDs to the hash of the source last parsed and
+    its placeholders; the source is parsed again only if its hash changed.
+    """
+    template = response.get("data") or {}
+    source = (template.get("content") or "") + (template.get("extra_css") or "")
+    digest = content_hash(source)
+    previous = known.get(template_id)
+    if previous is not None and previous[0] == digest:
+        return previous[1]
+    names = extract_placeholders(source)
+    known[template_id] = (digest, names)
+    return names
+
+
+def _manifest_path(
+    directory: Union[str, os.PathLike], manifest: Union[str, os.PathLike, None]
+) -> str:
+    """The sync manifest path, inside ``directory`` unless given"""
+    if manifest is None:
+        return os.path.join(os.fspath(directory), MANIFEST_NAME)
+    return os.fspath(manifest)
+
+
+def _remember_created(
+    versions: Optional[VersionStore], data: Dict[str, Any], response: Dict[str, Any]
+) -> None:
+    """Record a newly created template as its first known version"""
+    record = response_record(response)
+    if versions is not None and record.get("template_id"):
+        versions.remember(record["template_id"], {**record, **data})
+
+
+def _remember_fetched(
+    versions: Optional[VersionStore], template_id: str, response: Dict[str, Any]
+) -> None:
+    """Record the version returned by get"""
+    if versions is not None:
+        versions.remember(template_id, response_record(response))
 
 
 class Templates:
     """Manage Docstron templates"""
 
-    def __init__(self, client):
+    def __init__(
+        self,
+        client,
+        cache: Optional[TTLCache] = None,
+        versions: Optional[VersionStore] = None,
+    ):
         self._client = client
+        self.cache = cache
+        self.versions = versions
+        self._placeholders: Dict[str, Tuple[str, FrozenSet[str]]] = {}
+
+    def _forget(self, template_id: str) -> None:
+        """Drop everything cached locally about a template"""
+        if self.cache is not None:
+            self.cache.invalidate(template_id)
+        if self.versions is not None:
+            self.versions.forget(template_id)
+        self._placeholders.pop(template_id, None)
 
     def create(
         self,
@@ -40,16 +170,9 @@ class Templates:
             ...     extra_css='@page { margin: 3cm; }'
             ... )
         """
-        data = {
-            "application_id": application_id,
-            "name": name,
-            "content": content,
-            "is_active": is_active,
-        }
-        if extra_css:
-            data["extra_css"] = extra_css
-
+        data = _create_payload(application_id, name, content, is_active, extra_css)
         response = self._client.post("templates", data=data)
+        _remember_created(self.versions, data, response)
         return response
 
     def get(self, template_id: str) -> Dict[str, Any]:
@@ -62,16 +185,65 @@ class Templates:
         Returns:
             Dictionary containing template details
 
+        Served from the client's metadata cache when enabled
+        (``Docstron(metadata_cache_ttl=...)``). Updates and deletes made
+        through this client invalidate the cached entry.
+
         Example:
             >>> template = client.templates.get('template-c2465c0b-fc54-4672-b9ac-7446886cd6de')
         """
+        if self.cache is not None:
+            cached = self.cache.get(template_id)
+            if cached is not None:
+                return cached
+
         response = self._client.get(f"templates/{template_id}")
+        if self.cache is not None:
+            self.cache.set(template_id, response)
+        _remember_fetched(self.versions, template_id, response)
+        if template_id in self._placeholders:
+            _template_placeholders(self._placeholders, template_id, response)
         return response
 
-    def list(self) -> List[Dict[str, Any]]:
+    def placeholders(self, template_id: str, refresh: bool = False) -> FrozenSet[str]:
+        """
+        Get the set of ``{{placeholder}}`` names a template uses
+
+        The names are kept with a hash of the template source they were
+        parsed from, so validating data before each generation is a local
+        operation. With the metadata cache enabled
+        (``Docstron(metadata_cache_ttl=...)``) the template is looked up
+        through it on every call, so edits made elsewhere are picked up
+        within the cache TTL; without it the names are kept until the
+        template is fetched again, updated or deleted through this client.
+        Either way the source is parsed again only when its hash changed.
+
+        Args:
+            template_id: The template ID
+            refresh: Re-fetch the template instead of using the parsed result
+
+        Returns:
+            Frozen set of placeholder names (dotted names for nested values)
+
+        Example:
+            >>> client.templates.placeholders('template-c2465c0b-fc54-4672-b9ac-7446886cd6de')
+            frozenset({'customer_name', 'amount'})
+        """
+        if refresh:
+            self._forget(template_id)
+        elif self.cache is None and template_id in self._placeholders:
+            return self._placeholders[template_id][1]
+        response = self.get(template_id)
+        return _template_placeholders(self._placeholders, template_id, response)
+
+    def list(self, **params: Any) -> List[Dict[str, Any]]:
         """
         Get all templates
 
+        Args:
+            **params: Optional query parameters, e.g. ``limit`` and ``offset``
+                (or ``cursor``) to fetch a single page
+
         Returns:
             List of dictionaries containing template details
 
@@ -80,9 +252,36 @@ class Templates:
             >>> for template in templates['data']:
             ...     print(template['name'])
         """
-        response = self._client.get("templates")
+        response = self._client.get("templates", params=params or None)
         return response
 
+    def iter(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        **params: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all templates, fetching them page by page
+
+        Args:
+            page_size: Number of templates requested per page (default: 100)
+            prefetch: Fetch the next page in the background (default: True)
+            **params: Extra query parameters sent with every page
+
+        Returns:
+            Iterator of template dictionaries
+
+        Example:
+            >>> for template in client.templates.iter():
+            ...     print(template['name'])
+        """
+        return iter_items(self._list_page, params, page_size, prefetch)
+
+    def _list_page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch a single page of templates using raw query params"""
+        return self._client.get("templates", params=params)
+
     def update(
         self,
         template_id: str,
@@ -90,16 +289,25 @@ class Templates:
         content: Optional[str] = None,
         is_active: Optional[bool] = None,
         extra_css: Optional[str] = None,
+        delta: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """
         Update a template
 
+        With ``Docstron(delta_updates=True)`` the fields are compared with
+        the last version of the template this client saw (from a get,
+        create or update), and only the changed ones are sent. When nothing
+        changed no request is made, and the known version is returned with
+        ``not_modified`` set.
+
         Args:
             template_id: The template ID to update
             name: New template name (optional)
             content: New HTML content (optional)
             is_active: New active status (optional)
             extra_css: New CSS styles (optional)
+            delta: False sends every given field even when delta updates
+                are enabled (default: follow the client)
 
         Returns:
             Dictionary containing the updated template details
@@ -111,17 +319,17 @@ class Templates:
             ...     is_active=False
             ... )
         """
-        data = {}
-        if name is not None:
-            data["name"] = name
-        if content is not None:
-            data["content"] = content
-        if is_active is not None:
-            data["is_active"] = is_active
-        if extra_css is not None:
-            data["extra_css"] = extra_css
-
-        response = self._client.patch(f"templates/{template_id}", data=data)
+        data = _update_payload(name, content, is_active, extra_css)
+        previous, data = plan_update(self.versions, template_id, data, delta)
+        if data is None:
+            self.versions.count_skipped()
+            return unchanged_response(previous)
+        try:
+            response = self._client.patch(f"templates/{template_id}", data=data)
+        finally:
+            # Invalidate even on failure: a 404 means the template is gone
+            self._forget(template_id)
+        remember_update(self.versions, template_id, previous, response, data)
         return response
 
     def delete(self, template_id: str) -> Dict[str, Any]:
@@ -137,5 +345,285 @@ class Templates:
         Example:
             >>> result = client.templates.delete('template-c2465c0b-fc54-4672-b9ac-7446886cd6de')
         """
-        response = self._client.delete(f"templates/{template_id}")
+        try:
+            response = self._client.delete(f"templates/{template_id}")
+        finally:
+            # Invalidate even on failure: a 404 means the template is gone
+            self._forget(template_id)
         return response
+
+    def sync(
+        self,
+        directory: Union[str, os.PathLike],
+        application_id: str,
+        concurrency: int = 8,
+        manifest: Union[str, os.PathLike, None] = None,
+        deactivate: bool = True,
+        dry_run: bool = False,
+    ) -> SyncReport:
+        """
+        Push a directory of template files, sending only what changed
+
+        Every ``<name>.html`` file under ``directory`` (with an optional
+        ``<name>.css`` next to it) is a template named after its relative
+        path. Content and CSS are hashed and compared with a manifest of the
+        remote state written by the previous sync, so unchanged templates
+        cost no request at all: new files are created, changed ones patched
+        with just the changed fields, and templates whose files were removed
+        are deactivated. The requests run concurrently.
+
+        The manifest is rewritten after every sync. Failed templates keep
+        their old entry and are retried by the next sync. Without a manifest
+        (first sync), the application's templates are listed once and
+        matched by name, so existing templates are updated, not duplicated.
+
+        Args:
+            directory: Directory holding the template files
+            application_id: Application the templates belong to
+            concurrency: Requests in flight at once (default: 8)
+            manifest: Manifest file (default: ``.docstron-sync.json`` in
+                ``directory``). Templates changed outside the sync are not
+                noticed while the manifest says otherwise; delete it to
+                compare against the API again.
+            deactivate: Deactivate templates whose files were removed
+                (default: True)
+            dry_run: Only plan the changes (default: False)
+
+        Returns:
+            SyncReport listing the created, updated and deactivated templates
+
+        Example:
+            >>> report = client.templates.sync(
+            ...     'templates/',
+            ...     application_id='app-7b4d78fb-820c-4ca9-84cc-46953f211234',
+            ... )
+            >>> report
+            SyncReport(created=0, updated=1, deactivated=0, unchanged=399, failed=0)
+        """
+        report = SyncReport(dry_run)
+        manifest = _manifest_path(directory, manifest)
+        local = scan_templates(directory)
+        entries = load_manifest(manifest, application_id)
+        if needs_remote(local, entries):
+            remote = remote_entries(self.iter(), application_id)
+            adopt_remote(local, entries, remote)
+        actions, report.unchanged = plan_sync(local, entries, deactivate)
+        if dry_run:
+            for action in actions:
+                report.add(action)
+            report.finish()
+            return report
+
+        def apply(action: SyncAction) -> Optional[str]:
+            if action.kind == "create":
+                response = self.create(application_id, action.name, **action.payload)
+                return created_id(response)
+            self.update(action.template_id, **action.payload)
+            return action.template_id
+
+        outcomes = map_concurrently(
+            apply, actions, concurrency=concurrency, ordered=False
+        )
+        try:
+            for outcome in outcomes:
+                record_outcome(report, entries, outcome)
+        finally:
+            save_manifest(manifest, application_id, entries)
+            report.finish()
+        return report
+
+
+class AsyncTemplates:
+    """Manage Docstron templates (asynchronous)"""
+
+    def __init__(
+        self,
+        client,
+        cache: Optional[TTLCache] = None,
+        versions: Optional[VersionStore] = None,
+    ):
+        self._client = client
+        self.cache = cache
+        self.versions = versions
+        self._placeholders: Dict[str, Tuple[str, FrozenSet[str]]] = {}
+
+    def _forget(self, template_id: str) -> None:
+        """Drop everything cached locally about a template"""
+        if self.cache is not None:
+            self.cache.invalidate(template_id)
+        if self.versions is not None:
+            self.versions.forget(template_id)
+        self._placeholders.pop(template_id, None)
+
+    async def create(
+        self,
+        application_id: str,
+        name: str,
+        content: str,
+        is_active: bool = True,
+        extra_css: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a new template
+
+        Async counterpart of :meth:`Templates.create`.
+
+        Example:
+            >>> template = await client.templates.create(
+            ...     application_id='app-7b4d78fb-820c-4ca9-84cc-46953f211234',
+            ...     name='Invoice Template',
+            ...     content='<h1>Invoice for {{customer_name}}</h1>'
+            ... )
+        """
+        data = _create_payload(application_id, name, content, is_active, extra_css)
+        response = await self._client.post("templates", data=data)
+        _remember_created(self.versions, data, response)
+        return response
+
+    async def get(self, template_id: str) -> Dict[str, Any]:
+        """
+        Get a specific template by ID
+
+        Async counterpart of :meth:`Templates.get`.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(template_id)
+            if cached is not None:
+                return cached
+
+        response = await self._client.get(f"templates/{template_id}")
+        if self.cache is not None:
+            self.cache.set(template_id, response)
+        _remember_fetched(self.versions, template_id, response)
+        if template_id in self._placeholders:
+            _template_placeholders(self._placeholders, template_id, response)
+        return response
+
+    async def placeholders(
+        self, template_id: str, refresh: bool = False
+    ) -> FrozenSet[str]:
+        """
+        Get the set of ``{{placeholder}}`` names a template uses
+
+        Async counterpart of :meth:`Templates.placeholders`.
+        """
+        if refresh:
+            self._forget(template_id)
+        elif self.cache is None and template_id in self._placeholders:
+            return self._placeholders[template_id][1]
+        response = await self.get(template_id)
+        return _template_placeholders(self._placeholders, template_id, response)
+
+    async def list(self, **params: Any) -> List[Dict[str, Any]]:
+        """
+        Get all templates
+
+        Async counterpart of :meth:`Templates.list`.
+        """
+        response = await self._client.get("templates", params=params or None)
+        return response
+
+    def iter(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        **params: Any,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all templates, fetching them page by page
+
+        Async counterpart of :meth:`Templates.iter`.
+        """
+        return aiter_items(self._list_page, params, page_size, prefetch)
+
+    async def _list_page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch a single page of templates using raw query params"""
+        return await self._client.get("templates", params=params)
+
+    async def update(
+        self,
+        template_id: str,
+        name: Optional[str] = None,
+        content: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        extra_css: Optional[str] = None,
+        delta: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+        Update a template
+
+        Async counterpart of :meth:`Templates.update`.
+        """
+        data = _update_payload(name, content, is_active, extra_css)
+        previous, data = plan_update(self.versions, template_id, data, delta)
+        if data is None:
+            self.versions.count_skipped()
+            return unchanged_response(previous)
+        try:
+            response = await self._client.patch(f"templates/{template_id}", data=data)
+        finally:
+            # Invalidate even on failure: a 404 means the template is gone
+            self._forget(template_id)
+        remember_update(self.versions, template_id, previous, response, data)
+        return response
+
+    async def delete(self, template_id: str) -> Dict[str, Any]:
+        """
+        Delete a template
+
+        Async counterpart of :meth:`Templates.delete`.
+        """
+        try:
+            response = await self._client.delete(f"templates/{template_id}")
+        finally:
+            # Invalidate even on failure: a 404 means the template is gone
+            self._forget(template_id)
+        return response
+
+    async def sync(
+        self,
+        directory: Union[str, os.PathLike],
+        application_id: str,
+        concurrency: int = 8,
+        manifest: Union[str, os.PathLike, None] = None,
+        deactivate: bool = True,
+        dry_run: bool = False,
+    ) -> SyncReport:
+        """
+        Push a directory of template files, sending only what changed
+
+        Async counterpart of :meth:`Templates.sync`.
+        """
+        report = SyncReport(dry_run)
+        manifest = _manifest_path(directory, manifest)
+        local = scan_templates(directory)
+        entries = load_manifest(manifest, application_id)
+        if needs_remote(local, entries):
+            listed = [template async for template in self.iter()]
+            adopt_remote(local, entries, remote_entries(listed, application_id))
+        actions, report.unchanged = plan_sync(local, entries, deactivate)
+        if dry_run:
+            for action in actions:
+                report.add(action)
+            report.finish()
+            return report
+
+        async def apply(action: SyncAction) -> Optional[str]:
+            if action.kind == "create":
+                response = await self.create(
+                    application_id, action.name, **action.payload
+                )
+                return created_id(response)
+            await self.update(action.template_id, **action.payload)
+            return action.template_id
+
+        outcomes = amap_concurrently(
+            apply, actions, concurrency=concurrency, ordered=False
+        )
+        try:
+            async for outcome in outcomes:
+                record_outcome(report, entries, outcome)
+        finally:
+            save_manifest(manifest, application_id, entries)
+            report.finish()
+        return report
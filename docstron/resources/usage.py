@@ -30,3 +30,23 @@ class Usage:
         """
         response = self._client.get("usage")
         return response
+
+
+class AsyncUsage:
+    """Get usage statistics and limits (asynchronous)"""
+
+    def __init__(self, client):
+        self._client = client
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Get usage statistics and limits
+
+        Async counterpart of :meth:`Usage.get`.
+
+        Example:
+            >>> usage = await client.usage.get()
+            >>> print(usage['data']['subscription']['plan_name'])
+        """
+        response = await self._client.get("usage")
+        return response
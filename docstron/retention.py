@@ -0,0 +1,169 @@
+"""
+Helpers for bulk deletion and retention sweeps
+"""
+
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from .concurrency import BatchResult
+from .journal import CheckpointJournal
+
+#: Accepted forms of ``older_than``: an age or an absolute cutoff
+Age = Union[timedelta, int, float, datetime]
+
+#: ``journal`` argument of delete_many/sweep: a path or an open journal
+JournalLike = Union[CheckpointJournal, str, os.PathLike, None]
+
+
+def already_deleted(document_id: str) -> Dict[str, Any]:
+    """Result reported for a document that was gone before we deleted it"""
+    return {
+        "success": True,
+        "message": f"Document {document_id} already deleted",
+        "already_deleted": True,
+    }
+
+
+def resolve_cutoff(older_than: Age, now: Optional[datetime] = None) -> datetime:
+    """
+    Timezone-aware cutoff datetime for ``older_than``
+
+    Args:
+        older_than: A timedelta or number of seconds (documents older than
+            that age), or a datetime (documents created before it; naive
+            datetimes are taken as UTC)
+        now: Reference time for ages (default: current UTC time)
+    """
+    if isinstance(older_than, datetime):
+        cutoff = older_than
+    else:
+        if not isinstance(older_than, timedelta):
+            older_than = timedelta(seconds=older_than)
+        cutoff = (now or datetime.now(timezone.utc)) - older_than
+    if cutoff.tzinfo is None:
+        cutoff = cutoff.replace(tzinfo=timezone.utc)
+    return cutoff
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an API timestamp such as ``2024-12-02T10:15:30.000000Z``"""
+    if not isinstance(value, str) or not value:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def sweep_matcher(
+    older_than: Optional[Age],
+    filter: Optional[Callable[[Dict[str, Any]], bool]],
+    timestamp_field: str,
+) -> Callable[[Dict[str, Any]], bool]:
+    """Predicate selecting the listed documents a sweep deletes"""
+    cutoff = None if older_than is None else resolve_cutoff(older_than)
+
+    def matches(document: Dict[str, Any]) -> bool:
+        if cutoff is not None:
+            created = parse_timestamp(document.get(timestamp_field))
+            # Documents without a readable timestamp are never swept by age
+            if created is None or created >= cutoff:
+                return False
+        return filter is None or bool(filter(document))
+
+    return matches
+
+
+def open_journal(journal: JournalLike) -> Tuple[Optional[CheckpointJournal], bool]:
+    """The journal to use and whether the caller must close it"""
+    if journal is None or isinstance(journal, CheckpointJournal):
+        return journal, False
+    return CheckpointJournal(journal), True
+
+
+def skip_done(
+    document_ids: Iterable[str], journal: Optional[CheckpointJournal]
+) -> Iterator[str]:
+    """The IDs not yet recorded as deleted in ``journal``"""
+    for document_id in document_ids:
+        if journal is None or not journal.is_done(document_id):
+            yield document_id
+
+
+class SweepReport:
+    """
+    Progress and outcome of a bulk deletion
+
+    Attributes:
+        matched: Documents selected for deletion
+        deleted: Documents deleted by this run
+        already_deleted: Documents that were already gone (404)
+        failed: Documents that could not be deleted
+        errors: Failures by exception class name
+        duration: Wall-clock seconds so far
+        dry_run: Whether documents were only listed, not deleted
+    """
+
+    def __init__(self, dry_run: bool = False):
+        self.dry_run = dry_run
+        self.matched = 0
+        self.deleted = 0
+        self.already_deleted = 0
+        self.failed = 0
+        self.errors: Counter = Counter()
+        self.duration = 0.0
+        self._started = time.perf_counter()
+
+    @property
+    def done(self) -> int:
+        """Documents processed so far"""
+        return self.deleted + self.already_deleted + self.failed
+
+    def add(self, outcome: BatchResult) -> None:
+        """Count one deletion outcome"""
+        if not outcome.ok:
+            self.failed += 1
+            self.errors[type(outcome.error).__name__] += 1
+        elif outcome.result.get("already_deleted"):
+            self.already_deleted += 1
+        else:
+            self.deleted += 1
+        self.duration = time.perf_counter() - self._started
+
+    def __repr__(self) -> str:
+        return (
+            f"SweepReport(matched={self.matched}, deleted={self.deleted}, "
+            f"already_deleted={self.already_deleted}, failed={self.failed})"
+        )
+
+
+def journal_outcome(journal: Optional[CheckpointJournal], outcome: BatchResult) -> None:
+    """Append one deletion outcome to ``journal`` (if any)"""
+    if journal is None:
+        return
+    if outcome.ok:
+        journal.record(outcome.item)
+    else:
+        error = outcome.error
+        journal.record(outcome.item, error=str(error), type=type(error).__name__)
+
+
+def record_outcomes(
+    outcomes: Iterable[BatchResult],
+    journal: Optional[CheckpointJournal],
+    close_journal: bool = False,
+) -> Iterator[BatchResult]:
+    """Pass deletion outcomes through, appending each to ``journal``"""
+    try:
+        for outcome in outcomes:
+            journal_outcome(journal, outcome)
+            yield outcome
+    finally:
+        if close_journal:
+            journal.close()
@@ -0,0 +1,149 @@
+"""
+Retry policy for transient Docstron API failures
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Collection, Mapping, Optional
+
+#: HTTP methods that are safe to repeat without side effects
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryPolicy:
+    """
+    Controls automatic retries of throttled and failed requests
+
+    Retries use exponential backoff with full jitter, so many workers hitting
+    the same limit spread their retries out instead of retrying in lockstep.
+    When the API says how long to wait (``Retry-After`` or rate-limit reset
+    headers), that delay is used instead.
+
+    Args:
+        max_retries: Maximum number of retries after the first attempt
+        backoff_factor: Base delay in seconds; attempt ``n`` waits up to
+            ``backoff_factor * 2 ** (n - 1)`` seconds
+        max_backoff: Upper bound in seconds for a computed backoff delay
+        jitter: Randomize delays between 0 and the computed backoff
+        retry_on_status: Status codes that are retried for idempotent methods
+        always_retry_status: Status codes retried for every method because the
+            server rejected the request without processing it (default: 429)
+        methods: HTTP methods considered idempotent and safe to retry
+        respect_retry_after: Honor ``Retry-After``/``X-RateLimit-Reset`` headers
+        max_retry_after: Give up instead of waiting longer than this many
+            seconds for a server-requested delay
+
+    Example:
+        >>> from docstron import Docstron, RetryPolicy
+        >>> client = Docstron(
+        ...     api_key='your-api-key',
+        ...     retry_policy=RetryPolicy(max_retries=5, backoff_factor=1.0)
+        ... )
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        retry_on_status: Collection[int] = (429, 500, 502, 503, 504),
+        always_retry_status: Collection[int] = (429,),
+        methods: Collection[str] = IDEMPOTENT_METHODS,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 120.0,
+    ):
+        if max_retries < 0:
+            raise ValueError("max_retries must be zero or greater")
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_on_status = frozenset(retry_on_status)
+        self.always_retry_status = frozenset(always_retry_status)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def is_idempotent(self, method: str, headers: Optional[Mapping] = None) -> bool:
+        """Whether a request may be repeated without duplicating side effects"""
+        if method.upper() in self.methods:
+            return True
+        return bool(headers and headers.get("Idempotency-Key"))
+
+    def should_retry_status(
+        self,
+        method: str,
+        status_code: int,
+        attempt: int,
+        headers: Optional[Mapping] = None,
+    ) -> bool:
+        """Whether a response with ``status_code`` should be retried"""
+        if attempt > self.max_retries:
+            return False
+        if status_code in self.always_retry_status:
+            return True
+        return status_code in self.retry_on_status and self.is_idempotent(
+            method, headers
+        )
+
+    def should_retry_error(
+        self, method: str, attempt: int, headers: Optional[Mapping] = None
+    ) -> bool:
+        """Whether a connection error or timeout should be retried"""
+        return attempt <= self.max_retries and self.is_idempotent(method, headers)
+
+    def backoff(self, attempt: int) -> float:
+        """Computed delay in seconds before retry number ``attempt``"""
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
+
+    def retry_after(self, headers: Optional[Mapping]) -> Optional[float]:
+        """Server-requested delay in seconds, if the response carries one"""
+        if not self.respect_retry_after or not headers:
+            return None
+
+        value = headers.get("Retry-After")
+        if value:
+            value = value.strip()
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                pass
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+        reset = headers.get("X-RateLimit-Reset")
+        if reset and headers.get("X-RateLimit-Remaining", "0").strip() == "0":
+            try:
+                reset_value = float(reset)
+            except ValueError:
+                return None
+            # Large values are epoch timestamps, small ones are relative delays
+            if reset_value > 1_000_000_000:
+                return max(0.0, reset_value - time.time())
+            return max(0.0, reset_value)
+        return None
+
+    def delay(self, attempt: int, headers: Optional[Mapping] = None) -> Optional[float]:
+        """
+        Delay in seconds before retry number ``attempt``
+
+        Returns None when the server asks for a longer wait than
+        ``max_retry_after``, in which case the error should be surfaced.
+        """
+        requested = self.retry_after(headers)
+        if requested is None:
+            return self.backoff(attempt)
+        if requested > self.max_retry_after:
+            return None
+        return requested
+
+
+#: Policy that never retries
+NO_RETRY = RetryPolicy(max_retries=0)
@@ -0,0 +1,120 @@
+"""
+Coalescing of identical concurrent requests
+"""
+
+import copy
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Mapping, Optional
+
+
+def request_key(endpoint: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Key identifying a GET by endpoint and (order-insensitive) query params"""
+    if not params:
+        return endpoint
+    return endpoint + "?" + json.dumps(params, sort_keys=True, default=str)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Share one execution among concurrent callers asking for the same key
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and receive a deep copy of its result (or the
+    same exception). When a call was shared the first caller gets a copy
+    too, so every caller may mutate what it receives. Once the call
+    finishes, the next caller starts a new one - nothing is cached.
+
+    Example:
+        >>> client = Docstron(api_key='your-api-key', coalesce_requests=True)
+        >>> # 50 threads calling client.templates.get('template-123') at
+        >>> # once now cause a single HTTP request
+        >>> client.single_flight.coalesced
+        49
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Return ``func()``, sharing the call with concurrent callers of ``key``"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise copy.copy(call.error)
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # No follower can join once the key is gone, so the count is final
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        if call.followers:
+            return copy.deepcopy(call.result)
+        return call.result
+
+
+class AsyncSingleFlight:
+    """
+    Async counterpart of :class:`SingleFlight`
+
+    The shared call runs as its own task, so one caller being cancelled
+    does not cancel the request for the others.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls: Dict[Hashable, List[Any]] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``func()``, sharing the call with concurrent callers of ``key``"""
+        # Imported here so the synchronous client never loads asyncio
+        import asyncio
+
+        call = self._calls.get(key)
+        if call is not None:
+            call[1] += 1
+            self.coalesced += 1
+            return copy.deepcopy(await asyncio.shield(call[0]))
+
+        # [task, follower count]; the done callback below runs before any
+        # awaiter resumes, so the count is final when the leader reads it
+        task = asyncio.ensure_future(func())
+        call = self._calls[key] = [task, 0]
+        task.add_done_callback(lambda done: self._finish(key, call))
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result) if call[1] else result
+
+    def _finish(self, key: Hashable, call: List[Any]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        task = call[0]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
@@ -0,0 +1,326 @@
+"""
+Helpers for streaming binary responses to disk
+"""
+
+import binascii
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Union,
+)
+from .exceptions import DocstronError, ResponseTooLargeError
+
+#: Default size of the chunks read from the network and written to disk
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+Destination = Union[str, "os.PathLike[str]", IO[bytes], bytearray]
+
+
+class _ByteArrayWriter:
+    """Minimal file-like wrapper that appends writes to a bytearray"""
+
+    def __init__(self, buffer: bytearray):
+        self.write = buffer.extend
+
+
+def check_content_length(headers, max_size: Optional[int]) -> None:
+    """Reject a response up front when its declared size exceeds max_size"""
+    if max_size is None:
+        return
+    length = headers.get("Content-Length")
+    if length is not None and length.isdigit() and int(length) > max_size:
+        raise ResponseTooLargeError(
+            f"Response of {length} bytes exceeds max_size of {max_size} bytes"
+        )
+
+
+class SizeGuard:
+    """Running byte counter that enforces an optional maximum size"""
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size
+        self.total = 0
+
+    def add(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        if self.max_size is not None and self.total > self.max_size:
+            raise ResponseTooLargeError(
+                f"Response exceeds max_size of {self.max_size} bytes"
+            )
+
+
+@contextmanager
+def open_destination(destination: Destination) -> Iterator[IO[bytes]]:
+    """
+    Yield a writable binary file for ``destination``
+
+    File objects are used as-is and bytearrays are extended in place. Paths
+    are written through a temporary file in the same directory that is renamed
+    into place only once the body has been fully written, so a failed or
+    oversized download never leaves a partial file behind.
+    """
+    if isinstance(destination, bytearray):
+        yield _ByteArrayWriter(destination)
+        return
+    if hasattr(destination, "write"):
+        yield destination
+        return
+
+    path = os.fspath(destination)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".docstron-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_chunks(
+    chunks: Iterable[bytes],
+    destination: Destination,
+    max_size: Optional[int] = None,
+) -> int:
+    """Write ``chunks`` to ``destination`` and return the number of bytes written"""
+    guard = SizeGuard(max_size)
+    with open_destination(destination) as f:
+        for chunk in chunks:
+            if chunk:
+                guard.add(chunk)
+                f.write(chunk)
+    return guard.total
+
+
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_SIMPLE_ESCAPES = {ord("/"): b"/", ord("\\"): b"\\", ord('"'): b'"'}
+_NORMAL, _KEY, _STRING, _TARGET = range(4)
+
+
+class Base64FieldExtractor:
+    """
+    Incrementally decode one base64 string field out of a streamed JSON body
+
+    The JSON document is scanned chunk by chunk. Bytes of the target field
+    (``data.pdf`` by default) are base64-decoded as they arrive and passed to
+    ``write``; everything else is kept and parsed once the body is complete.
+    Peak memory is one network chunk plus the (small) metadata, instead of
+    the raw body, the decoded ``str`` and the decoded bytes at once.
+
+    Args:
+        write: Callable receiving decoded bytes
+        field: Key path of the base64 string inside the JSON object
+        max_size: Optional limit in bytes for the decoded data
+        loads: JSON parser for the remaining metadata (default: json.loads)
+    """
+
+    def __init__(
+        self,
+        write: Callable[[bytes], Any],
+        field: Sequence[str] = ("data", "pdf"),
+        max_size: Optional[int] = None,
+        loads: Callable[[bytes], Any] = json.loads,
+    ):
+        self._write = write
+        self._loads = loads
+        self._field = tuple(field)
+        self._guard = SizeGuard(max_size)
+        self._meta = bytearray()
+        # One frame per open container: [is_object, current_key, expect_key]
+        self._stack = []
+        self._state = _NORMAL
+        self._escape = False
+        self._key = bytearray()
+        self._pending = bytearray()
+        self._unicode = None
+        self._prefix_checked = False
+        self.found = False
+
+    @property
+    def size(self) -> int:
+        """Number of decoded bytes written so far"""
+        return self._guard.total
+
+    def _path(self) -> tuple:
+        return tuple(frame[1] if frame[0] else None for frame in self._stack)
+
+    def feed(self, chunk: bytes) -> None:
+        """Process the next chunk of the response body"""
+        i, n = 0, len(chunk)
+        while i < n:
+            if self._state == _TARGET:
+                i = self._feed_target(chunk, i)
+            elif self._state != _NORMAL:
+                i = self._feed_string(chunk, i)
+            else:
+                i = self._feed_structure(chunk, i)
+
+    def _feed_structure(self, chunk: bytes, i: int) -> int:
+        c = chunk[i]
+        frame = self._stack[-1] if self._stack else None
+        if c == 0x22:  # "
+            if frame is not None and frame[0] and frame[2]:
+                self._state = _KEY
+                self._key = bytearray()
+            elif not self.found and self._path() == self._field:
+                self._state = _TARGET
+                self.found = True
+            else:
+                self._state = _STRING
+        elif c == 0x7B:  # {
+            self._stack.append([True, None, True])
+        elif c == 0x5B:  # [
+            self._stack.append([False, None, False])
+        elif c in (0x7D, 0x5D) and self._stack:  # } ]
+            self._stack.pop()
+        elif c == 0x3A and frame is not None:  # :
+            frame[2] = False
+        elif c == 0x2C and frame is not None and frame[0]:  # ,
+            frame[2] = True
+        self._meta.append(c)
+        return i + 1
+
+    def _feed_string(self, chunk: bytes, i: int) -> int:
+        """Copy a key or non-target string value, honoring escapes"""
+        n = len(chunk)
+        start = i
+        while i < n:
+            if self._escape:
+                self._escape = False
+                i += 1
+                continue
+            match = _STRING_SPECIAL.search(chunk, i)
+            if match is None:
+                i = n
+                break
+            i = match.start()
+            if chunk[i] == 0x5C:  # backslash
+                self._escape = True
+                i += 1
+                continue
+            # Closing quote
+            segment = chunk[start:i]
+            if self._state == _KEY:
+                self._key += segment
+                self._stack[-1][1] = json.loads(b'"' + bytes(self._key) + b'"')
+            self._meta += segment
+            self._meta.append(0x22)
+            self._state = _NORMAL
+            return i + 1
+        segment = chunk[start:i]
+        if self._state == _KEY:
+            self._key += segment
+        self._meta += segment
+        return i
+
+    def _feed_target(self, chunk: bytes, i: int) -> int:
+        """Decode the target string's base64 content"""
+        n = len(chunk)
+        while i < n:
+            if self._unicode is not None:
+                take = chunk[i : i + 4 - len(self._unicode)]
+                self._unicode += take
+                i += len(take)
+                if len(self._unicode) == 4:
+                    char = chr(int(self._unicode, 16))
+                    self._unicode = None
+                    if not char.isspace():
+                        self._emit(char.encode("ascii", "ignore"))
+                continue
+            if self._escape:
+                self._escape = False
+                c = chunk[i]
+                i += 1
+                if c == ord("u"):
+                    self._unicode = bytearray()
+                else:
+                    # \n, \r and \t are line wrapping; base64 ignores them
+                    self._emit(_SIMPLE_ESCAPES.get(c, b""))
+                continue
+            match = _STRING_SPECIAL.search(chunk, i)
+            end = match.start() if match else n
+            if end > i:
+                self._emit(chunk[i:end])
+            if match is None:
+                return n
+            if chunk[end] == 0x5C:
+                self._escape = True
+                i = end + 1
+                continue
+            self._finish_target()
+            self._meta.append(0x22)
+            self._state = _NORMAL
+            return end + 1
+        return i
+
+    def _emit(self, data: bytes) -> None:
+        self._pending += data
+        if not self._prefix_checked:
+            # Strip a "data:application/pdf;base64," URI prefix if present
+            if len(self._pending) < 5:
+                return
+            if self._pending.startswith(b"data:"):
+                comma = self._pending.find(b",")
+                if comma < 0:
+                    return
+                del self._pending[: comma + 1]
+            self._prefix_checked = True
+        usable = len(self._pending) - len(self._pending) % 4
+        if usable:
+            self._decode(bytes(self._pending[:usable]))
+            del self._pending[:usable]
+
+    def _decode(self, data: bytes) -> None:
+        try:
+            decoded = binascii.a2b_base64(data)
+        except binascii.Error as e:
+            raise DocstronError(f"Invalid base64 data in response: {e}") from None
+        if decoded:
+            self._guard.add(decoded)
+            self._write(decoded)
+
+    def _finish_target(self) -> None:
+        self._prefix_checked = True
+        if self._pending:
+            padding = b"=" * (-len(self._pending) % 4)
+            self._decode(bytes(self._pending) + padding)
+            self._pending = bytearray()
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Finish decoding and return the JSON metadata without the base64 field
+
+        Raises:
+            DocstronError: If the body was truncated or had no such field
+        """
+        if self._state != _NORMAL or self._stack:
+            raise DocstronError("Incomplete JSON response while decoding PDF")
+        try:
+            metadata = self._loads(bytes(self._meta))
+        except ValueError as e:
+            raise DocstronError(f"Invalid JSON response: {e}") from None
+        if not self.found:
+            raise DocstronError(
+                f"Response has no base64 field '{'.'.join(self._field)}'",
+                response=metadata,
+            )
+        parent = metadata
+        for key in self._field[:-1]:
+            parent = parent[key]
+        del parent[self._field[-1]]
+        return metadata
@@ -0,0 +1,331 @@
+"""
+Incremental sync of a directory of template files
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .concurrency import BatchResult
+from .exceptions import DocstronError
+
+#: Manifest of the remote state, kept in the synced directory by default
+MANIFEST_NAME = ".docstron-sync.json"
+
+#: File extensions of template content and its CSS
+CONTENT_SUFFIX = ".html"
+CSS_SUFFIX = ".css"
+
+
+def content_hash(text: Optional[str]) -> str:
+    """SHA-256 of a template's content or CSS (None hashes like ``""``)"""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class LocalTemplate:
+    """
+    A template read from disk
+
+    Attributes:
+        name: Template name: the path of the ``.html`` file relative to the
+            synced directory, without extension and with ``/`` separators
+        content: HTML content
+        extra_css: Content of the sibling ``.css`` file, or None
+    """
+
+    __slots__ = ("name", "content", "extra_css")
+
+    def __init__(self, name: str, content: str, extra_css: Optional[str] = None):
+        self.name = name
+        self.content = content
+        self.extra_css = extra_css
+
+    @property
+    def hashes(self) -> Dict[str, str]:
+        """Content and CSS hashes, as stored in the manifest"""
+        return {
+            "content": content_hash(self.content),
+            "css": content_hash(self.extra_css),
+        }
+
+
+def scan_templates(directory: Union[str, os.PathLike]) -> Dict[str, LocalTemplate]:
+    """
+    Read every ``<name>.html`` (plus optional ``<name>.css``) under ``directory``
+
+    Hidden files and directories (including the manifest) are ignored.
+    """
+    directory = os.fspath(directory)
+    templates = {}
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for filename in sorted(files):
+            stem, extension = os.path.splitext(filename)
+            if filename.startswith(".") or extension.lower() != CONTENT_SUFFIX:
+                continue
+            path = os.path.join(root, filename)
+            name = os.path.relpath(os.path.join(root, stem), directory)
+            name = name.replace(os.sep, "/")
+            with open(path, encoding="utf-8") as f:
+                content = f.read()
+            extra_css = None
+            css_path = os.path.join(root, stem + CSS_SUFFIX)
+            if os.path.exists(css_path):
+                with open(css_path, encoding="utf-8") as f:
+                    extra_css = f.read()
+            templates[name] = LocalTemplate(name, content, extra_css)
+    return templates
+
+
+def load_manifest(
+    path: Union[str, os.PathLike], application_id: str
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Manifest entries by template name
+
+    A missing or unreadable manifest, or one written for another
+    application, gives no entries; the next sync rebuilds it.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("application_id") != application_id
+    ):
+        return {}
+    templates = manifest.get("templates")
+    return dict(templates) if isinstance(templates, dict) else {}
+
+
+def save_manifest(
+    path: Union[str, os.PathLike],
+    application_id: str,
+    entries: Dict[str, Dict[str, Any]],
+) -> None:
+    """Write the manifest atomically, so a crash never leaves half of it"""
+    path = os.fspath(path)
+    manifest = {"application_id": application_id, "templates": entries}
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
+    os.replace(temporary, path)
+
+
+def remote_entries(
+    templates: Iterable[Dict[str, Any]], application_id: str
+) -> Dict[str, Dict[str, Any]]:
+    """Manifest entries for the application's templates as listed by the API"""
+    entries = {}
+    for template in templates:
+        if template.get("application_id") not in (None, application_id):
+            continue
+        entries[template.get("name")] = {
+            "template_id": template.get("template_id"),
+            "content": content_hash(template.get("content")),
+            "css": content_hash(template.get("extra_css")),
+            "is_active": template.get("is_active", True),
+        }
+    return entries
+
+
+class SyncAction:
+    """
+    One create, update or deactivation planned by a sync
+
+    Attributes:
+        kind: ``"create"``, ``"update"`` or ``"deactivate"``
+        name: Template name
+        template_id: ID of the remote template (None for creates)
+        payload: Changed fields, as keyword arguments of create/update
+        entry: Manifest entry recorded once the action succeeds
+    """
+
+    __slots__ = ("kind", "name", "template_id", "payload", "entry")
+
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        template_id: Optional[str],
+        payload: Dict[str, Any],
+        entry: Dict[str, Any],
+    ):
+        self.kind = kind
+        self.name = name
+        self.template_id = template_id
+        self.payload = payload
+        self.entry = entry
+
+    def __repr__(self) -> str:
+        return f"SyncAction({self.kind!r}, {self.name!r})"
+
+
+def needs_remote(
+    local: Dict[str, LocalTemplate], entries: Dict[str, Dict[str, Any]]
+) -> bool:
+    """Whether some local template is unknown to the manifest"""
+    return any(not entries.get(name, {}).get("template_id") for name in local)
+
+
+def adopt_remote(
+    local: Dict[str, LocalTemplate],
+    entries: Dict[str, Dict[str, Any]],
+    remote: Dict[str, Dict[str, Any]],
+) -> None:
+    """
+    Take over existing remote templates the manifest does not know yet
+
+    On a first sync, or after the manifest was lost, local templates are
+    matched to remote ones by name instead of being created again.
+    """
+    for name in local:
+        if not entries.get(name, {}).get("template_id") and name in remote:
+            entries[name] = remote[name]
+
+
+def plan_sync(
+    local: Dict[str, LocalTemplate],
+    entries: Dict[str, Dict[str, Any]],
+    deactivate: bool = True,
+) -> Tuple[List[SyncAction], int]:
+    """
+    Compare local templates with the known remote state
+
+    Only fields whose hash changed are sent: a CSS-only edit patches
+    ``extra_css`` and leaves the content alone. Templates in ``entries``
+    whose files were removed are deactivated, never deleted.
+
+    Returns:
+        The actions to run and the number of unchanged templates
+    """
+    actions = []
+    unchanged = 0
+    for name, template in local.items():
+        hashes = template.hashes
+        entry = entries.get(name) or {}
+        if not entry.get("template_id"):
+            payload = {"content": template.content, "extra_css": template.extra_css}
+            new_entry = dict(hashes, is_active=True)
+            actions.append(SyncAction("create", name, None, payload, new_entry))
+            continue
+        payload = {}
+        if entry.get("content") != hashes["content"]:
+            payload["content"] = template.content
+        if entry.get("css") != hashes["css"]:
+            payload["extra_css"] = template.extra_css or ""
+        if not entry.get("is_active", True):
+            payload["is_active"] = True
+        if not payload:
+            unchanged += 1
+            continue
+        new_entry = dict(entry, is_active=True, **hashes)
+        actions.append(
+            SyncAction("update", name, entry["template_id"], payload, new_entry)
+        )
+
+    if deactivate:
+        for name, entry in entries.items():
+            if name in local or not entry.get("template_id"):
+                continue
+            if entry.get("is_active", True):
+                new_entry = dict(entry, is_active=False)
+                actions.append(
+                    SyncAction(
+                        "deactivate",
+                        name,
+                        entry["template_id"],
+                        {"is_active": False},
+                        new_entry,
+                    )
+                )
+    return actions, unchanged
+
+
+class SyncReport:
+    """
+    Outcome of a template sync
+
+    Attributes:
+        created: Names of the templates created
+        updated: Names of the templates patched
+        deactivated: Names of the templates deactivated
+        unchanged: Number of templates left alone
+        errors: Exception by name of each template that failed
+        dry_run: Whether the actions were only planned
+        duration: Wall-clock seconds of the sync
+    """
+
+    def __init__(self, dry_run: bool = False):
+        self.dry_run = dry_run
+        self.created: List[str] = []
+        self.updated: List[str] = []
+        self.deactivated: List[str] = []
+        self.unchanged = 0
+        self.errors: Dict[str, BaseException] = {}
+        self.duration = 0.0
+        self._started = time.perf_counter()
+
+    @property
+    def ok(self) -> bool:
+        """Whether every action succeeded"""
+        return not self.errors
+
+    @property
+    def requests(self) -> int:
+        """Create/update requests sent (or planned, for a dry run)"""
+        return len(self.created) + len(self.updated) + len(self.deactivated)
+
+    def add(self, action: SyncAction) -> None:
+        """Count a successful (or, for a dry run, planned) action"""
+        {
+            "create": self.created,
+            "update": self.updated,
+            "deactivate": self.deactivated,
+        }[action.kind].append(action.name)
+
+    def finish(self) -> None:
+        """Stop the clock"""
+        self.duration = time.perf_counter() - self._started
+
+    def __repr__(self) -> str:
+        return (
+            f"SyncReport(created={len(self.created)}, updated={len(self.updated)}, "
+            f"deactivated={len(self.deactivated)}, unchanged={self.unchanged}, "
+            f"failed={len(self.errors)})"
+        )
+
+
+def record_outcome(
+    report: SyncReport, entries: Dict[str, Dict[str, Any]], outcome: BatchResult
+) -> None:
+    """Apply one action's outcome to the report and manifest entries"""
+    action = outcome.item
+    if not outcome.ok:
+        # The manifest keeps the old entry, so the next sync retries
+        report.errors[action.name] = outcome.error
+        return
+    entries[action.name] = dict(action.entry, template_id=outcome.result)
+    report.add(action)
+
+
+def created_id(response: Dict[str, Any]) -> str:
+    """
+    Template ID from a create response
+
+    Raises:
+        DocstronError: If the response carries no template ID. The sync
+            records the template as failed instead of writing an entry
+            without an ID; the next sync adopts the created template by
+            name.
+    """
+    data = response.get("data") if isinstance(response, dict) else None
+    template_id = data.get("template_id") if isinstance(data, dict) else None
+    if not template_id:
+        raise DocstronError("Create response has no template_id", response=response)
+    return template_id
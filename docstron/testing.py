@@ -0,0 +1,265 @@
+"""
+In-process fake of the Docstron API for tests and benchmarks
+"""
+
+import base64
+import gzip
+import itertools
+import json
+import re
+import threading
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from requests.structures import CaseInsensitiveDict
+
+from .transport import Timeout, Transport, TransportResponse, _encode_params
+
+#: ``(status code, headers, body)`` returned by :meth:`FakeAPI.handle`
+FakeReply = Tuple[int, Dict[str, str], bytes]
+
+_JSON = {"Content-Type": "application/json"}
+_PDF = {"Content-Type": "application/pdf"}
+
+
+def make_pdf(size: int) -> bytes:
+    """A minimal PDF-looking byte string of exactly ``size`` bytes"""
+    header = b"%PDF-1.4\n"
+    trailer = b"\n%%EOF\n"
+    padding = max(size - len(header) - len(trailer), 0)
+    return (header + b"0" * padding + trailer)[: max(size, 0)]
+
+
+def _json_reply(status: int, body: Any) -> FakeReply:
+    return status, dict(_JSON), json.dumps(body).encode("utf-8")
+
+
+def _not_found(kind: str) -> FakeReply:
+    return _json_reply(404, {"success": False, "message": f"{kind} not found"})
+
+
+class FakeAPI:
+    """
+    In-memory stand-in for the Docstron API
+
+    Answers every endpoint the SDK calls with realistically shaped bodies:
+    generation in all response types, offset-paginated lists, downloads,
+    updates, deletes and usage. IDs starting with ``missing`` return 404 and
+    requests without an ``Authorization`` header return 401, so error paths
+    can be exercised too. Nothing touches the network.
+
+    Args:
+        pdf_size: Size in bytes of generated and downloaded PDFs
+            (default: 32 KiB)
+        total_items: Number of documents and templates available to list
+            (default: 1000)
+
+    Example:
+        >>> api = FakeAPI(pdf_size=1024 * 1024)
+        >>> client = Docstron(api_key='test-key', transport=FakeTransport(api))
+        >>> len(client.documents.download('document-1'))
+        1048576
+    """
+
+    def __init__(self, pdf_size: int = 32 * 1024, total_items: int = 1000):
+        self.pdf = make_pdf(pdf_size)
+        self.total_items = total_items
+        self.requests = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._routes = [
+            ("POST", re.compile(r"documents/(quick/)?generate$"), self._generate),
+            ("GET", re.compile(r"documents/download/([^/]+)$"), self._download),
+            ("GET", re.compile(r"(documents|templates|applications)$"), self._list),
+            (
+                "GET",
+                re.compile(r"(documents|templates|applications)/([^/]+)$"),
+                self._get,
+            ),
+            ("PATCH", re.compile(r"(documents|templates)/([^/]+)$"), self._update),
+            ("DELETE", re.compile(r"(documents|templates)/([^/]+)$"), self._delete),
+            ("POST", re.compile(r"(templates)$"), self._create),
+            ("GET", re.compile(r"usage$"), self._usage),
+        ]
+
+    def _next_id(self, kind: str) -> str:
+        with self._lock:
+            return f"{kind}-{next(self._ids):08d}"
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Mapping[str, Any]] = None,
+        body: Any = b"",
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> FakeReply:
+        """
+        Answer one request
+
+        Args:
+            method: HTTP method
+            path: URL path; only its trailing endpoint (e.g.
+                ``documents/generate``) is matched
+            params: Query parameters
+            body: Raw body bytes, or form fields as a mapping
+            headers: Request headers (case-insensitive mapping)
+
+        Returns:
+            ``(status code, headers, body bytes)``
+        """
+        with self._lock:
+            self.requests += 1
+        headers = headers or {}
+        if not headers.get("Authorization"):
+            return _json_reply(401, {"success": False, "message": "Unauthorized"})
+        for route_method, pattern, handler in self._routes:
+            match = pattern.search(path)
+            if route_method == method and match:
+                return handler(match, dict(params or {}), _decode_body(body, headers))
+        return _json_reply(404, {"success": False, "message": "Route not found"})
+
+    def _generate(self, match, params, payload) -> FakeReply:
+        template_id = payload.get("template_id", "")
+        if template_id.startswith("missing"):
+            return _not_found("Template")
+        response_type = payload.get("response_type", "document_id")
+        if response_type == "pdf":
+            return 200, dict(_PDF), self.pdf
+        document = {
+            "document_id": self._next_id("document"),
+            "template_id": template_id or None,
+            "status": "completed",
+        }
+        if response_type == "json_with_base64":
+            document["pdf"] = base64.b64encode(self.pdf).decode("ascii")
+        return _json_reply(200, {"success": True, "data": document})
+
+    def _download(self, match, params, payload) -> FakeReply:
+        if match.group(1).startswith("missing"):
+            return _not_found("Document")
+        return 200, dict(_PDF), self.pdf
+
+    def _list(self, match, params, payload) -> FakeReply:
+        kind = match.group(1)[:-1]
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 100))
+        end = min(offset + limit, self.total_items)
+        items = [self._record(kind, f"{kind}-{i:08d}") for i in range(offset, end)]
+        pagination = {
+            "total": self.total_items,
+            "offset": offset,
+            "limit": limit,
+            "has_more": end < self.total_items,
+        }
+        return _json_reply(
+            200, {"success": True, "data": items, "pagination": pagination}
+        )
+
+    def _record(self, kind: str, item_id: str) -> Dict[str, Any]:
+        return {
+            f"{kind}_id": item_id,
+            "name": f"{kind.title()} {item_id[-4:]}",
+            "status": "completed",
+            "created_at": "2024-12-02T10:15:30.000000Z",
+            "updated_at": "2024-12-02T10:15:30.000000Z",
+        }
+
+    def _get(self, match, params, payload) -> FakeReply:
+        kind, item_id = match.group(1)[:-1], match.group(2)
+        if item_id.startswith("missing"):
+            return _not_found(kind.title())
+        data = self._record(kind, item_id)
+        if kind == "template":
+            data["content"] = "<h1>Invoice {{invoice_number}}</h1><p>{{name}}</p>"
+        return _json_reply(200, {"success": True, "data": data})
+
+    def _update(self, match, params, payload) -> FakeReply:
+        kind, item_id = match.group(1)[:-1], match.group(2)
+        if item_id.startswith("missing"):
+            return _not_found(kind.title())
+        data = self._record(kind, item_id)
+        if kind == "document":
+            data["attributes"] = payload.get("data", {})
+        else:
+            data.update(payload)
+        return _json_reply(200, {"success": True, "data": data})
+
+    def _delete(self, match, params, payload) -> FakeReply:
+        kind, item_id = match.group(1)[:-1], match.group(2)
+        if item_id.startswith("missing"):
+            return _not_found(kind.title())
+        return _json_reply(200, {"success": True, "message": f"{kind} deleted"})
+
+    def _create(self, match, params, payload) -> FakeReply:
+        data = dict(payload, template_id=self._next_id("template"))
+        return _json_reply(200, {"success": True, "data": data})
+
+    def _usage(self, match, params, payload) -> FakeReply:
+        usage = {
+            "subscription": {"plan_name": "Pro", "api_rate_limit": 6000},
+            "usage": {"documents_generated": self.requests},
+        }
+        return _json_reply(200, {"success": True, "data": usage})
+
+
+def _decode_body(body: Any, headers: Mapping[str, str]) -> Dict[str, Any]:
+    """Parse a JSON request body (gzip-compressed or not) or form fields"""
+    if isinstance(body, Mapping):
+        return dict(body)
+    if not body:
+        return {}
+    if headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+class FakeTransport(Transport):
+    """
+    Transport that answers requests from a :class:`FakeAPI` in-process
+
+    Lets the whole client stack (serialization, retries, error handling,
+    streaming) run without a server, e.g. to measure SDK overhead or to
+    test code built on the client.
+
+    Args:
+        api: The fake API to answer from (default: a new FakeAPI), or any
+            callable with the same signature as :meth:`FakeAPI.handle`
+
+    Example:
+        >>> client = Docstron(api_key='test-key', transport=FakeTransport())
+        >>> client.documents.generate('template-123', {'name': 'Acme'})
+        {'success': True, 'data': {'document_id': 'document-00000001', ...}}
+    """
+
+    def __init__(self, api: Optional[Any] = None):
+        super().__init__()
+        self.api = api if api is not None else FakeAPI()
+        self._handle: Callable[..., FakeReply] = getattr(self.api, "handle", self.api)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        data: Any = None,
+        files: Optional[Mapping[str, Any]] = None,
+        timeout: Timeout = None,
+        stream: bool = False,
+    ) -> TransportResponse:
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query))
+        query.update(_encode_params(params))
+        status, reply_headers, body = self._handle(
+            method,
+            parts.path,
+            query,
+            data or b"",
+            CaseInsensitiveDict(self._merge_headers(headers)),
+        )
+        return TransportResponse(status, reply_headers, 0.0, content=body)
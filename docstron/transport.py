@@ -0,0 +1,474 @@
+"""
+Pluggable HTTP transports for the synchronous Docstron client
+"""
+
+import abc
+import os
+import time
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+import requests
+import urllib3
+from requests.structures import CaseInsensitiveDict
+
+from .adapters import DEFAULT_POOL_MAXSIZE, PooledHTTPAdapter, expiring_pool_classes
+
+Timeout = Union[float, Tuple[float, float], None]
+
+#: Chunk size used when a response body is read in full
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class TransportResponse:
+    """
+    Minimal ``requests.Response`` look-alike returned by non-requests transports
+
+    Provides what the client reads: ``status_code``, case-insensitive
+    ``headers``, ``elapsed`` (time until the response headers arrived),
+    ``content``, ``iter_content()`` and ``close()``. A TransportResponse
+    holds a complete body; transports that read the body lazily return a
+    StreamingResponse.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: Mapping[str, str],
+        elapsed: float,
+        content: Optional[bytes] = b"",
+    ):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.elapsed = timedelta(seconds=elapsed)
+        self._content = content
+
+    @property
+    def content(self) -> bytes:
+        """The whole body"""
+        return self._content
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        """Iterate over the body in chunks of up to ``chunk_size`` bytes"""
+        content = self.content
+        for start in range(0, len(content), chunk_size):
+            yield content[start : start + chunk_size]
+
+    def close(self) -> None:
+        """Release the connection back to the pool (or drop it if unread)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class StreamingResponse(TransportResponse, abc.ABC):
+    """
+    TransportResponse whose body is read from the connection on demand
+
+    With ``stream=True`` the body is read lazily and the response must be
+    closed. Subclasses implement ``_read_chunks``.
+    """
+
+    def __init__(self, status_code: int, headers: Mapping[str, str], elapsed: float):
+        super().__init__(status_code, headers, elapsed, content=None)
+
+    @abc.abstractmethod
+    def _read_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        """Read the body from the connection in chunks"""
+
+    @property
+    def content(self) -> bytes:
+        """The whole body, read on first access"""
+        if self._content is None:
+            self._content = b"".join(self._read_chunks(_READ_CHUNK_SIZE))
+        return self._content
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        """Iterate over the body in chunks of up to ``chunk_size`` bytes"""
+        if self._content is not None:
+            yield from super().iter_content(chunk_size)
+            return
+        yield from self._read_chunks(chunk_size)
+
+
+class Transport(abc.ABC):
+    """
+    Interface for sending the client's HTTP requests
+
+    A transport mirrors the small part of ``requests.Session`` the client
+    uses: default ``headers``, ``request()`` and ``close()``. Network failures
+    must be raised as ``requests.ConnectionError`` or ``requests.Timeout`` so
+    retries behave the same whichever transport is used. A
+    ``requests.Session`` itself satisfies this interface and is the default.
+    """
+
+    def __init__(self):
+        self.headers: CaseInsensitiveDict = CaseInsensitiveDict(
+            {"Accept": "*/*", "Accept-Encoding": "gzip, deflate"}
+        )
+
+    @abc.abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        data: Any = None,
+        files: Optional[Mapping[str, Any]] = None,
+        timeout: Timeout = None,
+        stream: bool = False,
+    ) -> TransportResponse:
+        """Send one request; with ``stream=True`` the body is not read yet"""
+
+    def close(self) -> None:
+        """Close pooled connections"""
+
+    def _merge_headers(self, headers: Optional[Mapping[str, str]]) -> Dict[str, str]:
+        merged = dict(self.headers)
+        if headers:
+            merged.update(headers)
+        return merged
+
+
+def _encode_params(params: Optional[Mapping[str, Any]]) -> List[Tuple[str, Any]]:
+    """Query parameters as pairs, dropping None values like requests does"""
+    if not params:
+        return []
+    return [(name, value) for name, value in params.items() if value is not None]
+
+
+def _multipart_fields(
+    data: Optional[Mapping[str, Any]], files: Mapping[str, Any]
+) -> List[Tuple[str, Any]]:
+    """Form fields and files in the tuple format urllib3 encodes"""
+    fields: List[Tuple[str, Any]] = [
+        (name, str(value)) for name, value in (data or {}).items() if value is not None
+    ]
+    for name, value in files.items():
+        if isinstance(value, (tuple, list)):
+            filename, content, *rest = value
+        else:
+            filename = os.path.basename(getattr(value, "name", None) or name)
+            content, rest = value, []
+        if hasattr(content, "read"):
+            content = content.read()
+        fields.append((name, (filename, content, *rest[:1])))
+    return fields
+
+
+def _requests_error(error: urllib3.exceptions.HTTPError) -> requests.RequestException:
+    """Translate a urllib3 error into the requests exception the client expects"""
+    if isinstance(error, urllib3.exceptions.SSLError):
+        return requests.exceptions.SSLError(error)
+    if isinstance(error, urllib3.exceptions.NewConnectionError):
+        return requests.ConnectionError(error)
+    if isinstance(error, urllib3.exceptions.ConnectTimeoutError):
+        return requests.ConnectTimeout(error)
+    if isinstance(error, urllib3.exceptions.ReadTimeoutError):
+        return requests.ReadTimeout(error)
+    return requests.ConnectionError(error)
+
+
+class _Urllib3Response(StreamingResponse):
+    def __init__(self, raw: "urllib3.HTTPResponse", elapsed: float):
+        super().__init__(raw.status, raw.headers, elapsed)
+        self.raw = raw
+        self._consumed = False
+
+    def _read_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        try:
+            yield from self.raw.stream(chunk_size, decode_content=True)
+        except urllib3.exceptions.HTTPError as e:
+            raise _requests_error(e) from e
+        self._consumed = True
+        self.raw.release_conn()
+
+    def close(self) -> None:
+        if not self._consumed:
+            # An unread body would corrupt the next request on the socket
+            self.raw.close()
+        self.raw.release_conn()
+
+
+class Urllib3Transport(Transport):
+    """
+    Lean transport calling urllib3's connection pool directly
+
+    Skips the per-request work of ``requests.Session`` (hooks, cookie jars,
+    environment proxy lookup and header merging through several layers)
+    while keeping the same pooling options. Redirects are not followed.
+
+    Args:
+        pool_connections: Number of per-host pools to cache
+        pool_maxsize: Maximum connections kept open per host
+        pool_block: Wait for a free connection when the pool is exhausted
+        keepalive_expiry: Close a pooled connection idle for longer than
+            this many seconds instead of reusing it; None keeps connections
+            open indefinitely
+        **pool_kwargs: Extra arguments for ``urllib3.PoolManager``
+            (e.g. ``ca_certs``)
+
+    Example:
+        >>> client = Docstron(api_key='your-api-key', transport='urllib3')
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keepalive_expiry: Optional[float] = None,
+        **pool_kwargs: Any,
+    ):
+        super().__init__()
+        self.keepalive_expiry = keepalive_expiry
+        self.pool = urllib3.PoolManager(
+            num_pools=pool_connections,
+            maxsize=pool_maxsize,
+            block=pool_block,
+            **pool_kwargs,
+        )
+        if keepalive_expiry is not None:
+            self.pool.pool_classes_by_scheme = expiring_pool_classes(keepalive_expiry)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        data: Any = None,
+        files: Optional[Mapping[str, Any]] = None,
+        timeout: Timeout = None,
+        stream: bool = False,
+    ) -> TransportResponse:
+        query = _encode_params(params)
+        if query:
+            url += ("&" if "?" in url else "?") + urlencode(query, doseq=True)
+        merged = self._merge_headers(headers)
+        body = data
+        if files:
+            body, merged["Content-Type"] = urllib3.encode_multipart_formdata(
+                _multipart_fields(data, files)
+            )
+        elif isinstance(data, Mapping):
+            body = urlencode(_encode_params(data), doseq=True)
+            merged["Content-Type"] = "application/x-www-form-urlencoded"
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+        else:
+            connect = read = timeout
+
+        started = time.perf_counter()
+        try:
+            raw = self.pool.request(
+                method,
+                url,
+                body=body,
+                headers=merged,
+                timeout=urllib3.Timeout(connect=connect, read=read),
+                preload_content=False,
+                decode_content=True,
+                redirect=False,
+                retries=False,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            raise _requests_error(e) from e
+        response = _Urllib3Response(raw, time.perf_counter() - started)
+        if not stream:
+            response.content
+        return response
+
+    def close(self) -> None:
+        self.pool.clear()
+
+
+class _HTTPXResponse(StreamingResponse):
+    def __init__(self, response: Any, elapsed: float, translate):
+        super().__init__(response.status_code, response.headers, elapsed)
+        self._response = response
+        self._translate = translate
+
+    def _read_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except Exception as e:
+            error = self._translate(e)
+            if error is None:
+                raise
+            raise error from e
+        finally:
+            self._response.close()
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class HTTP2Transport(Transport):
+    """
+    HTTP/2 transport multiplexing concurrent requests over one connection
+
+    Threads sharing the client send their requests as streams on a single
+    TLS connection instead of holding one pooled connection each, which
+    suits many concurrent renders against the API. Backed by ``httpx`` with
+    ``h2`` (``pip install docstron[http2]``); servers without HTTP/2 support
+    are spoken to over HTTP/1.1.
+
+    Args:
+        pool_maxsize: Maximum connections kept open (default: 10)
+        keepalive_expiry: Seconds an idle connection may be reused
+            (default: 5.0)
+        http_client: Optional pre-configured ``httpx.Client`` to use
+
+    Example:
+        >>> client = Docstron(api_key='your-api-key', transport='http2')
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keepalive_expiry: Optional[float] = 5.0,
+        http_client: Optional[Any] = None,
+    ):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "The HTTP/2 transport requires httpx and h2. "
+                "Install them with: pip install docstron[http2]"
+            ) from None
+
+        super().__init__()
+        self._httpx = httpx
+        if http_client is None:
+            try:
+                http_client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=pool_maxsize,
+                        max_keepalive_connections=pool_maxsize,
+                        keepalive_expiry=keepalive_expiry,
+                    ),
+                    timeout=None,
+                )
+            except ImportError:
+                raise ImportError(
+                    "The HTTP/2 transport requires h2. "
+                    "Install it with: pip install docstron[http2]"
+                ) from None
+        self.client = http_client
+
+    def _requests_error(self, error: Exception) -> Optional[requests.RequestException]:
+        """Translate an httpx error into a requests one (None if unrelated)"""
+        httpx = self._httpx
+        if isinstance(error, httpx.ConnectTimeout):
+            return requests.ConnectTimeout(error)
+        if isinstance(error, httpx.TimeoutException):
+            return requests.ReadTimeout(error)
+        if isinstance(error, httpx.TransportError):
+            return requests.ConnectionError(error)
+        return None
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        data: Any = None,
+        files: Optional[Mapping[str, Any]] = None,
+        timeout: Timeout = None,
+        stream: bool = False,
+    ) -> TransportResponse:
+        httpx = self._httpx
+        merged = self._merge_headers(headers)
+        body: Dict[str, Any] = {}
+        if files or isinstance(data, Mapping):
+            # httpx sets the multipart boundary or form content type itself
+            merged.pop("Content-Type", None)
+            body = {"data": data, "files": files}
+        elif data is not None:
+            body = {"content": data}
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        request = self.client.build_request(
+            method,
+            url,
+            params=_encode_params(params),
+            headers=merged,
+            timeout=httpx.Timeout(timeout),
+            **body,
+        )
+
+        started = time.perf_counter()
+        try:
+            sent = self.client.send(request, stream=True)
+        except httpx.TransportError as e:
+            raise self._requests_error(e) from e
+        response = _HTTPXResponse(
+            sent, time.perf_counter() - started, self._requests_error
+        )
+        if not stream:
+            response.content
+        return response
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def build_transport(
+    transport: Union[Transport, requests.Session, str, None] = None,
+    pool_connections: int = 10,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = False,
+    keepalive_expiry: Optional[float] = None,
+) -> Union[Transport, requests.Session]:
+    """
+    Build a client's transport from its ``transport`` option
+
+    Args:
+        transport: ``"requests"`` (or None) for a pooled ``requests.Session``,
+            ``"urllib3"`` for :class:`Urllib3Transport`, ``"http2"`` for
+            :class:`HTTP2Transport`, or a ready-made transport or session
+        pool_connections: Number of per-host pools to cache
+        pool_maxsize: Maximum connections kept open per host
+        pool_block: Wait for a free connection when the pool is exhausted
+        keepalive_expiry: Seconds an idle pooled connection may be reused;
+            None leaves the transport's own default
+
+    Returns:
+        An object with ``headers``, ``request()`` and ``close()``
+    """
+    if transport is None or transport == "requests":
+        session = requests.Session()
+        adapter = PooledHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keepalive_expiry=keepalive_expiry,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    if transport == "urllib3":
+        return Urllib3Transport(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keepalive_expiry=keepalive_expiry,
+        )
+    if transport == "http2":
+        if keepalive_expiry is None:
+            return HTTP2Transport(pool_maxsize=pool_maxsize)
+        return HTTP2Transport(
+            pool_maxsize=pool_maxsize, keepalive_expiry=keepalive_expiry
+        )
+    if isinstance(transport, str):
+        raise ValueError(f"Unsupported transport: {transport!r}")
+    return transport
@@ -37,12 +37,28 @@ setup(
         "requests>=2.25.0",
     ],
     extras_require={
+        "async": [
+            "httpx>=0.23.0",
+        ],
+        "zstd": [
+            "zstandard>=0.18.0",
+        ],
+        "http2": [
+            "httpx[http2]>=0.23.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=3.0.0",
+            "pytest-benchmark>=4.0.0",
             "black>=22.0.0",
             "flake8>=4.0.0",
             "mypy>=0.950",
+            "httpx>=0.23.0",
+        ],
+    },
+    entry_points={
+        "console_scripts": [
+            "docstron=docstron.cli:main",
         ],
     },
     keywords="docstron pdf generation api sdk document",
@@ -27,3 +27,24 @@ def mock_template_id():
 def mock_document_id():
     """Fixture for mock document ID"""
     return 'document-517145ce-5a09-4e47-a257-887e239ecb36'
+
+
+@pytest.fixture
+def make_response():
+    """Fixture returning a factory for fake ``requests.Response`` objects"""
+    import io
+    import json
+
+    import requests
+
+    def factory(status_code=200, json_body=None, content=b'', headers=None):
+        response = requests.Response()
+        response.status_code = status_code
+        if json_body is not None:
+            content = json.dumps(json_body).encode('utf-8')
+            response.headers['Content-Type'] = 'application/json'
+        response.headers.update(headers or {})
+        response.raw = io.BytesIO(content)
+        return response
+
+    return factory
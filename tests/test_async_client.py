@@ -0,0 +1,150 @@
+"""
+Unit tests for the asynchronous Docstron client
+"""
+
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip('httpx')
+
+from docstron import AsyncDocstron
+from docstron.exceptions import NotFoundError
+from docstron.resources import (
+    AsyncApplications,
+    AsyncTemplates,
+    AsyncDocuments,
+    AsyncUsage,
+)
+
+
+def make_client(handler):
+    """Build an AsyncDocstron whose requests are answered by ``handler``"""
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncDocstron(api_key='test-key', http_client=http_client)
+
+
+class TestAsyncDocstronClient:
+    """Test the asynchronous Docstron client"""
+
+    def test_client_resources(self):
+        """Test that all async resources are initialized"""
+        client = AsyncDocstron(api_key='test-key')
+        assert isinstance(client.applications, AsyncApplications)
+        assert isinstance(client.templates, AsyncTemplates)
+        assert isinstance(client.documents, AsyncDocuments)
+        assert isinstance(client.usage, AsyncUsage)
+        assert client.session.headers['Authorization'] == 'Bearer test-key'
+        asyncio.run(client.aclose())
+
+    def test_generate_sends_payload(self, mock_template_id):
+        """Test that generate posts the JSON payload and returns the response"""
+        seen = {}
+
+        def handler(request):
+            seen['url'] = str(request.url)
+            seen['body'] = json.loads(request.content)
+            return httpx.Response(200, json={'data': {'document_id': 'doc-1'}})
+
+        async def run():
+            async with make_client(handler) as client:
+                return await client.documents.generate(
+                    template_id=mock_template_id, data={'name': 'Test'}
+                )
+
+        result = asyncio.run(run())
+        assert result == {'data': {'document_id': 'doc-1'}}
+        assert seen['url'] == 'https://api.docstron.com/v1/documents/generate'
+        assert seen['body']['template_id'] == mock_template_id
+        assert seen['body']['response_type'] == 'document_id'
+
+    def test_generate_pdf_returns_bytes(self, mock_template_id):
+        """Test that pdf responses are returned as raw bytes"""
+
+        def handler(request):
+            return httpx.Response(200, content=b'%PDF-1.7')
+
+        async def run():
+            async with make_client(handler) as client:
+                return await client.documents.generate(
+                    template_id=mock_template_id, data={}, response_type='pdf'
+                )
+
+        assert asyncio.run(run()) == b'%PDF-1.7'
+
+    def test_error_mapping(self, mock_template_id):
+        """Test that error status codes raise the matching exception"""
+
+        def handler(request):
+            return httpx.Response(404, json={'message': 'Template not found'})
+
+        async def run():
+            async with make_client(handler) as client:
+                await client.templates.get(mock_template_id)
+
+        with pytest.raises(NotFoundError) as exc_info:
+            asyncio.run(run())
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.message == 'Template not found'
+
+    def test_generate_many(self, mock_template_id):
+        """Test that generate_many yields per-item results in input order"""
+
+        def handler(request):
+            body = json.loads(request.content)
+            if body['data']['n'] == 1:
+                return httpx.Response(422, json={'message': 'Invalid data'})
+            return httpx.Response(200, json={'data': {'n': body['data']['n']}})
+
+        async def run():
+            async with make_client(handler) as client:
+                return [
+                    outcome
+                    async for outcome in client.documents.generate_many(
+                        mock_template_id, [{'n': n} for n in range(4)], concurrency=2
+                    )
+                ]
+
+        results = asyncio.run(run())
+        assert [r.index for r in results] == [0, 1, 2, 3]
+        assert [r.ok for r in results] == [True, False, True, True]
+        assert results[3].result == {'data': {'n': 3}}
+
+    def test_download_stream(self, mock_document_id):
+        """Test that stream=True writes the PDF to the destination in chunks"""
+        import io
+
+        def handler(request):
+            return httpx.Response(200, content=b'%PDF-1.7' * 1000)
+
+        async def run(buffer):
+            async with make_client(handler) as client:
+                return await client.documents.download(
+                    mock_document_id, output_path=buffer, stream=True, chunk_size=512
+                )
+
+        buffer = io.BytesIO()
+        assert asyncio.run(run(buffer)) == 8000
+        assert buffer.getvalue() == b'%PDF-1.7' * 1000
+
+    def test_throttled_request_retried(self):
+        """Test that 429 responses are retried using Retry-After"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={'Retry-After': '0'}, json={})
+            return httpx.Response(200, json={'data': {'plan_name': 'Pro'}})
+
+        async def run():
+            async with make_client(handler) as client:
+                return await client.usage.get()
+
+        assert asyncio.run(run()) == {'data': {'plan_name': 'Pro'}}
+        assert len(calls) == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,213 @@
+"""
+Unit tests for resumable batch generation and its checkpoint journal
+"""
+
+import json
+
+import pytest
+from docstron import Docstron
+from docstron.batch import MANIFEST_NAME, _filename, read_rows, run_batch
+from docstron.cli import main
+from docstron.journal import CheckpointJournal
+from docstron.mock_server import MockServer
+from docstron.testing import FakeAPI, FakeTransport
+
+
+def write_jsonl(path, rows):
+    """Write ``rows`` as JSON Lines"""
+    path.write_text(''.join(json.dumps(row) + '\n' for row in rows))
+    return path
+
+
+def manifest(output_dir):
+    """Entries of a batch manifest"""
+    lines = (output_dir / MANIFEST_NAME).read_text().splitlines()
+    return [json.loads(line) for line in lines]
+
+
+@pytest.fixture
+def client():
+    """Client answered in-process by a fake API with small PDFs"""
+    return Docstron(api_key='test-key', transport=FakeTransport(FakeAPI(pdf_size=64)))
+
+
+class TestReadRows:
+    """Test streaming rows from input files"""
+
+    def test_jsonl(self, tmp_path):
+        """Test that blank lines are skipped and rows numbered from 1"""
+        source = tmp_path / 'rows.jsonl'
+        source.write_text('{"name": "a"}\n\n{"name": "b"}\n')
+        assert list(read_rows(source)) == [(1, {'name': 'a'}), (2, {'name': 'b'})]
+
+    def test_csv(self, tmp_path):
+        """Test that CSV rows are keyed by the header"""
+        source = tmp_path / 'rows.csv'
+        source.write_text('\ufeffid,name\n1,Acme\n2,Globex\n')
+        assert list(read_rows(source))[1] == (2, {'id': '2', 'name': 'Globex'})
+
+    def test_invalid_line(self, tmp_path):
+        """Test that bad JSON reports its line number"""
+        source = tmp_path / 'rows.jsonl'
+        source.write_text('{"name": "a"}\n[1, 2]\n')
+        with pytest.raises(ValueError, match='Line 2'):
+            list(read_rows(source))
+
+    def test_unknown_extension(self, tmp_path):
+        """Test that the format must be known"""
+        with pytest.raises(ValueError):
+            list(read_rows(tmp_path / 'rows.xlsx'))
+
+
+class TestCheckpointJournal:
+    """Test the append-only journal"""
+
+    def test_reopen_restores_completed(self, tmp_path):
+        """Test that completed keys survive reopening and retries succeed"""
+        path = tmp_path / 'journal.jsonl'
+        with CheckpointJournal(path) as journal:
+            journal.record('a', file='a.pdf')
+            journal.record('b', error='boom')
+        with CheckpointJournal(path) as journal:
+            assert journal.is_done('a')
+            assert not journal.is_done('b')
+            journal.record('b')
+        assert CheckpointJournal(path).completed == 2
+
+    def test_truncated_line_ignored(self, tmp_path):
+        """Test that a line cut short by a crash is skipped"""
+        path = tmp_path / 'journal.jsonl'
+        path.write_text('{"key": "a", "status": "ok"}\n{"key": "b", "sta')
+        with CheckpointJournal(path) as journal:
+            assert journal.completed == 1
+            journal.record('c')
+        assert CheckpointJournal(path).is_done('c')
+
+
+class TestRunBatch:
+    """Test bulk generation"""
+
+    def test_writes_pdfs_and_manifest(self, client, tmp_path):
+        """Test that every row gets a PDF named by its key"""
+        source = write_jsonl(
+            tmp_path / 'rows.jsonl', [{'id': f'cust/{i}'} for i in range(5)]
+        )
+        out = tmp_path / 'out'
+        report = run_batch(client, 'template-1', source, out, key_field='id')
+
+        assert (report.rows, report.succeeded, report.failed) == (5, 5, 0)
+        entries = {entry['key']: entry for entry in manifest(out)}
+        filename = entries['cust/3']['file']
+        assert filename.startswith('cust_3-') and filename.endswith('.pdf')
+        assert (out / filename).read_bytes().startswith(b'%PDF')
+        assert not list(out.glob('*.part'))
+        assert entries['cust/3']['bytes'] == 64
+
+    def test_document_ids(self, client, tmp_path):
+        """Test recording document IDs without writing files"""
+        source = write_jsonl(tmp_path / 'rows.jsonl', [{'n': 1}, {'n': 2}])
+        out = tmp_path / 'out'
+        run_batch(client, 'template-1', source, out, response_type='document_id')
+        assert all(e['document_id'].startswith('document-') for e in manifest(out))
+        assert [p.name for p in out.iterdir()] == [MANIFEST_NAME]
+
+    def test_resume_after_crash(self, client, tmp_path):
+        """Test that a rerun generates only the rows left unfinished"""
+        source = write_jsonl(tmp_path / 'rows.jsonl', [{'n': i} for i in range(20)])
+        out = tmp_path / 'out'
+
+        def crash(report):
+            if report.succeeded == 7:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            run_batch(client, 'template-1', source, out, concurrency=4, progress=crash)
+        sent = client.session.api.requests
+
+        report = run_batch(client, 'template-1', source, out, concurrency=4)
+        assert report.skipped == 7
+        assert report.succeeded == 13
+        # rows in flight at the crash may be generated twice, never more
+        assert client.session.api.requests - sent <= 13 + 4
+        assert len(list(out.glob('*.pdf'))) == 20
+
+    def test_failed_rows_retried(self, client, tmp_path):
+        """Test that failures are recorded and retried by the next run"""
+        source = write_jsonl(tmp_path / 'rows.jsonl', [{'n': 1}])
+        out = tmp_path / 'out'
+        report = run_batch(client, 'missing-template', source, out)
+        assert report.errors == {'NotFoundError': 1}
+        assert manifest(out)[0]['status'] == 'error'
+
+        report = run_batch(client, 'template-1', source, out)
+        assert (report.skipped, report.succeeded) == (0, 1)
+
+    def test_missing_key(self, client, tmp_path):
+        """Test that rows without the key field fail without stopping the run"""
+        source = write_jsonl(tmp_path / 'rows.jsonl', [{'name': 'Acme'}, {'id': 'c2'}])
+        out = tmp_path / 'out'
+        report = run_batch(client, 'template-1', source, out, key_field='id')
+        assert (report.succeeded, report.failed) == (1, 1)
+        failed = next(e for e in manifest(out) if e['status'] == 'error')
+        assert (failed['key'], failed['type']) == ('row-1', 'ValueError')
+        assert "'id'" in failed['error']
+
+    def test_malformed_lines_fail(self, client, tmp_path):
+        """Test that bad JSON lines are recorded as failed rows"""
+        source = tmp_path / 'rows.jsonl'
+        source.write_text('{"n": 1}\n{oops\n[1]\n{"n": 4}\n')
+        out = tmp_path / 'out'
+        report = run_batch(client, 'template-1', source, out)
+        assert (report.rows, report.succeeded, report.failed) == (4, 2, 2)
+        errors = {e['key']: e['error'] for e in manifest(out) if e['status'] == 'error'}
+        assert sorted(errors) == ['row-2', 'row-3']
+        assert errors['row-2'].startswith('Line 2: invalid JSON')
+        assert (out / 'row-4.pdf').exists()
+
+    def test_unsafe_keys_do_not_collide(self):
+        """Test that keys mapping to the same safe name get distinct files"""
+        assert _filename('c1') == 'c1.pdf'
+        assert _filename('a/b') != _filename('a_b') == 'a_b.pdf'
+        assert _filename('a/b') == _filename('a/b')
+        assert _filename('../..').endswith('.pdf')
+
+
+class TestBatchCommand:
+    """Test ``docstron batch``"""
+
+    def test_csv_against_mock_server(self, tmp_path, capsys, monkeypatch):
+        """Test a CSV run end to end, taking the key from the environment"""
+        source = tmp_path / 'customers.csv'
+        source.write_text('id,name\nc1,Acme\nc2,Globex\n')
+        monkeypatch.setenv('DOCSTRON_API_KEY', 'test-key')
+        with MockServer() as server:
+            args = ['batch', str(source), '-t', 'template-1', '-o', str(tmp_path)]
+            code = main(args + ['--url', server.url, '--key-field', 'id'])
+        assert code == 0
+        assert (tmp_path / 'c2.pdf').exists()
+        assert '2 rows: 2 generated' in capsys.readouterr().out
+
+    def test_failures_set_exit_code(self, tmp_path, capsys):
+        """Test that failed rows make the command exit non-zero"""
+        source = write_jsonl(tmp_path / 'rows.jsonl', [{'n': 1}])
+        with MockServer() as server:
+            code = main(
+                [
+                    'batch',
+                    str(source),
+                    '-t',
+                    'missing-template',
+                    '-o',
+                    str(tmp_path / 'out'),
+                    '--url',
+                    server.url,
+                    '--api-key',
+                    'test-key',
+                ]
+            )
+        assert code == 1
+        assert 'NotFoundError 1' in capsys.readouterr().out
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
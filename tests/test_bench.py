@@ -0,0 +1,137 @@
+"""
+Unit tests for the mock server and the bench command
+"""
+
+import json
+
+import pytest
+from docstron import Docstron
+from docstron.bench import percentile, run_bench
+from docstron.cli import main
+from docstron.exceptions import RateLimitError, ServerError
+from docstron.mock_server import MockServer, ServerProfile
+
+
+class TestServerProfile:
+    """Test mock server profiles"""
+
+    def test_copy_overrides(self):
+        """Test that overrides replace only the given settings"""
+        profile = ServerProfile(latency=0.2, error_rate=0.1).copy(
+            latency=0.05, jitter=None
+        )
+        assert (profile.latency, profile.error_rate, profile.jitter) == (
+            0.05,
+            0.1,
+            0.0,
+        )
+
+    def test_rates_validated(self):
+        """Test that failure rates cannot exceed one"""
+        with pytest.raises(ValueError):
+            ServerProfile(error_rate=0.6, throttle_rate=0.6)
+
+
+class TestMockServer:
+    """Test the mock HTTP server"""
+
+    def test_serves_fake_api(self):
+        """Test that the client works against the mock server"""
+        with MockServer() as server:
+            client = Docstron(api_key='test-key', base_url=server.url)
+            created = client.documents.generate('template-1', {'name': 'Acme'})
+            pdf = client.documents.download(created['data']['document_id'])
+        assert pdf.startswith(b'%PDF')
+        assert server.statuses[200] == 2
+
+    def test_errors_and_throttling(self):
+        """Test that profile failure rates produce 500s and 429s"""
+        with MockServer(ServerProfile(error_rate=1.0)) as server:
+            client = Docstron(api_key='test-key', base_url=server.url, max_retries=0)
+            with pytest.raises(ServerError):
+                client.usage.get()
+        with MockServer(ServerProfile(throttle_rate=1.0, retry_after=7)) as server:
+            client = Docstron(api_key='test-key', base_url=server.url, max_retries=0)
+            with pytest.raises(RateLimitError) as excinfo:
+                client.usage.get()
+        assert excinfo.value.retry_after == 7
+
+
+class TestRunBench:
+    """Test load generation"""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        values = [i / 100 for i in range(1, 101)]
+        assert percentile(values, 50) == 0.5
+        assert percentile(values, 99) == 0.99
+        assert percentile([], 50) is None
+
+    def test_threads(self):
+        """Test a threaded run counting calls, retries and errors"""
+        profile = ServerProfile(error_rate=0.2, throttle_rate=0.2, seed=3)
+        with MockServer(profile) as server:
+            result = run_bench(server.url, requests=50, concurrency=4, max_retries=1)
+        assert result.calls == 50
+        assert result.succeeded + sum(result.errors.values()) == 50
+        assert set(result.errors) <= {'ServerError', 'RateLimitError'}
+        assert sum(result.attempts.values()) == sum(server.statuses.values())
+        assert result.attempts['429'] > 0
+        assert result.as_dict()['latency']['p99'] >= result.as_dict()['latency']['p50']
+
+    def test_async(self):
+        """Test an async run"""
+        pytest.importorskip('httpx')
+        with MockServer() as server:
+            result = run_bench(
+                server.url, operation='list', requests=20, concurrency=5, mode='async'
+            )
+        assert result.succeeded == 20
+        assert result.attempts == {'200': 20}
+
+    def test_unknown_operation(self):
+        """Test that unknown operations are rejected"""
+        with pytest.raises(ValueError):
+            run_bench('http://127.0.0.1:9/v1', operation='print-money')
+
+
+class TestCLI:
+    """Test the docstron command"""
+
+    def test_bench_json(self, capsys):
+        """Test that bench starts a mock server and prints JSON results"""
+        code = main(
+            [
+                'bench',
+                '-n',
+                '20',
+                '-c',
+                '4',
+                '--operation',
+                'generate-pdf',
+                '--pdf-size',
+                '2048',
+                '--json',
+            ]
+        )
+        assert code == 0
+        result = json.loads(capsys.readouterr().out)
+        assert result['operation'] == 'generate-pdf'
+        assert result['succeeded'] == 20
+        assert result['throughput'] > 0
+
+    def test_bench_report(self, capsys):
+        """Test the human-readable report"""
+        main(['bench', '-n', '10', '-c', '2', '--transport', 'urllib3'])
+        out = capsys.readouterr().out
+        assert 'throughput' in out
+        assert 'p95' in out
+
+    def test_requires_command(self):
+        """Test that a subcommand is required"""
+        with pytest.raises(SystemExit):
+            main([])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,109 @@
+"""
+Unit tests for the metadata cache
+"""
+
+import time
+from unittest import mock
+
+import pytest
+from docstron import Docstron
+from docstron.cache import TTLCache
+from docstron.exceptions import NotFoundError
+
+
+class TestTTLCache:
+    """Test the TTL + LRU cache"""
+
+    def test_hit_and_miss_counters(self):
+        """Test that hits and misses are counted"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        assert cache.get('a') is None
+        cache.set('a', {'n': 1})
+        assert cache.get('a') == {'n': 1}
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        cache = TTLCache(maxsize=2, ttl=None)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert 'a' in cache and 'c' in cache
+        assert 'b' not in cache
+        assert cache.evictions == 1
+
+    def test_expiry(self):
+        """Test that entries expire after the TTL"""
+        cache = TTLCache(ttl=0.01)
+        cache.set('a', 1)
+        time.sleep(0.02)
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+    def test_values_are_copied(self):
+        """Test that mutating a returned value does not change the cache"""
+        cache = TTLCache()
+        cache.set('a', {'data': {'name': 'Invoice'}})
+        cache.get('a')['data']['name'] = 'Changed'
+        assert cache.get('a') == {'data': {'name': 'Invoice'}}
+
+
+class TestResourceCaching:
+    """Test caching in the templates and applications resources"""
+
+    def test_cache_disabled_by_default(self):
+        """Test that resources do not cache unless configured"""
+        client = Docstron(api_key='test-key')
+        assert client.templates.cache is None
+        assert client.applications.cache is None
+
+    def test_templates_get_cached(self, make_response, mock_template_id):
+        """Test that repeated gets are served from cache"""
+        client = Docstron(api_key='test-key', metadata_cache_ttl=60)
+        response = make_response(json_body={'data': {'is_active': True}})
+        with mock.patch.object(
+            client.session, 'request', return_value=response
+        ) as request:
+            client.templates.get(mock_template_id)
+            assert client.templates.get(mock_template_id) == {
+                'data': {'is_active': True}
+            }
+        assert request.call_count == 1
+        assert client.templates.cache.stats()['hits'] == 1
+
+    def test_update_invalidates(self, make_response, mock_template_id):
+        """Test that updates through the client invalidate the entry"""
+        client = Docstron(api_key='test-key', metadata_cache_ttl=60)
+        client.templates.cache.set(mock_template_id, {'data': {'is_active': True}})
+        with mock.patch.object(
+            client.session, 'request', return_value=make_response(json_body={})
+        ):
+            client.templates.update(mock_template_id, is_active=False)
+        assert mock_template_id not in client.templates.cache
+
+    def test_failed_delete_invalidates(self, make_response, mock_template_id):
+        """Test that a 404 on delete still drops the cached entry"""
+        client = Docstron(api_key='test-key', metadata_cache_ttl=60)
+        client.templates.cache.set(mock_template_id, {'data': {}})
+        response = make_response(404, json_body={'message': 'Not found'})
+        with mock.patch.object(client.session, 'request', return_value=response):
+            with pytest.raises(NotFoundError):
+                client.templates.delete(mock_template_id)
+        assert mock_template_id not in client.templates.cache
+
+    def test_applications_get_cached(self, make_response, mock_app_id):
+        """Test that application lookups are cached"""
+        client = Docstron(api_key='test-key', metadata_cache_ttl=60)
+        response = make_response(json_body={'data': {'name': 'App'}})
+        with mock.patch.object(
+            client.session, 'request', return_value=response
+        ) as request:
+            client.applications.get(mock_app_id)
+            client.applications.get(mock_app_id)
+        assert request.call_count == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -2,8 +2,12 @@
 Unit tests for the Docstron client
 """
 
+import time
+from unittest import mock
+
 import pytest
 from docstron import Docstron
+from docstron.adapters import PooledHTTPAdapter
 from docstron.resources import Applications, Templates, Documents, Usage
 
 
@@ -37,5 +41,59 @@ class TestDocstronClient:
         assert client.session.headers['Content-Type'] == 'application/json'
 
 
+class TestConnectionPool:
+    """Test connection pool and timeout options"""
+
+    def test_default_pool(self):
+        """Test that the pooled adapter is mounted with default sizes"""
+        client = Docstron(api_key='test-key')
+        adapter = client.session.get_adapter('https://api.docstron.com/v1/usage')
+        assert isinstance(adapter, PooledHTTPAdapter)
+        assert adapter._pool_maxsize == 10
+        assert adapter._pool_block is False
+
+    def test_custom_pool(self):
+        """Test that pool options reach the adapter"""
+        client = Docstron(
+            api_key='test-key', pool_maxsize=64, pool_block=True, keepalive_expiry=30
+        )
+        adapter = client.session.get_adapter('https://api.docstron.com/v1/usage')
+        assert adapter._pool_maxsize == 64
+        assert adapter._pool_block is True
+        assert adapter.keepalive_expiry == 30
+
+    def test_default_timeout_applied(self, make_response):
+        """Test that the client timeout is sent with every request"""
+        client = Docstron(api_key='test-key', timeout=(3.05, 60))
+        with mock.patch.object(
+            client.session, 'request', return_value=make_response(json_body={})
+        ) as request:
+            client.usage.get()
+        assert request.call_args.kwargs['timeout'] == (3.05, 60)
+
+    def test_idle_connections_expire(self):
+        """Test that only a connection idle past keepalive_expiry is closed"""
+        adapter = PooledHTTPAdapter(keepalive_expiry=30)
+        pool = adapter.poolmanager.connection_from_url('https://api.example.com')
+        idle, fresh = pool._get_conn(), pool._get_conn()
+        pool._put_conn(idle)
+        pool._put_conn(fresh)
+        idle._docstron_released = time.monotonic() - 60
+        dropped = mock.patch(
+            'urllib3.connectionpool.is_connection_dropped', return_value=False
+        )
+        with dropped, mock.patch.object(idle, 'close') as close_idle:
+            with mock.patch.object(fresh, 'close') as close_fresh:
+                assert {pool._get_conn(), pool._get_conn()} == {idle, fresh}
+        close_idle.assert_called_once()
+        close_fresh.assert_not_called()
+
+    def test_connections_kept_without_expiry(self):
+        """Test that pools are plain urllib3 pools without keepalive_expiry"""
+        adapter = PooledHTTPAdapter()
+        pool = adapter.poolmanager.connection_from_url('https://api.example.com')
+        assert not hasattr(pool, 'keepalive_expiry')
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,108 @@
+"""
+Unit tests for pluggable JSON codecs
+"""
+
+import json
+import sys
+from unittest import mock
+
+import pytest
+from docstron import Docstron, JSONCodec
+from docstron.codec import get_codec
+from docstron.exceptions import ServerError
+
+PAYLOAD = {'customer': 'Acme Corp', 'items': [{'sku': 'A-1', 'qty': 2}], 'ok': True}
+
+
+class CountingCodec(JSONCodec):
+    """Stdlib codec that records how often it is used"""
+
+    name = 'counting'
+
+    def __init__(self):
+        self.dumped = 0
+        self.loaded = 0
+
+    def dumps(self, obj):
+        self.dumped += 1
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.loaded += 1
+        return super().loads(data)
+
+
+class TestGetCodec:
+    """Test resolving the json_codec option"""
+
+    def test_default_is_stdlib(self):
+        """Test that None selects the standard library codec"""
+        codec = get_codec(None)
+        assert type(codec) is JSONCodec
+        assert codec.loads(codec.dumps(PAYLOAD)) == PAYLOAD
+
+    def test_instance_passthrough(self):
+        """Test that codec instances are used as given"""
+        codec = CountingCodec()
+        assert get_codec(codec) is codec
+
+    def test_unknown_name(self):
+        """Test that unknown codec names are rejected"""
+        with pytest.raises(ValueError):
+            get_codec('yaml')
+
+    def test_missing_library(self):
+        """Test that a named but missing library raises ImportError"""
+        with mock.patch.dict(sys.modules, {'msgspec': None}):
+            with pytest.raises(ImportError, match='pip install msgspec'):
+                get_codec('msgspec')
+
+    def test_auto_falls_back_to_stdlib(self):
+        """Test that auto uses the stdlib when no fast library is installed"""
+        with mock.patch.dict(sys.modules, {'orjson': None, 'msgspec': None}):
+            assert type(get_codec('auto')) is JSONCodec
+
+    def test_stdlib_rejects_nan(self):
+        """Test that the stdlib codec refuses NaN like requests does"""
+        with pytest.raises(ValueError):
+            JSONCodec().dumps({'n': float('nan')})
+
+    @pytest.mark.parametrize('name', ['orjson', 'msgspec'])
+    def test_fast_codecs_round_trip(self, name):
+        """Test that optional codecs round-trip and raise ValueError"""
+        pytest.importorskip(name)
+        codec = get_codec(name)
+        assert json.loads(codec.dumps(PAYLOAD)) == PAYLOAD
+        assert codec.loads(json.dumps(PAYLOAD).encode('utf-8')) == PAYLOAD
+        with pytest.raises(ValueError):
+            codec.loads(b'{not json')
+
+
+class TestClientCodec:
+    """Test that clients use the codec for both directions"""
+
+    def test_encodes_and_decodes(self, make_response):
+        """Test that request bodies and responses go through the codec"""
+        codec = CountingCodec()
+        client = Docstron(api_key='test-key', json_codec=codec)
+        response = make_response(json_body={'data': {'document_id': 'doc-1'}})
+        with mock.patch.object(
+            client.session, 'request', return_value=response
+        ) as request:
+            result = client.post('documents/generate', data=PAYLOAD)
+        assert result == {'data': {'document_id': 'doc-1'}}
+        assert codec.dumped == 1
+        assert codec.loaded == 1
+        assert json.loads(request.call_args[1]['data']) == PAYLOAD
+
+    def test_invalid_response_body(self, make_response):
+        """Test that an undecodable error body still maps to an exception"""
+        client = Docstron(api_key='test-key', max_retries=0)
+        response = make_response(status_code=500, content=b'<html>oops</html>')
+        with mock.patch.object(client.session, 'request', return_value=response):
+            with pytest.raises(ServerError):
+                client.get('usage')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
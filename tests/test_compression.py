@@ -0,0 +1,120 @@
+"""
+Unit tests for request body compression
+"""
+
+import gzip
+import json
+import os
+from unittest import mock
+
+import pytest
+from docstron import Docstron, RequestCompressor
+from docstron.compression import build_compressor
+
+LARGE_HTML = '<p>{{name}}</p>' * 4000
+
+
+class TestRequestCompressor:
+    """Test the compressor and its counters"""
+
+    def test_small_body_untouched(self):
+        """Test that bodies under the threshold are not compressed"""
+        compressor = RequestCompressor(threshold=1024)
+        assert compressor.compress(b'{"a": 1}') == (b'{"a": 1}', None)
+        assert compressor.requests_compressed == 0
+
+    def test_large_body_gzipped(self):
+        """Test that large bodies are gzipped and counted"""
+        compressor = RequestCompressor(threshold=1024)
+        body = json.dumps({'html': LARGE_HTML}).encode('utf-8')
+        compressed, encoding = compressor.compress(body)
+        assert encoding == 'gzip'
+        assert gzip.decompress(compressed) == body
+        stats = compressor.stats()
+        assert stats['requests_compressed'] == 1
+        assert stats['bytes_in'] == len(body)
+        assert stats['bytes_saved'] == len(body) - len(compressed)
+        assert compressor.bytes_saved == stats['bytes_saved']
+
+    def test_incompressible_body_sent_as_is(self):
+        """Test that a body that would grow is sent uncompressed"""
+        compressor = RequestCompressor(threshold=16)
+        body = os.urandom(256)
+        assert compressor.compress(body) == (body, None)
+
+    def test_unknown_encoding(self):
+        """Test that unsupported encodings are rejected"""
+        with pytest.raises(ValueError):
+            RequestCompressor('brotli')
+
+    def test_build_compressor(self):
+        """Test the client option shortcuts"""
+        assert build_compressor(None) is None
+        assert build_compressor(False) is None
+        assert build_compressor(True).encoding == 'gzip'
+        assert build_compressor('gzip', threshold=10).threshold == 10
+        compressor = RequestCompressor()
+        assert build_compressor(compressor) is compressor
+
+
+class TestClientCompression:
+    """Test compression on client requests"""
+
+    def test_disabled_by_default(self, make_response):
+        """Test that bodies are sent as plain JSON by default"""
+        client = Docstron(api_key='test-key')
+        assert client.compressor is None
+        with mock.patch.object(
+            client.session, 'request', return_value=make_response(json_body={})
+        ) as request:
+            client.documents.quick_generate(html=LARGE_HTML)
+        kwargs = request.call_args[1]
+        assert 'Content-Encoding' not in kwargs['headers']
+        assert json.loads(kwargs['data'])['html'] == LARGE_HTML
+
+    def test_large_body_compressed(self, make_response):
+        """Test that a large quick_generate body is gzipped with headers set"""
+        client = Docstron(api_key='test-key', compression='gzip')
+        with mock.patch.object(
+            client.session, 'request', return_value=make_response(json_body={})
+        ) as request:
+            client.documents.quick_generate(html=LARGE_HTML)
+        kwargs = request.call_args[1]
+        assert kwargs['headers']['Content-Encoding'] == 'gzip'
+        assert kwargs['headers']['Content-Type'] == 'application/json'
+        payload = json.loads(gzip.decompress(kwargs['data']))
+        assert payload['html'] == LARGE_HTML
+        assert client.compressor.stats()['bytes_saved'] > 0
+
+    def test_small_body_not_compressed(self, make_response):
+        """Test that small bodies skip compression but keep JSON headers"""
+        client = Docstron(api_key='test-key', compression=True)
+        with mock.patch.object(
+            client.session, 'request', return_value=make_response(json_body={})
+        ) as request:
+            client.documents.quick_generate(html='<p>hi</p>')
+        kwargs = request.call_args[1]
+        assert 'Content-Encoding' not in kwargs['headers']
+        assert json.loads(kwargs['data'])['html'] == '<p>hi</p>'
+
+    def test_compressed_once_across_retries(self, make_response):
+        """Test that a retried request resends the same compressed bytes"""
+        client = Docstron(api_key='test-key', compression='gzip')
+        with mock.patch('docstron.base.time.sleep'), mock.patch.object(
+            client.session,
+            'request',
+            side_effect=[
+                make_response(status_code=429, json_body={}),
+                make_response(json_body={}),
+            ],
+        ) as request, mock.patch.object(
+            client.compressor, '_compress', wraps=client.compressor._compress
+        ) as compress:
+            client.patch('documents/doc-1', data={'html': LARGE_HTML})
+        assert compress.call_count == 1
+        first, second = request.call_args_list
+        assert first[1]['data'] is second[1]['data']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,102 @@
+"""
+Unit tests for batch concurrency helpers
+"""
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+from docstron import Docstron
+from docstron.concurrency import BatchResult, map_concurrently
+from docstron.exceptions import ValidationError
+
+
+class TestMapConcurrently:
+    """Test the thread-pool batch helper"""
+
+    def test_preserves_input_order(self):
+        """Test that ordered mode yields results in input order"""
+
+        def slow_square(n):
+            time.sleep(0.01 * (5 - n))
+            return n * n
+
+        results = list(map_concurrently(slow_square, range(5), concurrency=5))
+        assert [r.index for r in results] == [0, 1, 2, 3, 4]
+        assert [r.result for r in results] == [0, 1, 4, 9, 16]
+
+    def test_unordered_yields_every_item(self):
+        """Test that as-completed mode still yields every item once"""
+        results = list(
+            map_concurrently(lambda n: n, range(20), concurrency=4, ordered=False)
+        )
+        assert sorted(r.index for r in results) == list(range(20))
+
+    def test_errors_are_captured_per_item(self):
+        """Test that one failing item does not abort the batch"""
+
+        def check(n):
+            if n == 2:
+                raise ValidationError('bad row', status_code=422)
+            return n
+
+        results = list(map_concurrently(check, range(4), concurrency=2))
+        assert [r.ok for r in results] == [True, True, False, True]
+        assert isinstance(results[2].error, ValidationError)
+        with pytest.raises(ValidationError):
+            results[2].unwrap()
+
+    def test_bounded_in_flight(self):
+        """Test that the input iterable is consumed lazily"""
+        consumed = []
+
+        def source():
+            for n in range(100):
+                consumed.append(n)
+                yield n
+
+        iterator = map_concurrently(lambda n: n, source(), concurrency=2)
+        next(iterator)
+        assert len(consumed) <= 6
+        iterator.close()
+
+    def test_invalid_concurrency(self):
+        """Test that concurrency must be positive"""
+        with pytest.raises(ValueError):
+            list(map_concurrently(lambda n: n, [1], concurrency=0))
+
+
+class TestGenerateMany:
+    """Test Documents.generate_many"""
+
+    def test_generate_many(self, mock_template_id):
+        """Test that every row is generated with the shared template"""
+        client = Docstron(api_key='test-key')
+        calls = []
+        lock = threading.Lock()
+
+        def fake_post(endpoint, data=None, files=None):
+            with lock:
+                calls.append(data)
+            if data['data']['n'] == 1:
+                raise ValidationError('missing field', status_code=422)
+            return {'data': {'document_id': f"doc-{data['data']['n']}"}}
+
+        with mock.patch.object(client, 'post', side_effect=fake_post):
+            results = list(
+                client.documents.generate_many(
+                    mock_template_id, ({'n': n} for n in range(3)), concurrency=3
+                )
+            )
+
+        assert len(calls) == 3
+        assert all(call['template_id'] == mock_template_id for call in calls)
+        assert all(isinstance(r, BatchResult) for r in results)
+        assert results[0].result == {'data': {'document_id': 'doc-0'}}
+        assert isinstance(results[1].error, ValidationError)
+        assert results[2].ok
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
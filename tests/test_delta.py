@@ -0,0 +1,208 @@
+"""
+Unit tests for delta updates of templates and documents
+"""
+
+import asyncio
+
+import pytest
+from docstron import Docstron
+from docstron.delta import VersionStore, changed_fields, data_if_changed
+from docstron.exceptions import NotFoundError
+from docstron.testing import FakeAPI, FakeTransport
+
+TEMPLATE = 'template-00000001'
+DOCUMENT = 'document-00000001'
+
+
+class RecordingAPI(FakeAPI):
+    """FakeAPI remembering the method, path and body of every update"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def _update(self, match, params, payload):
+        self.writes.append((match.group(2), payload))
+        return super()._update(match, params, payload)
+
+
+def delta_client(**options):
+    """Client with delta updates over a RecordingAPI"""
+    api = RecordingAPI()
+    transport = FakeTransport(api)
+    return api, Docstron(api_key='test-key', transport=transport, **options)
+
+
+class TestDiffing:
+    """Test the field comparisons"""
+
+    def test_changed_fields(self):
+        """Test that only differing or new fields are kept"""
+        known = {'name': 'Invoice', 'content': '<h1/>'}
+        fields = {'name': 'Invoice', 'content': '<h2/>', 'is_active': False}
+        assert changed_fields(known, fields) == {
+            'content': '<h2/>',
+            'is_active': False,
+        }
+        assert changed_fields(None, fields) == fields
+
+    def test_document_data_sent_whole(self):
+        """Test that changed document data is sent whole, unchanged not at all"""
+        known = {'name': 'Acme', 'amount': 1}
+        changed = {'name': 'Acme', 'amount': 2}
+        assert data_if_changed(known, changed) == changed
+        assert data_if_changed(known, {}) == {}
+        assert data_if_changed(known, dict(known)) is None
+
+    def test_store_bounded_and_copied(self):
+        """Test LRU eviction and that stored records are copies"""
+        store = VersionStore(max_entries=2)
+        record = {'name': 'a'}
+        store.remember('a', record)
+        record['name'] = 'changed'
+        store.remember('b', {})
+        store.get('a')
+        store.remember('c', {})
+        assert store.get('a') == {'name': 'a'}
+        assert 'b' not in store and len(store) == 2
+
+
+class TestTemplateDelta:
+    """Test delta updates of templates"""
+
+    def test_disabled_by_default(self):
+        """Test that updates send every field unless delta updates are on"""
+        api, client = delta_client()
+        assert client.templates.versions is None
+        client.templates.get(TEMPLATE)
+        client.templates.update(TEMPLATE, name='Template 0001')
+        assert api.writes == [(TEMPLATE, {'name': 'Template 0001'})]
+
+    def test_sends_only_changed_fields(self):
+        """Test that unchanged fields are left out after a get"""
+        api, client = delta_client(delta_updates=True)
+        template = client.templates.get(TEMPLATE)['data']
+        client.templates.update(
+            TEMPLATE, name='Renamed', content=template['content'], is_active=True
+        )
+        assert api.writes == [(TEMPLATE, {'name': 'Renamed', 'is_active': True})]
+
+    def test_noop_update_skipped(self):
+        """Test that an update changing nothing makes no request"""
+        api, client = delta_client(delta_updates=True)
+        client.templates.update(TEMPLATE, name='Renamed', content='<p/>')
+        requests = api.requests
+        response = client.templates.update(TEMPLATE, name='Renamed', content='<p/>')
+        assert api.requests == requests
+        assert response['not_modified'] is True
+        assert response['data']['name'] == 'Renamed'
+        assert client.templates.versions.skipped == 1
+
+    def test_created_template_known(self):
+        """Test that a created template can be updated with a delta"""
+        api, client = delta_client(delta_updates=True)
+        created = client.templates.create('app-1', 'Invoice', '<h1/>')
+        template_id = created['data']['template_id']
+        client.templates.update(template_id, name='Invoice', content='<h2/>')
+        assert api.writes == [(template_id, {'content': '<h2/>'})]
+
+    def test_delta_false_sends_everything(self):
+        """Test the per-call override"""
+        api, client = delta_client(delta_updates=True)
+        name = client.templates.get(TEMPLATE)['data']['name']
+        client.templates.update(TEMPLATE, name=name, delta=False)
+        assert api.writes == [(TEMPLATE, {'name': name})]
+
+    def test_failure_forgets_version(self):
+        """Test that a failed update drops the known version"""
+        _, client = delta_client(delta_updates=True)
+        client.templates.versions.remember('missing-1', {'name': 'x'})
+        with pytest.raises(NotFoundError):
+            client.templates.update('missing-1', name='y')
+        assert 'missing-1' not in client.templates.versions
+
+
+class TestDocumentDelta:
+    """Test delta updates of documents"""
+
+    def test_sends_full_data_and_skips_noops(self):
+        """Test that changed data is sent whole and unchanged data not at all"""
+        api, client = delta_client(delta_updates=True)
+        client.documents.update(DOCUMENT, {'name': 'Acme', 'amount': '$10'})
+        client.documents.update(DOCUMENT, {'name': 'Acme', 'amount': '$20'})
+        response = client.documents.update(DOCUMENT, {'name': 'Acme', 'amount': '$20'})
+        assert api.writes == [
+            (DOCUMENT, {'data': {'name': 'Acme', 'amount': '$10'}}),
+            (DOCUMENT, {'data': {'name': 'Acme', 'amount': '$20'}}),
+        ]
+        assert response['not_modified'] is True
+        assert response['data']['attributes'] == {'name': 'Acme', 'amount': '$20'}
+
+    def test_server_attributes_remembered(self):
+        """Test that the attributes returned by the server are the known version"""
+
+        class TrimmingAPI(RecordingAPI):
+            def _update(self, match, params, payload):
+                payload = {'data': {'name': payload['data']['name']}}
+                return super()._update(match, params, payload)
+
+        api = TrimmingAPI()
+        client = Docstron(
+            api_key='test-key', transport=FakeTransport(api), delta_updates=True
+        )
+        data = {'name': 'Acme', 'amount': '$10'}
+        client.documents.update(DOCUMENT, data)
+        client.documents.update(DOCUMENT, data)
+        assert len(api.writes) == 2
+
+    def test_delete_forgets_version(self):
+        """Test that deleting a document drops its known version"""
+        _, client = delta_client(delta_updates=True)
+        client.documents.update(DOCUMENT, {'name': 'Acme'})
+        client.documents.delete(DOCUMENT)
+        assert DOCUMENT not in client.documents.versions
+
+
+class TestAsyncDelta:
+    """Test delta updates with the async client"""
+
+    def test_update(self):
+        """Test that the async resources skip and diff like the sync ones"""
+        httpx = pytest.importorskip('httpx')
+        from docstron import AsyncDocstron
+
+        api = RecordingAPI()
+
+        def handler(request):
+            status, headers, body = api.handle(
+                request.method,
+                request.url.path,
+                dict(request.url.params),
+                request.content,
+                request.headers,
+            )
+            return httpx.Response(status, headers=headers, content=body)
+
+        async def run():
+            client = AsyncDocstron(
+                api_key='test-key',
+                delta_updates=True,
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            )
+            await client.templates.get(TEMPLATE)
+            await client.templates.update(TEMPLATE, name='Renamed')
+            await client.templates.update(TEMPLATE, name='Renamed')
+            await client.documents.update(DOCUMENT, {'a': 1, 'b': 2})
+            await client.documents.update(DOCUMENT, {'a': 1, 'b': 3})
+            await client.aclose()
+
+        asyncio.run(run())
+        assert api.writes == [
+            (TEMPLATE, {'name': 'Renamed'}),
+            (DOCUMENT, {'data': {'a': 1, 'b': 2}}),
+            (DOCUMENT, {'data': {'a': 1, 'b': 3}}),
+        ]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
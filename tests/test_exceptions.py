@@ -63,6 +63,19 @@ class TestExceptions:
         assert isinstance(error, DocstronError)
         assert error.status_code == 500
 
+    def test_exported_from_package(self):
+        """Test that errors raised by the SDK are importable from docstron"""
+        import docstron
+        from docstron import exceptions
+
+        for name in (
+            'ResponseTooLargeError',
+            'DocumentFailedError',
+            'WaitTimeoutError',
+        ):
+            assert getattr(docstron, name) is getattr(exceptions, name)
+            assert name in docstron.__all__
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
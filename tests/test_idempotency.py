@@ -0,0 +1,201 @@
+"""
+Unit tests for idempotency keys and the generation ledger
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+import requests
+from docstron import Docstron
+from docstron.idempotency import IdempotencyLedger, build_ledger, generation_key
+from docstron.testing import FakeAPI, FakeTransport
+
+
+class RecordingAPI(FakeAPI):
+    """Fake API remembering the Idempotency-Key of every request"""
+
+    def __init__(self):
+        super().__init__(pdf_size=64)
+        self.keys = []
+
+    def handle(self, method, path, params=None, body=b'', headers=None):
+        self.keys.append((headers or {}).get('Idempotency-Key'))
+        return super().handle(method, path, params, body, headers)
+
+
+def make_client(**options):
+    """Client answered by a RecordingAPI"""
+    api = RecordingAPI()
+    return api, Docstron(api_key='test-key', transport=FakeTransport(api), **options)
+
+
+class TestGenerationKey:
+    """Test deterministic keys"""
+
+    def test_stable_and_order_insensitive(self):
+        """Test that equal requests share a key and different ones do not"""
+        first = generation_key('documents/generate', {'a': 1, 'b': {'c': 2}})
+        second = generation_key('documents/generate', {'b': {'c': 2}, 'a': 1})
+        assert first == second
+        assert first.startswith('gen-')
+        assert generation_key('documents/quick/generate', {'a': 1}) != first
+
+
+class TestIdempotencyLedger:
+    """Test the local ledger"""
+
+    def test_record_and_get(self):
+        """Test that stored results come back as copies"""
+        ledger = IdempotencyLedger()
+        result = {'data': {'document_id': 'doc-1'}}
+        ledger.record('k', result)
+        result['data']['document_id'] = 'changed'
+        stored = ledger.get('k')
+        stored['data'].clear()
+        assert ledger.get('k') == {'data': {'document_id': 'doc-1'}}
+        assert 'k' in ledger
+        assert ledger.get('other') is None
+
+    def test_expiry_and_bound(self):
+        """Test that entries expire and the oldest are evicted"""
+        with patch('docstron.idempotency.time.time', return_value=1000.0):
+            ledger = IdempotencyLedger(ttl=10, max_entries=2)
+            for key in 'abc':
+                ledger.record(key, {})
+        assert len(ledger) == 2
+        assert 'a' not in ledger
+        with patch('docstron.idempotency.time.time', return_value=1011.0):
+            assert ledger.get('c') is None
+
+    def test_persisted(self, tmp_path):
+        """Test that a new ledger on the same file sees earlier results"""
+        path = tmp_path / 'ledger.jsonl'
+        IdempotencyLedger(path).record('k', {'data': {'document_id': 'doc-1'}})
+        with open(path, 'a') as f:
+            f.write('{"key": "broken"')
+        assert IdempotencyLedger(path).get('k') == {'data': {'document_id': 'doc-1'}}
+
+    def test_compacts_stale_file(self, tmp_path):
+        """Test that a file of mostly expired entries is rewritten"""
+        path = tmp_path / 'ledger.jsonl'
+        stale = [
+            json.dumps({'key': f'k{i}', 'at': 0, 'result': {}}) for i in range(200)
+        ]
+        path.write_text('\n'.join(stale) + '\n')
+        ledger = IdempotencyLedger(path)
+        assert len(ledger) == 0
+        assert path.read_text() == ''
+
+    def test_build_ledger(self, tmp_path):
+        """Test resolving the client option"""
+        ledger = IdempotencyLedger()
+        assert build_ledger(None) is None
+        assert build_ledger(False) is None
+        assert build_ledger(ledger) is ledger
+        assert build_ledger(True).path is None
+        assert build_ledger(tmp_path / 'l.jsonl').path == str(tmp_path / 'l.jsonl')
+
+
+class TestIdempotentGeneration:
+    """Test idempotency keys on generation calls"""
+
+    def test_disabled_by_default(self):
+        """Test that no key is sent unless asked for"""
+        api, client = make_client()
+        client.documents.generate('template-1', {'name': 'Acme'})
+        assert api.keys == [None]
+
+    def test_replay_resolved_locally(self):
+        """Test that a repeated generation returns the original document"""
+        api, client = make_client(idempotency=True)
+        first = client.documents.generate('template-1', {'name': 'Acme'})
+        again = client.documents.generate('template-1', {'name': 'Acme'})
+        other = client.documents.generate('template-1', {'name': 'Globex'})
+
+        assert again == first
+        assert other != first
+        assert len(api.keys) == 2
+        assert api.keys[0] == generation_key(
+            'documents/generate',
+            {
+                'template_id': 'template-1',
+                'data': {'name': 'Acme'},
+                'response_type': 'document_id',
+            },
+        )
+
+    def test_replay_after_restart(self, tmp_path):
+        """Test that a persisted ledger recognizes replays from a new client"""
+        path = tmp_path / 'ledger.jsonl'
+        _, client = make_client(idempotency=path)
+        first = client.documents.quick_generate('<p>{{name}}</p>', {'name': 'A'})
+        api, client = make_client(idempotency=path)
+        assert (
+            client.documents.quick_generate('<p>{{name}}</p>', {'name': 'A'}) == first
+        )
+        assert api.keys == []
+
+    def test_explicit_key(self):
+        """Test that an explicit key is sent for PDFs without a ledger"""
+        api, client = make_client()
+        pdf = client.documents.generate(
+            'template-1', {}, response_type='pdf', idempotency_key='order-42'
+        )
+        assert pdf.startswith(b'%PDF')
+        assert api.keys == ['order-42']
+
+    def test_timeout_retried_with_key(self, make_response):
+        """Test that a POST with a key is retried after a network timeout"""
+        client = Docstron(api_key='test-key', idempotency=True)
+        client.retry_policy.backoff = lambda attempt: 0
+        ok = make_response(200, {'data': {'document_id': 'doc-1'}})
+        with patch.object(
+            client.session, 'request', side_effect=[requests.Timeout(), ok]
+        ) as request:
+            result = client.documents.generate('template-1', {'name': 'Acme'})
+        assert result == {'data': {'document_id': 'doc-1'}}
+        assert request.call_count == 2
+        sent = [
+            call.kwargs['headers']['Idempotency-Key'] for call in request.call_args_list
+        ]
+        assert sent[0] == sent[1]
+
+    def test_timeout_not_retried_without_key(self):
+        """Test that plain generations are still not replayed blindly"""
+        client = Docstron(api_key='test-key')
+        with patch.object(
+            client.session, 'request', side_effect=requests.Timeout()
+        ) as request:
+            with pytest.raises(requests.Timeout):
+                client.documents.generate('template-1', {'name': 'Acme'})
+        assert request.call_count == 1
+
+    def test_async_client(self):
+        """Test keys and the ledger on the async client"""
+        httpx = pytest.importorskip('httpx')
+        from docstron import AsyncDocstron
+
+        keys = []
+
+        def handler(request):
+            keys.append(request.headers.get('Idempotency-Key'))
+            return httpx.Response(200, json={'data': {'document_id': 'doc-1'}})
+
+        async def run():
+            http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with AsyncDocstron(
+                api_key='test-key', http_client=http_client, idempotency=True
+            ) as client:
+                first = await client.documents.generate('template-1', {'n': 1})
+                again = await client.documents.generate('template-1', {'n': 1})
+                return first, again
+
+        first, again = asyncio.run(run())
+        assert first == again
+        assert len(keys) == 1 and keys[0].startswith('gen-')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
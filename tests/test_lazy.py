@@ -0,0 +1,133 @@
+"""
+Unit tests for lazy imports and lazily built client attributes
+"""
+
+import subprocess
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+import docstron
+from docstron import Docstron
+from docstron.lazy import lazy_attribute
+from docstron.resources import Documents
+
+
+def loaded_modules(code):
+    """Modules imported by ``code`` in a fresh interpreter"""
+    script = f'import sys; {code}; print(" ".join(sys.modules))'
+    output = subprocess.run(
+        [sys.executable, '-c', script], check=True, capture_output=True, text=True
+    ).stdout
+    return set(output.split())
+
+
+class TestLazyImports:
+    """Test the package's deferred imports"""
+
+    def test_import_skips_http_stack(self):
+        """Test that importing the package does not load requests or asyncio"""
+        modules = loaded_modules('import docstron; docstron.NotFoundError')
+        assert 'requests' not in modules
+        assert 'asyncio' not in modules
+        assert 'docstron.client' not in modules
+
+    def test_sync_client_skips_asyncio(self):
+        """Test that the synchronous client never needs asyncio"""
+        modules = loaded_modules('from docstron import Docstron')
+        assert 'docstron.client' in modules
+        assert 'asyncio' not in modules
+
+    def test_names_resolve(self):
+        """Test that every exported name is importable and cached"""
+        for name in docstron.__all__:
+            assert getattr(docstron, name) is not None
+        assert 'Docstron' in vars(docstron)
+        assert set(docstron.__all__) <= set(dir(docstron))
+
+    def test_unknown_name(self):
+        """Test that unknown names still raise AttributeError"""
+        with pytest.raises(AttributeError):
+            docstron.Nonexistent
+
+    def test_import_failure_keeps_cause(self, monkeypatch):
+        """Test that errors raised while importing a submodule stay visible"""
+
+        def import_module(name, package=None):
+            raise AttributeError("module 'urllib3' has no attribute 'Missing'")
+
+        monkeypatch.setitem(docstron._LAZY_IMPORTS, 'Broken', '.broken')
+        monkeypatch.setattr(
+            docstron, 'importlib', SimpleNamespace(import_module=import_module)
+        )
+        with pytest.raises(ImportError, match='urllib3') as excinfo:
+            docstron.Broken
+        assert isinstance(excinfo.value.__cause__, AttributeError)
+
+
+class TestLazyAttribute:
+    """Test the lazy_attribute descriptor"""
+
+    def test_built_once(self):
+        """Test that concurrent first accesses build the value once"""
+        calls = []
+
+        class Holder:
+            @lazy_attribute
+            def value(self):
+                calls.append(1)
+                return object()
+
+        holder = Holder()
+        seen = []
+        threads = [
+            threading.Thread(target=lambda: seen.append(holder.value)) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert all(value is seen[0] for value in seen)
+
+    def test_assignable(self):
+        """Test that the attribute can be replaced like a plain one"""
+
+        class Holder:
+            @lazy_attribute
+            def value(self):
+                return 1
+
+        holder = Holder()
+        holder.value = 2
+        assert holder.value == 2
+
+
+class TestLazyClient:
+    """Test that the client defers its session and resources"""
+
+    def test_nothing_built_up_front(self):
+        """Test that construction builds neither transport nor resources"""
+        client = Docstron(api_key='test-key')
+        for name in ('session', 'applications', 'templates', 'documents', 'usage'):
+            assert name not in vars(client)
+
+    def test_built_on_access(self):
+        """Test that resources are built once and keep their options"""
+        client = Docstron(api_key='test-key', metadata_cache_ttl=60, pdf_cache=None)
+        documents = client.documents
+        assert isinstance(documents, Documents)
+        assert client.documents is documents
+        assert client.templates.cache is not None
+        assert client.session.headers['Authorization'] == 'Bearer test-key'
+
+    def test_close_without_session(self):
+        """Test that closing an unused client does not build a session"""
+        client = Docstron(api_key='test-key')
+        client.close()
+        assert 'session' not in vars(client)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
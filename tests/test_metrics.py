@@ -0,0 +1,254 @@
+"""
+Unit tests for request instrumentation and the metrics registry
+"""
+
+import asyncio
+from unittest import mock
+
+import pytest
+import requests
+from docstron import Docstron, MetricsRegistry, RequestEvent
+from docstron.metrics import Histogram, endpoint_label
+
+PDF = b'%PDF-1.4 instrumented'
+
+
+def make_event(status_code=200, total=0.2, endpoint='templates/t-1'):
+    """Finished event for feeding a registry directly"""
+    event = RequestEvent('GET', endpoint, 1, 0.0)
+    event.status_code = status_code
+    event.ttfb, event.total = 0.1, total
+    event.request_bytes, event.response_bytes = 0, 2048
+    return event
+
+
+class TestEndpointLabel:
+    """Test collapsing IDs in endpoints"""
+
+    def test_ids_collapsed(self, mock_template_id):
+        """Test that ID segments become a placeholder"""
+        assert endpoint_label(f'templates/{mock_template_id}') == 'templates/{id}'
+        assert endpoint_label('documents/generate') == 'documents/generate'
+        assert endpoint_label('documents/doc-1/download') == 'documents/{id}/download'
+
+
+class TestHistogram:
+    """Test the cumulative histogram"""
+
+    def test_cumulative_counts(self):
+        """Test that bucket counts are cumulative and end with +Inf"""
+        histogram = Histogram([1, 5])
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+        assert histogram.cumulative() == [(1, 2), (5, 3), (float('inf'), 4)]
+        assert histogram.count == 4
+        assert histogram.sum == 14.5
+
+
+class TestMetricsRegistry:
+    """Test aggregating events"""
+
+    def test_counts_and_durations(self):
+        """Test that events are counted per status and timed per phase"""
+        registry = MetricsRegistry()
+        registry.observe(make_event())
+        registry.observe(make_event(status_code=404, total=0.4))
+        snapshot = registry.snapshot()
+        assert snapshot['requests'] == {
+            'GET templates/{id} 200': 1,
+            'GET templates/{id} 404': 1,
+        }
+        total = snapshot['durations']['GET templates/{id} total']
+        assert total['count'] == 2
+        assert total['mean'] == pytest.approx(0.3)
+        assert 'GET templates/{id} decode' not in snapshot['durations']
+
+    def test_prometheus_format(self):
+        """Test the text exposition output"""
+        registry = MetricsRegistry(duration_buckets=[0.1, 1])
+        registry.observe(make_event())
+        text = registry.to_prometheus()
+        assert '# TYPE docstron_requests_total counter' in text
+        assert (
+            'docstron_requests_total{method="GET",endpoint="templates/{id}",'
+            'status="200"} 1'
+        ) in text
+        assert (
+            'docstron_request_duration_seconds_bucket{method="GET",'
+            'endpoint="templates/{id}",phase="total",le="1.0"} 1'
+        ) in text
+        assert (
+            'docstron_request_duration_seconds_bucket{method="GET",'
+            'endpoint="templates/{id}",phase="total",le="+Inf"} 1'
+        ) in text
+        assert (
+            'docstron_body_size_bytes_count{method="GET",'
+            'endpoint="templates/{id}",direction="response"} 1'
+        ) in text
+        assert text.endswith('\n')
+
+    def test_reset(self):
+        """Test that reset drops everything"""
+        registry = MetricsRegistry()
+        registry.observe(make_event())
+        registry.reset()
+        assert registry.snapshot() == {'requests': {}, 'durations': {}}
+
+
+class TestClientInstrumentation:
+    """Test events emitted by the client"""
+
+    def test_disabled_by_default(self):
+        """Test that clients skip instrumentation unless asked"""
+        client = Docstron(api_key='test-key')
+        assert client.instrumentation is None
+        assert client.metrics is None
+
+    def test_json_request_event(self, make_response):
+        """Test that a JSON request reports its phases and sizes"""
+        events = []
+        client = Docstron(api_key='test-key', event_hooks=[events.append])
+        with mock.patch.object(
+            client.session,
+            'request',
+            return_value=make_response(json_body={'data': {'template_id': 't-1'}}),
+        ):
+            client.templates.update('template-1', name='Invoice')
+
+        (event,) = events
+        assert (event.method, event.endpoint) == ('PATCH', 'templates/{id}')
+        assert event.status_code == 200
+        assert event.request_bytes > 0
+        assert event.response_bytes == len(b'{"data": {"template_id": "t-1"}}')
+        for phase in ('queue', 'ttfb', 'transfer', 'decode', 'total'):
+            assert getattr(event, phase) >= 0
+
+    def test_metrics_true(self, make_response):
+        """Test that metrics=True aggregates into a new registry"""
+        client = Docstron(api_key='test-key', metrics=True)
+        with mock.patch.object(
+            client.session,
+            'request',
+            side_effect=lambda *a, **k: make_response(json_body={'data': {}}),
+        ):
+            client.usage.get()
+            client.usage.get()
+        assert client.metrics.snapshot()['requests'] == {'GET usage 200': 2}
+
+    def test_retried_attempts(self, make_response):
+        """Test that each attempt is reported and retries are flagged"""
+        events = []
+        client = Docstron(
+            api_key='test-key',
+            event_hooks=[events.append],
+            retry_policy=mock.Mock(
+                should_retry_status=lambda *a: True,
+                should_retry_error=lambda *a: True,
+                delay=lambda *a: 0,
+                backoff=lambda *a: 0,
+                retry_after=lambda *a: None,
+            ),
+        )
+        responses = iter(
+            [
+                requests.ConnectionError('reset'),
+                make_response(status_code=503, json_body={}),
+                make_response(json_body={'data': {}}),
+            ]
+        )
+
+        def respond(*args, **kwargs):
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        with mock.patch.object(client.session, 'request', side_effect=respond):
+            client.usage.get()
+
+        assert [e.attempt for e in events] == [1, 2, 3]
+        assert [e.status_code for e in events] == [None, 503, 200]
+        assert [e.retried for e in events] == [True, True, False]
+        assert isinstance(events[0].error, requests.ConnectionError)
+
+    def test_binary_and_streamed_responses(self, make_response, tmp_path):
+        """Test that binary downloads and streams emit one event each"""
+        events = []
+        client = Docstron(api_key='test-key', event_hooks=[events.append])
+        with mock.patch.object(
+            client.session,
+            'request',
+            side_effect=lambda *a, **k: make_response(content=PDF),
+        ):
+            client.download('documents/doc-1/download')
+            client.download_to('documents/doc-1/download', tmp_path / 'out.pdf')
+
+        assert len(events) == 2
+        assert [e.response_bytes for e in events] == [len(PDF), len(PDF)]
+        assert all(e.decode is None and e.transfer >= 0 for e in events)
+
+    def test_hook_errors_propagate(self, make_response):
+        """Test that a failing hook surfaces to the caller"""
+
+        def hook(event):
+            raise RuntimeError('hook failed')
+
+        client = Docstron(api_key='test-key', event_hooks=[hook])
+        with mock.patch.object(
+            client.session,
+            'request',
+            return_value=make_response(json_body={'data': {}}),
+        ):
+            with pytest.raises(RuntimeError):
+                client.usage.get()
+
+    def test_async_client(self):
+        """Test that the async client times header and body separately"""
+        httpx = pytest.importorskip('httpx')
+        from docstron import AsyncDocstron
+
+        def handler(request):
+            return httpx.Response(200, json={'data': {'plan_name': 'Pro'}})
+
+        async def run():
+            http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with AsyncDocstron(
+                api_key='test-key', http_client=http_client, metrics=True
+            ) as client:
+                await client.usage.get()
+                return client.metrics.snapshot()
+
+        snapshot = asyncio.run(run())
+        assert snapshot['requests'] == {'GET usage 200': 1}
+        for phase in ('queue', 'ttfb', 'transfer', 'decode', 'total'):
+            assert snapshot['durations'][f'GET usage {phase}']['count'] == 1
+
+    def test_async_connection_phases(self):
+        """Test that the async client splits out connection setup"""
+        pytest.importorskip('httpx')
+        from docstron import AsyncDocstron
+        from docstron.mock_server import MockServer
+
+        events = []
+
+        async def run(url):
+            async with AsyncDocstron(
+                api_key='test-key', base_url=url, event_hooks=[events.append]
+            ) as client:
+                await client.usage.get()
+                await client.usage.get()
+
+        with MockServer() as server:
+            asyncio.run(run(server.url))
+
+        first, second = events
+        assert first.status_code == second.status_code == 200
+        assert first.connect > 0
+        assert second.connect is None  # the pooled connection was reused
+        for event in events:
+            before_headers = event.queue + (event.connect or 0) + event.ttfb
+            assert before_headers <= event.total
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,107 @@
+"""
+Unit tests for lazy pagination
+"""
+
+from unittest import mock
+
+import pytest
+from docstron import Docstron
+from docstron.pagination import iter_items
+
+
+def offset_pages(total, page_size):
+    """Build a fake fetch function serving ``total`` items by offset"""
+    calls = []
+
+    def fetch(params):
+        calls.append(dict(params))
+        start = params.get('offset', 0)
+        end = min(start + params['limit'], total)
+        return {'data': [{'id': n} for n in range(start, end)]}
+
+    return fetch, calls
+
+
+class TestIterItems:
+    """Test the pagination helper"""
+
+    @pytest.mark.parametrize('prefetch', [True, False])
+    def test_offset_pagination(self, prefetch):
+        """Test that offsets advance until a short page"""
+        fetch, calls = offset_pages(total=25, page_size=10)
+        items = list(iter_items(fetch, {}, page_size=10, prefetch=prefetch))
+        assert [item['id'] for item in items] == list(range(25))
+        assert [call.get('offset', 0) for call in calls] == [0, 10, 20]
+
+    def test_exact_multiple_stops_on_empty_page(self):
+        """Test that a full final page is followed by one empty page"""
+        fetch, calls = offset_pages(total=20, page_size=10)
+        assert len(list(iter_items(fetch, {}, page_size=10))) == 20
+        assert len(calls) == 3
+
+    def test_cursor_pagination(self):
+        """Test that next_cursor is followed when present"""
+        pages = {
+            None: {'data': [1, 2], 'meta': {'next_cursor': 'c2'}},
+            'c2': {'data': [3], 'meta': {'next_cursor': None}},
+        }
+        seen = []
+
+        def fetch(params):
+            seen.append(params.get('cursor'))
+            return pages[params.get('cursor')]
+
+        assert list(iter_items(fetch, {}, page_size=2)) == [1, 2, 3]
+        assert seen == [None, 'c2']
+
+    def test_unpaginated_endpoint(self):
+        """Test that an endpoint ignoring the limit is read once"""
+        fetch = mock.Mock(return_value={'data': list(range(50))})
+        assert len(list(iter_items(fetch, {}, page_size=10))) == 50
+        assert fetch.call_count == 1
+
+    @pytest.mark.parametrize('prefetch', [True, False])
+    def test_endpoint_ignoring_offset(self, prefetch):
+        """Test that a page repeating the previous one ends iteration"""
+        page = {'data': [{'document_id': f'doc-{n}'} for n in range(10)]}
+        fetch = mock.Mock(return_value=page)
+        items = list(iter_items(fetch, {}, page_size=10, prefetch=prefetch))
+        assert len(items) == 10
+        assert fetch.call_count == 2
+
+    def test_lazy(self):
+        """Test that no more than the next page is fetched ahead"""
+        fetch, calls = offset_pages(total=1000, page_size=10)
+        iterator = iter_items(fetch, {}, page_size=10)
+        next(iterator)
+        assert len(calls) <= 2
+        iterator.close()
+
+
+class TestResourceIterators:
+    """Test iter() on resources"""
+
+    def test_documents_iter_sends_params(self, make_response):
+        """Test that documents.iter pages through GET documents"""
+        client = Docstron(api_key='test-key')
+        pages = [
+            make_response(
+                json_body={'data': [{'document_id': 'a'}, {'document_id': 'b'}]}
+            ),
+            make_response(json_body={'data': [{'document_id': 'c'}]}),
+        ]
+        with mock.patch.object(client.session, 'request', side_effect=pages) as request:
+            ids = [doc['document_id'] for doc in client.documents.iter(page_size=2)]
+        assert ids == ['a', 'b', 'c']
+        assert request.call_args_list[1].kwargs['params'] == {'limit': 2, 'offset': 2}
+
+    def test_templates_iter(self, make_response):
+        """Test that templates.iter yields every template"""
+        client = Docstron(api_key='test-key')
+        response = make_response(json_body={'data': [{'name': 'Invoice'}]})
+        with mock.patch.object(client.session, 'request', return_value=response):
+            assert list(client.templates.iter()) == [{'name': 'Invoice'}]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
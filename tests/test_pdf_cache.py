@@ -0,0 +1,237 @@
+"""
+Unit tests for the on-disk PDF cache
+"""
+
+import os
+from unittest import mock
+
+import pytest
+from docstron import Docstron, PDFCache
+from docstron.exceptions import ServerError
+from docstron.pdf_cache import cache_key
+
+PDF = b'%PDF-1.4 cached document'
+
+
+def template_response(updated_at='2024-12-01T00:00:00Z'):
+    """Body of templates.get for a given revision"""
+    return {'data': {'template_id': 'template-123', 'updated_at': updated_at}}
+
+
+class TestCacheKey:
+    """Test hashing generation inputs"""
+
+    def test_canonical(self):
+        """Test that key order does not change the hash"""
+        first = cache_key({'template_id': 't-1', 'data': {'b': 2, 'a': 1}})
+        second = cache_key({'data': {'a': 1, 'b': 2}, 'template_id': 't-1'})
+        assert first == second
+
+    def test_inputs_change_key(self):
+        """Test that different data produce different keys"""
+        assert cache_key({'data': {'a': 1}}) != cache_key({'data': {'a': 2}})
+
+
+class TestPDFCache:
+    """Test storing, reading and evicting PDFs"""
+
+    def test_miss_then_hit(self, tmp_path):
+        """Test that a stored PDF is returned and counted"""
+        cache = PDFCache(tmp_path)
+        assert cache.get('ab' * 32) is None
+        cache.set('ab' * 32, PDF)
+        assert cache.get('ab' * 32) == PDF
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['stores']) == (1, 1, 1)
+        assert stats['bytes'] == len(PDF)
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test that another cache on the same directory sees entries"""
+        PDFCache(tmp_path).set('cd' * 32, PDF)
+        other = PDFCache(tmp_path)
+        assert other.stats()['bytes'] == len(PDF)
+        assert other.get('cd' * 32) == PDF
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used PDFs are evicted first"""
+        cache = PDFCache(tmp_path, max_bytes=25)
+        cache.set('a' * 64, b'x' * 10)
+        cache.set('b' * 64, b'x' * 10)
+        os.utime(cache._path('a' * 64), (1, 1))
+        os.utime(cache._path('b' * 64), (2, 2))
+        cache.get('a' * 64)
+        cache.set('c' * 64, b'x' * 10)
+        assert cache.get('b' * 64) is None
+        assert cache.get('a' * 64) is not None
+        assert cache.get('c' * 64) is not None
+        assert cache.evictions == 1
+        assert cache.stats()['bytes'] == 20
+
+    def test_failed_write_stores_nothing(self, tmp_path):
+        """Test that an error while writing leaves no entry or temp file"""
+        cache = PDFCache(tmp_path)
+        with pytest.raises(RuntimeError):
+            with cache.writer('ef' * 32) as f:
+                f.write(b'partial')
+                raise RuntimeError('connection dropped')
+        assert cache.get('ef' * 32) is None
+        assert os.listdir(tmp_path / 'ef') == []
+
+    def test_writer_tee(self, tmp_path):
+        """Test that a tee destination receives the same bytes"""
+        cache = PDFCache(tmp_path / 'cache')
+        out = bytearray()
+        with cache.writer('12' * 32, tee=out) as f:
+            f.write(PDF)
+        assert bytes(out) == PDF
+        assert cache.get('12' * 32) == PDF
+
+    def test_copy_to(self, tmp_path):
+        """Test copying a cached PDF to a path"""
+        cache = PDFCache(tmp_path / 'cache')
+        cache.set('34' * 32, PDF)
+        target = tmp_path / 'out.pdf'
+        assert cache.copy_to('34' * 32, target) == len(PDF)
+        assert target.read_bytes() == PDF
+        assert cache.copy_to('56' * 32, target) is None
+
+
+class TestGenerateWithCache:
+    """Test documents.generate served from the PDF cache"""
+
+    def make_client(self, directory, make_response):
+        """Client with a PDF cache and a responder for the fake API"""
+        client = Docstron(api_key='test-key', pdf_cache=str(directory))
+
+        def respond(method, url, **kwargs):
+            if method == 'GET':
+                return make_response(json_body=template_response())
+            return make_response(content=PDF)
+
+        return client, respond
+
+    def test_repeat_served_locally(self, tmp_path, make_response):
+        """Test that an identical generation is not sent twice"""
+        client, respond = self.make_client(tmp_path, make_response)
+        with mock.patch.object(
+            client.session, 'request', side_effect=respond
+        ) as request:
+            first = client.documents.generate(
+                'template-123', {'a': 1, 'b': 2}, response_type='pdf'
+            )
+            second = client.documents.generate(
+                'template-123', {'b': 2, 'a': 1}, response_type='pdf'
+            )
+        assert first == second == PDF
+        methods = [c[0][0] for c in request.call_args_list]
+        assert methods.count('POST') == 1
+        assert client.documents.pdf_cache.stats()['hits'] == 1
+
+    def test_template_edit_misses(self, tmp_path, make_response):
+        """Test that a new template revision is generated afresh"""
+        client = Docstron(api_key='test-key', pdf_cache=str(tmp_path))
+        versions = iter(['v1', 'v2'])
+
+        def respond(method, url, **kwargs):
+            if method == 'GET':
+                return make_response(json_body=template_response(next(versions)))
+            return make_response(content=PDF)
+
+        with mock.patch.object(
+            client.session, 'request', side_effect=respond
+        ) as request:
+            client.documents.generate('template-123', {}, response_type='pdf')
+            client.documents.generate('template-123', {}, response_type='pdf')
+        assert [c[0][0] for c in request.call_args_list].count('POST') == 2
+
+    def test_content_edit_misses_without_revision(self, tmp_path, make_response):
+        """Test that content edits change the key when no revision is reported"""
+        client = Docstron(api_key='test-key', pdf_cache=str(tmp_path))
+        contents = iter(['<h1>{{a}}</h1>', '<h2>{{a}}</h2>', '<h2>{{a}}</h2>'])
+
+        def respond(method, url, **kwargs):
+            if method == 'GET':
+                return make_response(json_body={'data': {'content': next(contents)}})
+            return make_response(content=PDF)
+
+        with mock.patch.object(
+            client.session, 'request', side_effect=respond
+        ) as request:
+            for _ in range(3):
+                client.documents.generate('template-123', {}, response_type='pdf')
+        assert [c[0][0] for c in request.call_args_list].count('POST') == 2
+
+    def test_output_path(self, tmp_path, make_response):
+        """Test that streamed generations are cached and copied out"""
+        client, respond = self.make_client(tmp_path / 'cache', make_response)
+        first, second = tmp_path / 'first.pdf', tmp_path / 'second.pdf'
+        with mock.patch.object(
+            client.session, 'request', side_effect=respond
+        ) as request:
+            client.documents.generate(
+                'template-123', {}, response_type='pdf', output_path=first
+            )
+            size = client.documents.generate(
+                'template-123', {}, response_type='pdf', output_path=second
+            )
+        assert size == len(PDF)
+        assert first.read_bytes() == second.read_bytes() == PDF
+        assert [c[0][0] for c in request.call_args_list].count('POST') == 1
+
+    def test_errors_not_cached(self, tmp_path, make_response):
+        """Test that failed generations are not stored"""
+        client = Docstron(api_key='test-key', pdf_cache=str(tmp_path), max_retries=0)
+
+        def respond(method, url, **kwargs):
+            if method == 'GET':
+                return make_response(json_body=template_response())
+            return make_response(status_code=500, json_body={'message': 'boom'})
+
+        with mock.patch.object(client.session, 'request', side_effect=respond):
+            with pytest.raises(ServerError):
+                client.documents.generate('template-123', {}, response_type='pdf')
+        assert client.documents.pdf_cache.stats()['stores'] == 0
+
+    def test_bypassed_for_other_response_types(self, tmp_path, make_response):
+        """Test that only PDF responses use the cache"""
+        client = Docstron(api_key='test-key', pdf_cache=str(tmp_path))
+        response = {'data': {'document_id': 'doc-1'}}
+        with mock.patch.object(
+            client.session,
+            'request',
+            side_effect=lambda *a, **k: make_response(json_body=response),
+        ) as request:
+            client.documents.generate('template-123', {})
+            client.documents.generate('template-123', {})
+        assert request.call_count == 2
+        assert client.documents.pdf_cache.stats()['stores'] == 0
+
+    def test_cache_false(self, tmp_path, make_response):
+        """Test that cache=False always generates"""
+        client, respond = self.make_client(tmp_path, make_response)
+        with mock.patch.object(
+            client.session, 'request', side_effect=respond
+        ) as request:
+            for _ in range(2):
+                client.documents.generate(
+                    'template-123', {}, response_type='pdf', cache=False
+                )
+        assert request.call_count == 2
+
+    def test_quick_generate(self, tmp_path, make_response):
+        """Test that unsaved quick generations are cached by content"""
+        client = Docstron(api_key='test-key', pdf_cache=str(tmp_path))
+        with mock.patch.object(
+            client.session,
+            'request',
+            side_effect=lambda *a, **k: make_response(content=PDF),
+        ) as request:
+            for _ in range(2):
+                client.documents.quick_generate(
+                    html='<p>{{name}}</p>', data={'name': 'x'}, response_type='pdf'
+                )
+        assert request.call_count == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
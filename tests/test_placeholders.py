@@ -0,0 +1,212 @@
+"""
+Unit tests for placeholder extraction and pre-flight validation
+"""
+
+import asyncio
+from unittest import mock
+
+import pytest
+from docstron import AsyncDocstron, Docstron
+from docstron.exceptions import ValidationError
+from docstron.placeholders import extract_placeholders, missing_placeholders
+from docstron.placeholders import validate_data
+
+TEMPLATE = {
+    'success': True,
+    'data': {
+        'template_id': 'template-123',
+        'content': '<h1>{{ customer.name }}</h1><p>{{amount}}</p>',
+        'extra_css': '.x { content: "{{ footer }}"; }',
+    },
+}
+
+
+class TestExtractPlaceholders:
+    """Test parsing placeholders out of template content"""
+
+    def test_extracts_names(self):
+        """Test that plain and spaced placeholders are found"""
+        names = extract_placeholders('<p>{{name}} {{ amount }} {{name}}</p>')
+        assert names == frozenset({'name', 'amount'})
+
+    def test_dotted_names(self):
+        """Test that dotted placeholders are kept whole"""
+        assert extract_placeholders('{{ customer.address.city }}') == frozenset(
+            {'customer.address.city'}
+        )
+
+    def test_ignores_malformed(self):
+        """Test that text that is not a placeholder is ignored"""
+        assert extract_placeholders('{{ 1abc }} { name } {{}}') == frozenset()
+
+    def test_block_scopes(self):
+        """Test that names inside each/with blocks are not top-level data"""
+        content = (
+            '{{#each items}}{{this.sku}} {{qty}}'
+            '{{#each tags}}{{label}}{{/each}}{{price}}{{/each}}'
+            '{{#with customer}}{{name}}{{/with}}'
+            '{{#if paid}}{{paid_on}}{{else}}{{due}}{{/if}} {{total}}'
+        )
+        assert extract_placeholders(content) == frozenset({'paid_on', 'due', 'total'})
+
+
+class TestValidateData:
+    """Test checking data against placeholders"""
+
+    def test_missing_sorted(self):
+        """Test that missing names are reported sorted"""
+        assert missing_placeholders(frozenset({'b', 'a', 'c'}), {'c': 1}) == [
+            'a',
+            'b',
+        ]
+
+    def test_nested_and_flat_keys(self):
+        """Test that dotted names match nested dicts or literal keys"""
+        names = frozenset({'customer.name', 'order.id'})
+        data = {'customer': {'name': 'John'}, 'order.id': 7}
+        assert missing_placeholders(names, data) == []
+
+    def test_raises_validation_error(self):
+        """Test that missing data raises ValidationError locally"""
+        with pytest.raises(ValidationError) as exc_info:
+            validate_data(frozenset({'amount'}), None, 'template-123')
+        assert exc_info.value.status_code is None
+        assert exc_info.value.response == {'missing': ['amount']}
+        assert 'template-123' in str(exc_info.value)
+
+
+class TestTemplatePlaceholders:
+    """Test the templates.placeholders resource method"""
+
+    def test_fetches_once(self, make_response):
+        """Test that the template is fetched and parsed once"""
+        client = Docstron(api_key='test-key')
+        with mock.patch.object(
+            client.session,
+            'request',
+            side_effect=lambda *a, **k: make_response(json_body=TEMPLATE),
+        ) as request:
+            first = client.templates.placeholders('template-123')
+            second = client.templates.placeholders('template-123')
+        assert first == frozenset({'customer.name', 'amount', 'footer'})
+        assert second is first
+        assert request.call_count == 1
+
+    def test_update_forgets(self, make_response):
+        """Test that updating a template drops its parsed placeholders"""
+        client = Docstron(api_key='test-key')
+        with mock.patch.object(
+            client.session,
+            'request',
+            side_effect=lambda *a, **k: make_response(json_body=TEMPLATE),
+        ) as request:
+            client.templates.placeholders('template-123')
+            client.templates.update('template-123', content='<p>{{x}}</p>')
+            client.templates.placeholders('template-123')
+        assert request.call_count == 3
+
+    def test_refetched_template_reparsed(self, make_response):
+        """Test that placeholders follow a template edited elsewhere"""
+        client = Docstron(api_key='test-key')
+        edited = {'data': {'template_id': 'template-123', 'content': '{{x}}'}}
+        with mock.patch.object(
+            client.session,
+            'request',
+            side_effect=[
+                make_response(json_body=TEMPLATE),
+                make_response(json_body=edited),
+            ],
+        ):
+            client.templates.placeholders('template-123')
+            client.templates.get('template-123')
+            assert client.templates.placeholders('template-123') == {'x'}
+
+    def test_bounded_by_metadata_cache(self, make_response):
+        """Test that cached names expire with the metadata cache"""
+        client = Docstron(api_key='test-key', metadata_cache_ttl=60)
+        edited = {'data': {'template_id': 'template-123', 'content': '{{x}}'}}
+        with mock.patch.object(
+            client.session,
+            'request',
+            side_effect=[
+                make_response(json_body=TEMPLATE),
+                make_response(json_body=edited),
+            ],
+        ) as request:
+            first = client.templates.placeholders('template-123')
+            assert client.templates.placeholders('template-123') is first
+            assert request.call_count == 1
+            client.templates.cache.clear()  # as if the TTL had passed
+            assert client.templates.placeholders('template-123') == {'x'}
+
+
+class TestGenerateValidation:
+    """Test validate=True on document generation"""
+
+    def test_generate_rejects_without_request(self, make_response):
+        """Test that invalid data fails before the generate request"""
+        client = Docstron(api_key='test-key')
+        with mock.patch.object(
+            client.session,
+            'request',
+            side_effect=lambda *a, **k: make_response(json_body=TEMPLATE),
+        ) as request:
+            with pytest.raises(ValidationError) as exc_info:
+                client.documents.generate('template-123', {'amount': 1}, validate=True)
+        assert exc_info.value.response['missing'] == ['customer.name', 'footer']
+        assert request.call_count == 1
+        assert request.call_args[0][0] == 'GET'
+
+    def test_generate_many_reports_per_row(self, make_response):
+        """Test that invalid rows fail individually and are never sent"""
+        client = Docstron(api_key='test-key')
+        generated = {'success': True, 'data': {'document_id': 'doc-1'}}
+        good = {'customer': {'name': 'John'}, 'amount': 1, 'footer': ''}
+        with mock.patch.object(
+            client.session,
+            'request',
+            side_effect=[
+                make_response(json_body=TEMPLATE),
+                make_response(json_body=generated),
+            ],
+        ) as request:
+            outcomes = list(
+                client.documents.generate_many(
+                    'template-123', [good, {'amount': 1}], validate=True
+                )
+            )
+        assert outcomes[0].ok
+        assert isinstance(outcomes[1].error, ValidationError)
+        assert request.call_count == 2
+
+    def test_quick_generate_validates_locally(self):
+        """Test that quick_generate validates against its own HTML"""
+        client = Docstron(api_key='test-key')
+        with mock.patch.object(client.session, 'request') as request:
+            with pytest.raises(ValidationError):
+                client.documents.quick_generate(
+                    html='<p>{{ name }}</p>', data={}, validate=True
+                )
+        request.assert_not_called()
+
+    def test_async_generate_rejects(self, make_response):
+        """Test that the async client validates before sending"""
+        pytest.importorskip('httpx')
+
+        async def run():
+            client = AsyncDocstron(api_key='test-key')
+            with mock.patch.object(
+                client.templates,
+                'get',
+                mock.AsyncMock(return_value=TEMPLATE),
+            ), mock.patch.object(client, 'post', mock.AsyncMock()) as post:
+                with pytest.raises(ValidationError):
+                    await client.documents.generate('template-123', {}, validate=True)
+                post.assert_not_called()
+            await client.aclose()
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,220 @@
+"""
+Unit tests for adaptive document polling
+"""
+
+import asyncio
+import threading
+from collections import Counter
+
+import pytest
+from docstron import Docstron
+from docstron.exceptions import (
+    DocumentFailedError,
+    NotFoundError,
+    ServerError,
+    WaitTimeoutError,
+)
+from docstron.polling import PollBackoff, PollScheduler, document_state
+
+
+def fake_documents(ready_after, failed=()):
+    """
+    ``documents.get`` stand-in: each ID is pending for ``ready_after[id]``
+    polls, then completed (or failed)
+    """
+    polls = Counter()
+    lock = threading.Lock()
+
+    def get(document_id):
+        with lock:
+            polls[document_id] += 1
+            count = polls[document_id]
+        if document_id.startswith('missing'):
+            raise NotFoundError('Document not found', status_code=404)
+        if count <= ready_after.get(document_id, 0):
+            return {'data': {'document_id': document_id, 'status': 'processing'}}
+        status = 'failed' if document_id in failed else 'completed'
+        return {'data': {'document_id': document_id, 'status': status}}
+
+    return get, polls
+
+
+def quick_client(get):
+    """Client whose documents.get is ``get`` and whose backoff is tiny"""
+    client = Docstron(api_key='test-key')
+    client.documents.get = get
+    client.documents.poll_backoff = PollBackoff(initial=0.001, max_interval=0.005)
+    return client
+
+
+class TestPollBackoff:
+    """Test the poll schedule"""
+
+    def test_grows_to_cap(self):
+        """Test that delays start short and grow up to the cap"""
+        backoff = PollBackoff(initial=0.25, factor=2, max_interval=1, jitter=0)
+        assert [backoff.interval(n) for n in range(1, 5)] == [0.25, 0.5, 1, 1]
+
+    def test_jitter_bounded(self):
+        """Test that jitter stays within its fraction"""
+        backoff = PollBackoff(initial=1, max_interval=1, jitter=0.1)
+        assert all(0.9 <= backoff.interval(3) <= 1.1 for _ in range(100))
+
+
+class TestDocumentState:
+    """Test classifying documents.get responses"""
+
+    def test_states(self):
+        """Test ready, failed, pending and status-less documents"""
+        assert document_state({'data': {'status': 'Completed'}}) == 'ready'
+        assert document_state({'data': {'status': 'failed'}}) == 'failed'
+        assert document_state({'data': {'status': 'processing'}}) == 'pending'
+        assert document_state({'data': {'document_id': 'doc-1'}}) == 'ready'
+
+
+class TestWaitUntilReady:
+    """Test waiting for documents"""
+
+    def test_yields_in_completion_order(self):
+        """Test that each document is yielded as soon as it is ready"""
+        get, polls = fake_documents({'slow': 5, 'fast': 0})
+        client = quick_client(get)
+        outcomes = list(client.documents.wait_until_ready(['slow', 'fast']))
+        assert [o.item for o in outcomes] == ['fast', 'slow']
+        assert [o.index for o in outcomes] == [1, 0]
+        assert all(o.ok for o in outcomes)
+        assert polls == {'fast': 1, 'slow': 6}
+
+    def test_failures_reported_per_document(self):
+        """Test failed and missing documents end with an error"""
+        get, _ = fake_documents({'bad': 1}, failed={'bad'})
+        client = quick_client(get)
+        outcomes = {
+            o.item: o
+            for o in client.documents.wait_until_ready(['ok', 'bad', 'missing-1'])
+        }
+        assert outcomes['ok'].ok
+        assert isinstance(outcomes['bad'].error, DocumentFailedError)
+        assert isinstance(outcomes['missing-1'].error, NotFoundError)
+
+    def test_transient_errors_keep_polling(self):
+        """Test that server errors do not end the wait"""
+        calls = []
+
+        def get(document_id):
+            calls.append(document_id)
+            if len(calls) < 3:
+                raise ServerError('Bad gateway', status_code=502)
+            return {'data': {'status': 'completed'}}
+
+        client = quick_client(get)
+        assert client.documents.wait_for('doc-1', timeout=5) == {
+            'data': {'status': 'completed'}
+        }
+        assert len(calls) == 3
+
+    def test_timeout(self):
+        """Test that documents still pending at the deadline time out"""
+        get, _ = fake_documents({'never': 10**9})
+        client = quick_client(get)
+        with pytest.raises(WaitTimeoutError):
+            client.documents.wait_for('never', timeout=0.05)
+        # the abandoned document is no longer polled
+        assert client.documents.poller._watches == {}
+
+    def test_shared_across_threads(self):
+        """Test that threads waiting on one document share its polls"""
+        get, polls = fake_documents({'doc-1': 20})
+        client = quick_client(get)
+        results = []
+
+        def wait():
+            results.append(client.documents.wait_for('doc-1', timeout=5))
+
+        threads = [threading.Thread(target=wait) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(results) == 8
+        # one poll loop, not eight
+        assert polls['doc-1'] < 2 * 21
+
+    def test_scheduler_concurrency_validated(self):
+        """Test that the scheduler needs at least one concurrent poll"""
+        with pytest.raises(ValueError):
+            PollScheduler(lambda document_id: {}, concurrency=0)
+
+
+class TestAsyncWaitUntilReady:
+    """Test waiting for documents with the async client"""
+
+    def test_wait(self):
+        """Test completion order, shared polls and timeouts"""
+        pytest.importorskip('httpx')
+        from docstron import AsyncDocstron
+
+        sync_get, polls = fake_documents({'slow': 3, 'never': 10**9})
+
+        async def get(document_id):
+            return sync_get(document_id)
+
+        async def run():
+            client = AsyncDocstron(api_key='test-key')
+            client.documents.get = get
+            client.documents.poll_backoff = PollBackoff(
+                initial=0.001, max_interval=0.005
+            )
+            waits = [
+                client.documents.wait_until_ready(['slow', 'fast']),
+                client.documents.wait_until_ready(['slow']),
+            ]
+
+            async def collect(outcomes):
+                return [outcome async for outcome in outcomes]
+
+            first, second = await asyncio.gather(*(collect(w) for w in waits))
+            with pytest.raises(WaitTimeoutError):
+                await client.documents.wait_for('never', timeout=0.02)
+            await client.aclose()
+            return first, second, client.documents._polls
+
+        first, second, running = asyncio.run(run())
+        assert [o.item for o in first] == ['fast', 'slow']
+        assert second[0].ok
+        assert polls['slow'] == 4
+        assert running == {}
+
+    def test_network_error_keeps_polling(self):
+        """Test that an httpx connection error only delays the next poll"""
+        httpx = pytest.importorskip('httpx')
+        from docstron import AsyncDocstron
+
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            if len(calls) == 1:
+                raise httpx.ConnectError('connection reset', request=request)
+            return httpx.Response(
+                200, json={'data': {'document_id': 'doc-1', 'status': 'completed'}}
+            )
+
+        async def run():
+            http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            client = AsyncDocstron(
+                api_key='test-key', http_client=http_client, max_retries=0
+            )
+            client.documents.poll_backoff = PollBackoff(
+                initial=0.001, max_interval=0.005
+            )
+            response = await client.documents.wait_for('doc-1', timeout=5)
+            await client.aclose()
+            return response
+
+        assert asyncio.run(run())['data']['status'] == 'completed'
+        assert len(calls) == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,105 @@
+"""
+Unit tests for client-side rate limiting
+"""
+
+import threading
+from unittest import mock
+
+import pytest
+from docstron import Docstron, FileTokenBucket, TokenBucket
+from docstron.ratelimit import parse_rate_limit
+
+
+class TestParseRateLimit:
+    """Test parsing of plan rate limits"""
+
+    def test_bare_number_is_per_minute(self):
+        """Test that bare numbers are requests per minute"""
+        assert parse_rate_limit(120) == 2.0
+
+    def test_units(self):
+        """Test strings that name a unit"""
+        assert parse_rate_limit('10/s') == 10.0
+        assert parse_rate_limit('60 requests per minute') == 1.0
+        assert parse_rate_limit('3600/hour') == 1.0
+
+    def test_invalid(self):
+        """Test that unparseable limits are rejected"""
+        with pytest.raises(ValueError):
+            parse_rate_limit('lots')
+
+
+class TestTokenBucket:
+    """Test the token bucket limiter"""
+
+    def test_burst_then_wait(self):
+        """Test that requests beyond the burst must wait"""
+        bucket = TokenBucket(rate=10, burst=2)
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+
+    def test_reservations_are_spread(self):
+        """Test that concurrent waiters are released one interval apart"""
+        bucket = TokenBucket(rate=100, burst=1)
+        waits = []
+        lock = threading.Lock()
+
+        def worker():
+            wait = bucket.reserve()
+            with lock:
+                waits.append(wait)
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(waits) == pytest.approx([0.0, 0.01, 0.02, 0.03, 0.04], abs=0.005)
+
+    def test_file_bucket_shared_state(self, tmp_path):
+        """Test that two buckets on one file share a budget"""
+        path = str(tmp_path / 'bucket')
+        first = FileTokenBucket(path, rate=10, burst=1)
+        second = FileTokenBucket(path, rate=10, burst=1)
+        assert first.reserve() == 0.0
+        assert second.reserve() == pytest.approx(0.1, abs=0.01)
+
+
+class TestClientRateLimit:
+    """Test rate limiting wired into the client"""
+
+    def test_numeric_rate_limit(self):
+        """Test that a plan-style limit builds a limiter with headroom"""
+        client = Docstron(api_key='test-key', rate_limit=600)
+        assert client.rate_limiter.rate == pytest.approx(9.0)
+
+    def test_limiter_used_per_request(self, make_response):
+        """Test that each request takes a token"""
+        limiter = mock.Mock(spec=TokenBucket)
+        client = Docstron(api_key='test-key', rate_limit=limiter)
+        with mock.patch.object(
+            client.session, 'request',
+            return_value=make_response(json_body={'data': []}),
+        ):
+            client.templates.list()
+            client.templates.list()
+        assert limiter.acquire.call_count == 2
+
+    def test_auto_configures_from_usage(self, make_response):
+        """Test that rate_limit='auto' reads api_rate_limit before the first call"""
+        client = Docstron(api_key='test-key', rate_limit='auto')
+        usage = make_response(
+            json_body={'data': {'subscription': {'api_rate_limit': 300}}}
+        )
+        listing = make_response(json_body={'data': []})
+        with mock.patch.object(
+            client.session, 'request', side_effect=[usage, listing]
+        ) as request:
+            client.templates.list()
+        assert request.call_args_list[0].args[1].endswith('/usage')
+        assert client.rate_limiter.rate == pytest.approx(4.5)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
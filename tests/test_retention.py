@@ -0,0 +1,215 @@
+"""
+Unit tests for bulk deletion and retention sweeps
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from docstron import Docstron
+from docstron.exceptions import NotFoundError, ServerError
+from docstron.journal import CheckpointJournal
+from docstron.retention import parse_timestamp, resolve_cutoff, sweep_matcher
+
+NOW = datetime.now(timezone.utc)
+
+
+def timestamp(days_ago):
+    """API-style timestamp ``days_ago`` days in the past"""
+    moment = NOW - timedelta(days=days_ago)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def fake_account(documents, failing=()):
+    """
+    ``documents._list_page`` and ``documents.delete`` stand-ins over a list
+    of documents; IDs starting with ``missing`` are already gone (404)
+    """
+    deleted = []
+    lock = threading.Lock()
+
+    def list_page(params):
+        offset, limit = params.get('offset', 0), params['limit']
+        return {'data': documents[offset : offset + limit]}
+
+    def delete(document_id):
+        if document_id in failing:
+            raise ServerError('Internal error', status_code=500)
+        if document_id.startswith('missing'):
+            raise NotFoundError('Document not found', status_code=404)
+        with lock:
+            deleted.append(document_id)
+        return {'success': True, 'message': 'Document deleted successfully'}
+
+    return list_page, delete, deleted
+
+
+def fake_client(documents, failing=()):
+    """Client whose document listing and deletion are served locally"""
+    list_page, delete, deleted = fake_account(documents, failing)
+    client = Docstron(api_key='test-key')
+    client.documents._list_page = list_page
+    client.documents.delete = delete
+    return client, deleted
+
+
+class TestRetentionHelpers:
+    """Test cutoff and timestamp handling"""
+
+    def test_parse_timestamp(self):
+        """Test API timestamps, naive timestamps and garbage"""
+        parsed = parse_timestamp('2024-12-02T10:15:30.000000Z')
+        assert parsed == datetime(2024, 12, 2, 10, 15, 30, tzinfo=timezone.utc)
+        assert parse_timestamp('2024-12-02T10:15:30').tzinfo is timezone.utc
+        assert parse_timestamp('yesterday') is None
+        assert parse_timestamp(None) is None
+
+    def test_resolve_cutoff(self):
+        """Test ages in seconds or timedelta and absolute datetimes"""
+        assert resolve_cutoff(60, now=NOW) == NOW - timedelta(seconds=60)
+        assert resolve_cutoff(timedelta(days=1), now=NOW) == NOW - timedelta(days=1)
+        naive = datetime(2024, 1, 1)
+        assert resolve_cutoff(naive) == naive.replace(tzinfo=timezone.utc)
+
+    def test_matcher_skips_unreadable_timestamps(self):
+        """Test that documents without a timestamp are never swept by age"""
+        matches = sweep_matcher(timedelta(days=30), None, 'created_at')
+        assert matches({'created_at': timestamp(31)})
+        assert not matches({'created_at': timestamp(29)})
+        assert not matches({})
+
+
+class TestDeleteMany:
+    """Test concurrent bulk deletion"""
+
+    def test_deletes_all(self):
+        """Test that every ID is deleted and reported"""
+        client, deleted = fake_client([])
+        ids = [f'doc-{n}' for n in range(20)]
+        outcomes = list(client.documents.delete_many(ids, concurrency=4))
+        assert sorted(o.item for o in outcomes) == sorted(ids)
+        assert all(o.ok for o in outcomes)
+        assert sorted(deleted) == sorted(ids)
+
+    def test_not_found_is_success(self):
+        """Test that documents already gone count as deleted"""
+        client, _ = fake_client([])
+        (outcome,) = client.documents.delete_many(['missing-1'])
+        assert outcome.ok
+        assert outcome.result['already_deleted'] is True
+
+    def test_failures_reported(self):
+        """Test that other errors are reported per document"""
+        client, deleted = fake_client([], failing={'doc-2'})
+        outcomes = {o.item: o for o in client.documents.delete_many(['doc-1', 'doc-2'])}
+        assert outcomes['doc-1'].ok
+        assert isinstance(outcomes['doc-2'].error, ServerError)
+        assert deleted == ['doc-1']
+
+    def test_resume_from_journal(self, tmp_path):
+        """Test that a rerun skips deleted IDs and retries failed ones"""
+        journal = tmp_path / 'deleted.jsonl'
+        ids = ['doc-1', 'doc-2', 'doc-3']
+        client, deleted = fake_client([], failing={'doc-2'})
+        list(client.documents.delete_many(ids, journal=journal))
+        assert sorted(deleted) == ['doc-1', 'doc-3']
+
+        client, deleted = fake_client([])
+        outcomes = list(client.documents.delete_many(ids, journal=journal))
+        assert [o.item for o in outcomes] == ['doc-2']
+        assert deleted == ['doc-2']
+        with CheckpointJournal(journal) as reopened:
+            assert reopened.completed == 3
+
+
+class TestSweep:
+    """Test retention sweeps over the document listing"""
+
+    DOCUMENTS = [
+        {'document_id': 'old-1', 'template_id': 't-1', 'created_at': timestamp(100)},
+        {'document_id': 'old-2', 'template_id': 't-2', 'created_at': timestamp(95)},
+        {'document_id': 'new-1', 'template_id': 't-1', 'created_at': timestamp(1)},
+        {
+            'document_id': 'missing-1',
+            'template_id': 't-1',
+            'created_at': timestamp(200),
+        },
+    ]
+
+    def test_older_than(self):
+        """Test that only documents past the age are deleted"""
+        client, deleted = fake_client(self.DOCUMENTS)
+        report = client.documents.sweep(older_than=timedelta(days=90), page_size=2)
+        assert sorted(deleted) == ['old-1', 'old-2']
+        assert report.matched == 3
+        assert (report.deleted, report.already_deleted, report.failed) == (2, 1, 0)
+
+    def test_filter_and_progress(self):
+        """Test combining a filter with the age and reporting progress"""
+        client, deleted = fake_client(self.DOCUMENTS)
+        seen = []
+        report = client.documents.sweep(
+            older_than=90 * 86400,
+            filter=lambda doc: doc['template_id'] == 't-1',
+            progress=lambda r: seen.append(r.done),
+        )
+        assert deleted == ['old-1']
+        assert seen == [1, 2]
+        assert report.done == report.matched == 2
+
+    def test_dry_run(self):
+        """Test that a dry run only counts matching documents"""
+        client, deleted = fake_client(self.DOCUMENTS)
+        report = client.documents.sweep(filter=lambda doc: True, dry_run=True)
+        assert report.matched == 4
+        assert report.dry_run
+        assert deleted == []
+
+    def test_needs_a_rule(self):
+        """Test that sweeping without any rule is refused"""
+        client, _ = fake_client(self.DOCUMENTS)
+        with pytest.raises(ValueError):
+            client.documents.sweep()
+
+
+class TestAsyncSweep:
+    """Test bulk deletion with the async client"""
+
+    def test_sweep(self, tmp_path):
+        """Test an async sweep and resuming from its journal"""
+        pytest.importorskip('httpx')
+        from docstron import AsyncDocstron
+
+        list_page, delete, deleted = fake_account(TestSweep.DOCUMENTS)
+
+        async def alist_page(params):
+            return list_page(params)
+
+        async def adelete(document_id):
+            return delete(document_id)
+
+        async def run():
+            client = AsyncDocstron(api_key='test-key')
+            client.documents._list_page = alist_page
+            client.documents.delete = adelete
+            report = await client.documents.sweep(
+                older_than=timedelta(days=90), journal=tmp_path / 'sweep.jsonl'
+            )
+            resumed = [
+                o.item
+                async for o in client.documents.delete_many(
+                    ['old-1', 'old-2', 'old-3'], journal=tmp_path / 'sweep.jsonl'
+                )
+            ]
+            await client.aclose()
+            return report, resumed
+
+        report, resumed = asyncio.run(run())
+        assert (report.deleted, report.already_deleted) == (2, 1)
+        assert resumed == ['old-3']
+        assert sorted(deleted) == ['old-1', 'old-2', 'old-3']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,126 @@
+"""
+Unit tests for automatic retries
+"""
+
+from unittest import mock
+
+import pytest
+import requests
+from docstron import Docstron, RetryPolicy
+from docstron.exceptions import RateLimitError, ServerError
+
+
+class TestRetryPolicy:
+    """Test retry decisions and delays"""
+
+    def test_idempotent_methods(self):
+        """Test that only idempotent methods retry on server errors"""
+        policy = RetryPolicy()
+        assert policy.should_retry_status('GET', 503, attempt=1)
+        assert not policy.should_retry_status('POST', 503, attempt=1)
+        assert policy.should_retry_status('POST', 503, 1, {'Idempotency-Key': 'k'})
+
+    def test_throttling_retried_for_every_method(self):
+        """Test that 429 responses are retried even for POST"""
+        assert RetryPolicy().should_retry_status('POST', 429, attempt=1)
+
+    def test_attempts_are_bounded(self):
+        """Test that retries stop after max_retries"""
+        policy = RetryPolicy(max_retries=2)
+        assert policy.should_retry_status('GET', 503, attempt=2)
+        assert not policy.should_retry_status('GET', 503, attempt=3)
+
+    def test_backoff_is_capped(self):
+        """Test exponential backoff without jitter"""
+        policy = RetryPolicy(backoff_factor=1.0, max_backoff=5.0, jitter=False)
+        assert [policy.backoff(n) for n in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+
+    def test_retry_after_header(self):
+        """Test that Retry-After and rate-limit reset headers are honored"""
+        policy = RetryPolicy()
+        assert policy.delay(1, {'Retry-After': '3'}) == 3.0
+        assert policy.retry_after({'X-RateLimit-Remaining': '0',
+                                   'X-RateLimit-Reset': '7'}) == 7.0
+        assert policy.retry_after({'X-RateLimit-Remaining': '5',
+                                   'X-RateLimit-Reset': '7'}) is None
+
+    def test_retry_after_too_long(self):
+        """Test that very long server-requested waits are not slept through"""
+        policy = RetryPolicy(max_retry_after=10)
+        assert policy.delay(1, {'Retry-After': '600'}) is None
+
+
+class TestClientRetries:
+    """Test retries performed by the client"""
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self):
+        with mock.patch('docstron.base.time.sleep') as sleep:
+            yield sleep
+
+    def test_get_retried_on_server_error(self, make_response):
+        """Test that a GET is retried after a 503"""
+        client = Docstron(api_key='test-key')
+        responses = [
+            make_response(503, json_body={'message': 'Unavailable'}),
+            make_response(200, json_body={'data': {'plan_name': 'Pro'}}),
+        ]
+        with mock.patch.object(client.session, 'request', side_effect=responses) as req:
+            assert client.usage.get() == {'data': {'plan_name': 'Pro'}}
+        assert req.call_count == 2
+
+    def test_post_not_retried_on_server_error(self, make_response, mock_template_id):
+        """Test that a non-idempotent POST surfaces server errors immediately"""
+        client = Docstron(api_key='test-key')
+        response = make_response(500, json_body={'message': 'Boom'})
+        with mock.patch.object(client.session, 'request', return_value=response) as req:
+            with pytest.raises(ServerError):
+                client.documents.generate(mock_template_id, {})
+        assert req.call_count == 1
+
+    def test_post_retried_on_throttling(self, make_response, no_sleep, mock_template_id):
+        """Test that a throttled POST waits for Retry-After and is retried"""
+        client = Docstron(api_key='test-key')
+        responses = [
+            make_response(429, json_body={}, headers={'Retry-After': '2'}),
+            make_response(200, json_body={'data': {'document_id': 'doc-1'}}),
+        ]
+        with mock.patch.object(client.session, 'request', side_effect=responses):
+            result = client.documents.generate(mock_template_id, {})
+        assert result['data']['document_id'] == 'doc-1'
+        no_sleep.assert_called_once_with(2.0)
+
+    def test_rate_limit_error_after_exhaustion(self, make_response):
+        """Test that RateLimitError carries retry_after once retries run out"""
+        client = Docstron(api_key='test-key', max_retries=1)
+        responses = [
+            make_response(429, json_body={}, headers={'Retry-After': '1'})
+            for _ in range(2)
+        ]
+        with mock.patch.object(client.session, 'request', side_effect=responses):
+            with pytest.raises(RateLimitError) as exc_info:
+                client.usage.get()
+        assert exc_info.value.retry_after == 1.0
+
+    def test_connection_error_retried_for_get(self, make_response):
+        """Test that connection errors are retried for idempotent requests"""
+        client = Docstron(api_key='test-key')
+        side_effect = [
+            requests.ConnectionError('reset'),
+            make_response(200, json_body={'data': []}),
+        ]
+        with mock.patch.object(client.session, 'request', side_effect=side_effect):
+            assert client.templates.list() == {'data': []}
+
+    def test_retries_disabled(self, make_response):
+        """Test that max_retries=0 disables retries"""
+        client = Docstron(api_key='test-key', max_retries=0)
+        response = make_response(503, json_body={})
+        with mock.patch.object(client.session, 'request', return_value=response) as req:
+            with pytest.raises(ServerError):
+                client.usage.get()
+        assert req.call_count == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,189 @@
+"""
+Unit tests for coalescing identical concurrent requests
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from docstron import Docstron
+from docstron.exceptions import NotFoundError
+from docstron.singleflight import AsyncSingleFlight, SingleFlight, request_key
+
+CALLERS = 8
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll ``condition`` until it is true or the timeout expires"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('condition not met in time')
+        time.sleep(0.001)
+
+
+class TestRequestKey:
+    """Test request keys"""
+
+    def test_param_order_ignored(self):
+        """Test that query param order does not change the key"""
+        assert request_key('documents', {'limit': 10, 'offset': 0}) == request_key(
+            'documents', {'offset': 0, 'limit': 10}
+        )
+        assert request_key('usage') != request_key('usage', {'a': 1})
+
+
+class TestSingleFlight:
+    """Test the thread-based single flight group"""
+
+    def test_concurrent_callers_share_one_call(self):
+        """Test that concurrent callers run the function once"""
+        flight = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            wait_for(lambda: flight.coalesced == CALLERS - 1)
+            return {'data': {'name': 'Invoice'}}
+
+        with ThreadPoolExecutor(CALLERS) as pool:
+            results = list(pool.map(lambda _: flight.do('k', fetch), range(CALLERS)))
+
+        assert len(calls) == 1
+        assert all(result == {'data': {'name': 'Invoice'}} for result in results)
+        assert len({id(result) for result in results}) == CALLERS
+
+    def test_errors_shared(self):
+        """Test that every waiting caller sees the exception"""
+        flight = SingleFlight()
+
+        def fetch():
+            wait_for(lambda: flight.coalesced == CALLERS - 1)
+            raise NotFoundError('gone', status_code=404)
+
+        def call(_):
+            try:
+                flight.do('k', fetch)
+            except NotFoundError as e:
+                return e.status_code
+
+        with ThreadPoolExecutor(CALLERS) as pool:
+            assert list(pool.map(call, range(CALLERS))) == [404] * CALLERS
+
+    def test_sequential_calls_not_cached(self):
+        """Test that a finished call is not reused"""
+        flight = SingleFlight()
+        counter = iter(range(10))
+        assert flight.do('k', lambda: next(counter)) == 0
+        assert flight.do('k', lambda: next(counter)) == 1
+        assert flight.coalesced == 0
+
+    def test_async_callers_share_one_call(self):
+        """Test that concurrent coroutines await one call"""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return {'n': 1}
+
+        async def run():
+            return await asyncio.gather(
+                *[flight.do('k', fetch) for _ in range(CALLERS)]
+            )
+
+        results = asyncio.run(run())
+        assert len(calls) == 1
+        assert results == [{'n': 1}] * CALLERS
+        assert flight.coalesced == CALLERS - 1
+
+    def test_async_cancelled_caller_does_not_cancel_others(self):
+        """Test that cancelling one waiter leaves the shared call running"""
+        flight = AsyncSingleFlight()
+        release = None
+
+        async def fetch():
+            await release.wait()
+            return 'done'
+
+        async def run():
+            nonlocal release
+            release = asyncio.Event()
+            first = asyncio.ensure_future(flight.do('k', fetch))
+            second = asyncio.ensure_future(flight.do('k', fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            release.set()
+            return await second
+
+        assert asyncio.run(run()) == 'done'
+
+
+class TestClientCoalescing:
+    """Test coalesce_requests on the client"""
+
+    def test_disabled_by_default(self):
+        """Test that coalescing is opt-in"""
+        assert Docstron(api_key='test-key').single_flight is None
+
+    def test_concurrent_gets_share_request(self, make_response):
+        """Test that threads fetching one template cause one HTTP request"""
+        client = Docstron(api_key='test-key', coalesce_requests=True)
+
+        def respond(*args, **kwargs):
+            wait_for(lambda: client.single_flight.coalesced == CALLERS - 1)
+            return make_response(json_body={'data': {'template_id': 't-1'}})
+
+        with mock.patch.object(
+            client.session, 'request', side_effect=respond
+        ) as request:
+            with ThreadPoolExecutor(CALLERS) as pool:
+                results = list(
+                    pool.map(lambda _: client.templates.get('t-1'), range(CALLERS))
+                )
+
+        assert request.call_count == 1
+        assert results == [{'data': {'template_id': 't-1'}}] * CALLERS
+
+    def test_different_params_not_coalesced(self, make_response):
+        """Test that GETs with different params are sent separately"""
+        client = Docstron(api_key='test-key', coalesce_requests=True)
+        with mock.patch.object(
+            client.session,
+            'request',
+            side_effect=lambda *a, **k: make_response(json_body={'data': []}),
+        ) as request:
+            client.get('documents', {'offset': 0})
+            client.get('documents', {'offset': 100})
+        assert request.call_count == 2
+
+    def test_async_client(self):
+        """Test that the async client coalesces concurrent GETs"""
+        httpx = pytest.importorskip('httpx')
+        from docstron import AsyncDocstron
+
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, json={'data': {'plan_name': 'Pro'}})
+
+        async def run():
+            http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with AsyncDocstron(
+                api_key='test-key', http_client=http_client, coalesce_requests=True
+            ) as client:
+                return await asyncio.gather(
+                    *[client.usage.get() for _ in range(CALLERS)]
+                )
+
+        results = asyncio.run(run())
+        assert len(requests_seen) == 1
+        assert results == [{'data': {'plan_name': 'Pro'}}] * CALLERS
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
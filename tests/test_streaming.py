@@ -0,0 +1,173 @@
+"""
+Unit tests for streaming downloads
+"""
+
+import base64
+import io
+import json
+import os
+from unittest import mock
+
+import pytest
+from docstron import Docstron
+from docstron.exceptions import DocstronError, NotFoundError, ResponseTooLargeError
+from docstron.streaming import Base64FieldExtractor
+
+PDF = b'%PDF-1.7 ' + b'x' * 200_000
+
+
+class TestStreamingDownloads:
+    """Test chunked downloads to paths and file objects"""
+
+    def test_download_stream_to_path(self, tmp_path, make_response, mock_document_id):
+        """Test streaming a download to a path"""
+        client = Docstron(api_key='test-key')
+        target = tmp_path / 'out.pdf'
+        with mock.patch.object(
+            client.session, 'request', return_value=make_response(content=PDF)
+        ) as get:
+            written = client.documents.download(
+                mock_document_id, output_path=str(target), stream=True
+            )
+        assert get.call_args.kwargs['stream'] is True
+        assert written == len(PDF)
+        assert target.read_bytes() == PDF
+        assert os.listdir(tmp_path) == ['out.pdf']
+
+    def test_download_stream_to_file_object(self, make_response, mock_document_id):
+        """Test streaming a download to a writable file object"""
+        client = Docstron(api_key='test-key')
+        buffer = io.BytesIO()
+        with mock.patch.object(
+            client.session, 'request', return_value=make_response(content=PDF)
+        ):
+            client.documents.download(mock_document_id, output_path=buffer, stream=True)
+        assert buffer.getvalue() == PDF
+
+    def test_generate_pdf_stream(self, tmp_path, make_response, mock_template_id):
+        """Test that generate streams pdf responses when output_path is given"""
+        client = Docstron(api_key='test-key')
+        target = tmp_path / 'generated.pdf'
+        with mock.patch.object(
+            client.session, 'request', return_value=make_response(content=PDF)
+        ):
+            written = client.documents.generate(
+                mock_template_id, {}, response_type='pdf', output_path=target
+            )
+        assert written == len(PDF)
+        assert target.read_bytes() == PDF
+
+    def test_max_size_leaves_no_partial_file(
+        self, tmp_path, make_response, mock_document_id
+    ):
+        """Test that an oversized download raises and removes the temp file"""
+        client = Docstron(api_key='test-key')
+        with mock.patch.object(
+            client.session, 'request', return_value=make_response(content=PDF)
+        ):
+            with pytest.raises(ResponseTooLargeError):
+                client.documents.download(
+                    mock_document_id,
+                    output_path=str(tmp_path / 'big.pdf'),
+                    stream=True,
+                    max_size=1024,
+                )
+        assert os.listdir(tmp_path) == []
+
+    def test_content_length_checked_up_front(self, make_response, mock_document_id):
+        """Test that a declared Content-Length over max_size is rejected"""
+        client = Docstron(api_key='test-key')
+        response = make_response(content=PDF, headers={'Content-Length': str(len(PDF))})
+        with mock.patch.object(client.session, 'request', return_value=response):
+            with pytest.raises(ResponseTooLargeError):
+                next(client.documents.iter_download(mock_document_id, max_size=10))
+
+    def test_stream_error_response(self, make_response, mock_document_id):
+        """Test that error statuses raise the matching exception when streaming"""
+        client = Docstron(api_key='test-key')
+        response = make_response(404, json_body={'message': 'Document not found'})
+        with mock.patch.object(client.session, 'request', return_value=response):
+            with pytest.raises(NotFoundError):
+                client.documents.download(
+                    mock_document_id, output_path=io.BytesIO(), stream=True
+                )
+
+    def test_stream_requires_output_path(self, mock_document_id):
+        """Test that stream=True without a destination is rejected"""
+        client = Docstron(api_key='test-key')
+        with pytest.raises(ValueError):
+            client.documents.download(mock_document_id, stream=True)
+
+
+def feed_in_chunks(body, chunk_size, **kwargs):
+    """Run a Base64FieldExtractor over ``body`` split into chunks"""
+    out = bytearray()
+    extractor = Base64FieldExtractor(out.extend, **kwargs)
+    for start in range(0, len(body), chunk_size):
+        extractor.feed(body[start:start + chunk_size])
+    return bytes(out), extractor.close()
+
+
+class TestBase64FieldExtractor:
+    """Test incremental decoding of json_with_base64 responses"""
+
+    @pytest.mark.parametrize('chunk_size', [1, 3, 1000, 1_000_000])
+    def test_decodes_across_chunk_boundaries(self, chunk_size):
+        """Test that the PDF and metadata survive any chunking"""
+        body = json.dumps({
+            'success': True,
+            'data': {'document_id': 'doc-1', 'pdf': base64.b64encode(PDF).decode()},
+            'message': 'Generated "ok"',
+        }).encode()
+        pdf, metadata = feed_in_chunks(body, chunk_size)
+        assert pdf == PDF
+        assert metadata == {
+            'success': True,
+            'data': {'document_id': 'doc-1'},
+            'message': 'Generated "ok"',
+        }
+
+    def test_escaped_slashes_and_data_uri(self):
+        """Test JSON-escaped slashes and a data: URI prefix"""
+        encoded = 'data:application/pdf;base64,' + base64.b64encode(PDF).decode()
+        body = json.dumps({'data': {'pdf': encoded}}).replace('/', '\\/').encode()
+        pdf, _ = feed_in_chunks(body, 7)
+        assert pdf == PDF
+
+    def test_missing_field(self):
+        """Test that a response without data.pdf is reported"""
+        with pytest.raises(DocstronError):
+            feed_in_chunks(b'{"data": {"document_id": "doc-1"}}', 4)
+
+    def test_truncated_body(self):
+        """Test that a truncated body is reported"""
+        body = json.dumps({'data': {'pdf': base64.b64encode(PDF).decode()}}).encode()
+        with pytest.raises(DocstronError):
+            feed_in_chunks(body[:-10], 4096)
+
+    def test_max_size(self):
+        """Test that the decoded size is bounded"""
+        body = json.dumps({'data': {'pdf': base64.b64encode(PDF).decode()}}).encode()
+        with pytest.raises(ResponseTooLargeError):
+            feed_in_chunks(body, 4096, max_size=1000)
+
+    def test_generate_json_with_base64_to_path(
+        self, tmp_path, make_response, mock_template_id
+    ):
+        """Test generate decoding the base64 PDF into a file"""
+        client = Docstron(api_key='test-key')
+        response = make_response(json_body={
+            'data': {'document_id': 'doc-1', 'pdf': base64.b64encode(PDF).decode()}
+        })
+        target = tmp_path / 'out.pdf'
+        with mock.patch.object(client.session, 'request', return_value=response):
+            metadata = client.documents.generate(
+                mock_template_id, {}, response_type='json_with_base64',
+                output_path=target,
+            )
+        assert metadata == {'data': {'document_id': 'doc-1'}}
+        assert target.read_bytes() == PDF
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
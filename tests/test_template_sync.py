@@ -0,0 +1,251 @@
+"""
+Unit tests for incremental template directory sync
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+
+import pytest
+from docstron import Docstron
+from docstron.exceptions import DocstronError, ServerError
+from docstron.template_sync import MANIFEST_NAME, content_hash, scan_templates
+
+APP = 'app-1'
+
+
+class FakeTemplates:
+    """In-memory stand-in for the template endpoints, recording every call"""
+
+    def __init__(self, remote=()):
+        self.remote = {t['template_id']: dict(t) for t in remote}
+        self.calls = []
+        self.failing = set()
+        self.hide_ids = False
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create(self, application_id, name, content, is_active=True, extra_css=None):
+        with self._lock:
+            self.calls.append(('create', name))
+            template_id = f'template-{next(self._ids)}'
+        self.remote[template_id] = {
+            'template_id': template_id,
+            'application_id': application_id,
+            'name': name,
+            'content': content,
+            'extra_css': extra_css,
+            'is_active': is_active,
+        }
+        if self.hide_ids:
+            return {'data': {'name': name}}
+        return {'data': {'template_id': template_id}}
+
+    def update(self, template_id, **fields):
+        with self._lock:
+            self.calls.append(('update', template_id, tuple(sorted(fields))))
+        if template_id in self.failing:
+            raise ServerError('Internal error', status_code=500)
+        self.remote[template_id].update(fields)
+        return {'data': self.remote[template_id]}
+
+    def list_page(self, params):
+        with self._lock:
+            self.calls.append(('list',))
+        return {'data': list(self.remote.values())}
+
+
+def fake_client(fake):
+    """Client whose template endpoints are served by ``fake``"""
+    client = Docstron(api_key='test-key')
+    client.templates.create = fake.create
+    client.templates.update = fake.update
+    client.templates._list_page = fake.list_page
+    return client
+
+
+def write(directory, name, text):
+    """Write a template file"""
+    path = directory / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    """Directory with three templates, one of them in a subdirectory"""
+    directory = tmp_path / 'templates'
+    write(directory, 'invoice.html', '<h1>{{customer_name}}</h1>')
+    write(directory, 'invoice.css', '@page { margin: 2cm; }')
+    write(directory, 'receipt.html', '<p>{{amount}}</p>')
+    write(directory, 'letters/welcome.html', '<p>Hi {{name}}</p>')
+    write(directory, 'README.md', 'not a template')
+    return directory
+
+
+class TestScanTemplates:
+    """Test reading templates from disk"""
+
+    def test_scan(self, templates_dir):
+        """Test names, content and optional CSS"""
+        local = scan_templates(templates_dir)
+        assert sorted(local) == ['invoice', 'letters/welcome', 'receipt']
+        assert local['invoice'].extra_css == '@page { margin: 2cm; }'
+        assert local['receipt'].extra_css is None
+        assert local['receipt'].hashes['css'] == content_hash('')
+
+
+class TestTemplateSync:
+    """Test syncing a template directory"""
+
+    def test_first_sync_creates_all(self, templates_dir):
+        """Test that a first sync creates every template and a manifest"""
+        fake = FakeTemplates()
+        report = fake_client(fake).templates.sync(templates_dir, APP)
+        assert sorted(report.created) == ['invoice', 'letters/welcome', 'receipt']
+        assert report.ok and report.requests == 3
+        manifest = json.loads((templates_dir / MANIFEST_NAME).read_text())
+        assert manifest['application_id'] == APP
+        assert set(manifest['templates']) == {'invoice', 'letters/welcome', 'receipt'}
+
+    def test_unchanged_sync_sends_nothing(self, templates_dir):
+        """Test that a sync without changes makes no request at all"""
+        fake = FakeTemplates()
+        client = fake_client(fake)
+        client.templates.sync(templates_dir, APP)
+        fake.calls.clear()
+        report = client.templates.sync(templates_dir, APP)
+        assert fake.calls == []
+        assert report.unchanged == 3 and report.requests == 0
+
+    def test_patches_only_changed_fields(self, templates_dir):
+        """Test that one edited file sends one request with one field"""
+        fake = FakeTemplates()
+        client = fake_client(fake)
+        client.templates.sync(templates_dir, APP)
+        fake.calls.clear()
+        write(templates_dir, 'invoice.css', '@page { margin: 1cm; }')
+        report = client.templates.sync(templates_dir, APP)
+        assert report.updated == ['invoice']
+        assert fake.calls == [('update', 'template-1', ('extra_css',))]
+
+    def test_removed_file_deactivated(self, templates_dir):
+        """Test that removed templates are deactivated once, then reactivated"""
+        fake = FakeTemplates()
+        client = fake_client(fake)
+        client.templates.sync(templates_dir, APP)
+        (templates_dir / 'receipt.html').unlink()
+        report = client.templates.sync(templates_dir, APP)
+        assert report.deactivated == ['receipt']
+        receipt = next(t for t in fake.remote.values() if t['name'] == 'receipt')
+        assert receipt['is_active'] is False
+        assert client.templates.sync(templates_dir, APP).requests == 0
+
+        write(templates_dir, 'receipt.html', '<p>{{amount}}</p>')
+        fake.calls.clear()
+        report = client.templates.sync(templates_dir, APP)
+        assert report.updated == ['receipt']
+        assert fake.calls == [('update', receipt['template_id'], ('is_active',))]
+
+    def test_adopts_existing_templates(self, templates_dir):
+        """Test that without a manifest existing templates are matched by name"""
+        fake = FakeTemplates(
+            [
+                {
+                    'template_id': 'template-old',
+                    'application_id': APP,
+                    'name': 'receipt',
+                    'content': '<p>{{amount}}</p>',
+                    'is_active': True,
+                },
+                {
+                    'template_id': 'template-other',
+                    'application_id': 'app-2',
+                    'name': 'invoice',
+                    'content': '',
+                },
+            ]
+        )
+        report = fake_client(fake).templates.sync(templates_dir, APP)
+        assert sorted(report.created) == ['invoice', 'letters/welcome']
+        assert report.unchanged == 1
+        assert fake.calls.count(('list',)) == 1
+
+    def test_failure_retried_next_sync(self, templates_dir):
+        """Test that a failed update keeps the old manifest entry"""
+        fake = FakeTemplates()
+        client = fake_client(fake)
+        client.templates.sync(templates_dir, APP)
+        write(templates_dir, 'invoice.html', '<h1>{{customer}}</h1>')
+        fake.failing.add('template-1')
+        report = client.templates.sync(templates_dir, APP)
+        assert not report.ok
+        assert isinstance(report.errors['invoice'], ServerError)
+
+        fake.failing.clear()
+        assert client.templates.sync(templates_dir, APP).updated == ['invoice']
+
+    def test_create_without_id_fails(self, templates_dir):
+        """Test that a create response without an ID is never recorded as None"""
+        fake = FakeTemplates()
+        fake.hide_ids = True
+        client = fake_client(fake)
+        report = client.templates.sync(templates_dir, APP)
+        assert report.created == [] and len(report.errors) == 3
+        assert all(isinstance(e, DocstronError) for e in report.errors.values())
+        manifest = json.loads((templates_dir / MANIFEST_NAME).read_text())
+        assert manifest['templates'] == {}
+
+        # The next sync adopts the created templates by name
+        fake.hide_ids = False
+        report = client.templates.sync(templates_dir, APP)
+        assert report.ok and report.created == []
+        assert sum(call[0] == 'create' for call in fake.calls) == 3
+
+    def test_dry_run(self, templates_dir):
+        """Test that a dry run plans without sending or writing anything"""
+        fake = FakeTemplates()
+        report = fake_client(fake).templates.sync(templates_dir, APP, dry_run=True)
+        assert len(report.created) == 3
+        assert [c for c in fake.calls if c[0] != 'list'] == []
+        assert not (templates_dir / MANIFEST_NAME).exists()
+
+
+class TestAsyncTemplateSync:
+    """Test syncing with the async client"""
+
+    def test_sync(self, templates_dir):
+        """Test a first sync followed by a one-file change"""
+        pytest.importorskip('httpx')
+        from docstron import AsyncDocstron
+
+        fake = FakeTemplates()
+
+        async def create(*args, **kwargs):
+            return fake.create(*args, **kwargs)
+
+        async def update(*args, **kwargs):
+            return fake.update(*args, **kwargs)
+
+        async def list_page(params):
+            return fake.list_page(params)
+
+        async def run():
+            client = AsyncDocstron(api_key='test-key')
+            client.templates.create = create
+            client.templates.update = update
+            client.templates._list_page = list_page
+            first = await client.templates.sync(templates_dir, APP)
+            write(templates_dir, 'receipt.html', '<p>{{total}}</p>')
+            second = await client.templates.sync(templates_dir, APP)
+            await client.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert len(first.created) == 3
+        assert second.updated == ['receipt'] and second.unchanged == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,68 @@
+"""
+Unit tests for the in-process fake API
+"""
+
+import pytest
+from docstron import Docstron
+from docstron.exceptions import AuthenticationError, NotFoundError
+from docstron.testing import FakeAPI, FakeTransport, make_pdf
+
+
+@pytest.fixture
+def client():
+    """Client answered by a fake API with small PDFs and 250 documents"""
+    api = FakeAPI(pdf_size=2048, total_items=250)
+    return Docstron(api_key='test-key', transport=FakeTransport(api))
+
+
+class TestFakeAPI:
+    """Test the fake API through a real client"""
+
+    def test_make_pdf(self):
+        """Test that fake PDFs have the requested size"""
+        assert len(make_pdf(2048)) == 2048
+        assert make_pdf(2048).startswith(b'%PDF-1.4')
+
+    def test_generate_response_types(self, client, tmp_path):
+        """Test document IDs, raw PDFs and base64 PDFs"""
+        created = client.documents.generate('template-1', {'name': 'Acme'})
+        assert created['data']['document_id'].startswith('document-')
+        pdf = client.documents.generate('template-1', {}, response_type='pdf')
+        assert len(pdf) == 2048
+        target = tmp_path / 'out.pdf'
+        client.documents.generate(
+            'template-1', {}, response_type='json_with_base64', output_path=target
+        )
+        assert target.read_bytes() == pdf
+
+    def test_pagination(self, client):
+        """Test that list pages add up to the total"""
+        assert len(list(client.documents.iter(page_size=100))) == 250
+        assert len(client.templates.list(limit=10)['data']) == 10
+
+    def test_errors(self, client):
+        """Test 404s for missing IDs and 401 without an API key"""
+        with pytest.raises(NotFoundError):
+            client.templates.get('missing-template')
+        with pytest.raises(NotFoundError):
+            client.documents.download('missing-document')
+        client.session.headers.pop('Authorization')
+        with pytest.raises(AuthenticationError):
+            client.usage.get()
+
+    def test_compressed_body(self):
+        """Test that gzip request bodies are decoded"""
+        client = Docstron(
+            api_key='test-key',
+            transport=FakeTransport(),
+            compression='gzip',
+            compression_threshold=0,
+        )
+        data = {'notes': 'repeated text ' * 100}
+        updated = client.documents.update('document-1', data)
+        assert updated['data']['attributes'] == data
+        assert client.compressor.requests_compressed == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
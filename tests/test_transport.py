@@ -0,0 +1,218 @@
+"""
+Unit tests for the pluggable HTTP transports
+"""
+
+import importlib.util
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+import requests
+from docstron import Docstron
+from docstron.exceptions import NotFoundError
+from docstron.transport import (
+    HTTP2Transport,
+    StreamingResponse,
+    Transport,
+    TransportResponse,
+    Urllib3Transport,
+    build_transport,
+)
+
+PDF = b'%PDF-1.4 ' + b'x' * 100_000
+
+
+class FakeAPI(BaseHTTPRequestHandler):
+    """Tiny stand-in for the Docstron API"""
+
+    protocol_version = 'HTTP/1.1'
+    seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, body, content_type='application/json'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_request(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        FakeAPI.seen.append((self.command, self.path, dict(self.headers), body))
+        if self.path.endswith('/download'):
+            self.reply(200, PDF, 'application/pdf')
+        elif self.path.startswith('/v1/templates/missing'):
+            self.reply(404, json.dumps({'message': 'Template not found'}).encode())
+        else:
+            payload = {'data': {'method': self.command, 'path': self.path}}
+            self.reply(200, json.dumps(payload).encode())
+
+    do_GET = do_POST = do_PATCH = do_DELETE = handle_request
+
+
+@pytest.fixture
+def api_url():
+    """Base URL of a fake API served from a background thread"""
+    FakeAPI.seen = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeAPI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/v1'
+    server.shutdown()
+    server.server_close()
+
+
+class TestBuildTransport:
+    """Test selecting a transport"""
+
+    def test_default_is_requests_session(self):
+        """Test that the default keeps the pooled requests session"""
+        client = Docstron(api_key='test-key')
+        assert isinstance(client.session, requests.Session)
+
+    def test_named_transport(self):
+        """Test that 'urllib3' builds the lean transport with pool options"""
+        client = Docstron(api_key='test-key', transport='urllib3', pool_maxsize=32)
+        assert isinstance(client.session, Urllib3Transport)
+        assert client.session.pool.connection_pool_kw['maxsize'] == 32
+        assert client.session.headers['Authorization'] == 'Bearer test-key'
+
+    def test_instance_used_as_is(self):
+        """Test that a ready-made transport is not replaced"""
+        transport = Urllib3Transport()
+        assert build_transport(transport) is transport
+
+    def test_unknown_transport(self):
+        """Test that unknown names are rejected"""
+        with pytest.raises(ValueError):
+            build_transport('carrier-pigeon')
+
+    def test_interface_is_abstract(self):
+        """Test that the transport and streaming interfaces need subclassing"""
+        with pytest.raises(TypeError):
+            Transport()
+        with pytest.raises(TypeError):
+            StreamingResponse(200, {}, 0.0)
+        response = TransportResponse(200, {}, 0.0, content=b'abcde')
+        assert list(response.iter_content(2)) == [b'ab', b'cd', b'e']
+
+
+class TestUrllib3Transport:
+    """Test the urllib3 transport against a local server"""
+
+    def test_json_requests(self, api_url):
+        """Test GET with params, JSON POST and PATCH"""
+        with Docstron(
+            api_key='test-key', base_url=api_url, transport='urllib3'
+        ) as client:
+            listed = client.get('documents', {'limit': 5, 'cursor': None})
+            created = client.post('documents/generate', {'template_id': 't-1'})
+            client.patch('templates/t-1', {'name': 'Invoice'})
+
+        assert listed['data']['path'] == '/v1/documents?limit=5'
+        assert created['data']['method'] == 'POST'
+        method, path, headers, body = FakeAPI.seen[1]
+        assert headers['Authorization'] == 'Bearer test-key'
+        assert headers['Content-Type'] == 'application/json'
+        assert json.loads(body) == {'template_id': 't-1'}
+        assert FakeAPI.seen[2][0] == 'PATCH'
+
+    def test_errors(self, api_url):
+        """Test that API errors map to the usual exceptions"""
+        client = Docstron(api_key='test-key', base_url=api_url, transport='urllib3')
+        with pytest.raises(NotFoundError):
+            client.templates.get('missing')
+
+    def test_download_and_stream(self, api_url, tmp_path):
+        """Test buffered and streamed binary downloads"""
+        client = Docstron(api_key='test-key', base_url=api_url, transport='urllib3')
+        assert client.download('documents/doc-1/download') == PDF
+        target = tmp_path / 'out.pdf'
+        assert client.download_to('documents/doc-1/download', target) == len(PDF)
+        assert target.read_bytes() == PDF
+        # the streamed connection went back to the pool
+        assert client.get('usage')['data']['path'] == '/v1/usage'
+
+    def test_multipart(self, api_url):
+        """Test that files are sent as multipart form data"""
+        client = Docstron(api_key='test-key', base_url=api_url, transport='urllib3')
+        client.post(
+            'templates',
+            data={'name': 'Invoice'},
+            files={'file': ('invoice.html', b'<p>{{name}}</p>', 'text/html')},
+        )
+        _, _, headers, body = FakeAPI.seen[0]
+        assert headers['Content-Type'].startswith('multipart/form-data; boundary=')
+        assert b'filename="invoice.html"' in body
+        assert b'<p>{{name}}</p>' in body
+
+    def test_connection_error(self):
+        """Test that network failures surface as requests exceptions"""
+        client = Docstron(
+            api_key='test-key',
+            base_url='http://127.0.0.1:9/v1',
+            transport='urllib3',
+            max_retries=0,
+        )
+        with pytest.raises(requests.ConnectionError):
+            client.get('usage')
+
+
+class TestHTTP2Transport:
+    """Test the httpx-backed transport"""
+
+    def test_through_httpx(self, api_url):
+        """Test requests and downloads through an injected httpx client"""
+        httpx = pytest.importorskip('httpx')
+        transport = HTTP2Transport(http_client=httpx.Client())
+        with Docstron(
+            api_key='test-key', base_url=api_url, transport=transport
+        ) as client:
+            assert client.get('usage', {'a': 1})['data']['path'] == '/v1/usage?a=1'
+            assert (
+                client.post('documents/generate', {'x': 1})['data']['method'] == 'POST'
+            )
+            assert client.download('documents/doc-1/download') == PDF
+        assert json.loads(FakeAPI.seen[1][3]) == {'x': 1}
+
+    def test_connection_error(self):
+        """Test that httpx errors are translated for the retry logic"""
+        httpx = pytest.importorskip('httpx')
+
+        def handler(request):
+            raise httpx.ConnectError('refused', request=request)
+
+        transport = HTTP2Transport(
+            http_client=httpx.Client(transport=httpx.MockTransport(handler))
+        )
+        client = Docstron(api_key='test-key', transport=transport, max_retries=0)
+        with pytest.raises(requests.ConnectionError):
+            client.get('usage')
+
+    def test_client_keeps_expiry_default(self):
+        """Test that the client's keepalive_expiry=None keeps HTTP/2's default"""
+        pytest.importorskip('httpx')
+        with mock.patch('httpx.Client') as http_client:
+            Docstron(api_key='test-key', transport='http2').session
+            limits = http_client.call_args.kwargs['limits']
+            assert limits.keepalive_expiry == 5.0
+
+            Docstron(api_key='test-key', transport='http2', keepalive_expiry=30).session
+            assert http_client.call_args.kwargs['limits'].keepalive_expiry == 30
+
+    def test_requires_h2(self):
+        """Test the install hint when h2 is missing"""
+        pytest.importorskip('httpx')
+        if importlib.util.find_spec('h2') is not None:
+            pytest.skip('h2 is installed')
+        with pytest.raises(ImportError, match='docstron\\[http2\\]'):
+            HTTP2Transport()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])